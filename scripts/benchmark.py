@@ -0,0 +1,351 @@
+"""Benchmark suite for the transform, interpolation and server code paths.
+
+Usage:
+    python scripts/benchmark.py                      # run and print JSON
+    python scripts/benchmark.py --output run.json    # save the results
+    python scripts/benchmark.py --save-baseline      # store as the baseline
+    python scripts/benchmark.py --compare            # fail on regressions
+
+Results report throughput (frames, or trajectory steps, per second),
+p50/p99 latency per call and peak resident memory. Each benchmark runs in
+its own subprocess, so the peak is that of a fresh interpreter running
+only that benchmark; ``--in-process`` runs them all in one process, which
+is faster but leaves the peak unreported.
+"""
+
+import argparse
+import functools
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT / 'src'))
+
+DEFAULT_BASELINE = ROOT / 'scripts' / 'benchmark_baseline.json'
+
+RESOLUTIONS = {
+    '720p': (1280, 720),
+    '1080p': (1920, 1080),
+    '4k': (3840, 2160)
+}
+
+TRAJECTORY_STEPS = (30, 300, 3000)
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB, None if unavailable."""
+    try:
+        import resource
+    except ImportError:
+        # Windows
+        try:
+            import psutil
+        except ImportError:
+            return None
+        return psutil.Process().memory_info().peak_wset / 1024 ** 2
+    
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / 1024 ** 2 if sys.platform == 'darwin' else peak / 1024
+
+
+def measure(fn, repeat, warmup=2, items=1):
+    """Time ``repeat`` calls of ``fn`` after ``warmup`` untimed calls.
+    
+    Args:
+        fn: Callable to benchmark
+        repeat: Number of timed calls
+        warmup: Number of untimed calls first
+        items: Frames (or steps) produced per call
+    
+    Returns:
+        Result dict
+    """
+    for _ in range(warmup):
+        fn()
+    
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - start)
+    
+    latencies = np.array(latencies) * 1000
+    return {
+        'iterations': repeat,
+        'fps': items * repeat / (latencies.sum() / 1000),
+        'mean_ms': float(latencies.mean()),
+        'p50_ms': float(np.percentile(latencies, 50)),
+        'p99_ms': float(np.percentile(latencies, 99))
+    }
+
+
+def test_frame(width, height):
+    """Smooth synthetic RGB frame."""
+    import cv2
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+    return cv2.GaussianBlur(frame, (0, 0), 3)
+
+
+# Benchmark suites yield (name, setup, iterations, items per call); setup
+# builds the inputs and returns the callable to time, so listing the
+# benchmarks costs nothing
+def transform_benchmarks(resolutions, repeat):
+    def setup(width, height, operation):
+        from core import FPVTransform
+        
+        frame = test_frame(width, height)
+        transform = FPVTransform(width, height)
+        return {
+            'apply_rotation': lambda: transform.apply_rotation(frame, (10, 5, 2)),
+            'adjust_fov': lambda: transform.adjust_fov(frame, 1.2),
+            'warp': lambda: transform.warp(frame, (10, 5, 2), 1.2),
+            'warp_motion_blur': lambda: transform.warp_motion_blur(frame, (10, 5, 2), (10, 6, 2), 1.2)
+        }[operation]
+    
+    for label, (width, height) in resolutions.items():
+        for operation in ('apply_rotation', 'adjust_fov', 'warp', 'warp_motion_blur'):
+            yield (f'transform.{operation}[{label}]',
+                   functools.partial(setup, width, height, operation), repeat, 1)
+
+
+def trajectory_benchmarks(repeat):
+    def setup(steps, bezier):
+        import cv2
+        from core.interpolation import bezier_trajectory, trajectory_interpolate
+        
+        if bezier:
+            control_points = np.array([[0, 0, 0], [10, 20, 0], [30, -10, 5], [30, -20, 10]],
+                                      dtype=float)
+            return lambda: bezier_trajectory(control_points, steps)
+        start, _ = cv2.Rodrigues(np.radians([0.0, 0.0, 0.0]))
+        end, _ = cv2.Rodrigues(np.radians([30.0, -20.0, 10.0]))
+        return lambda: trajectory_interpolate(start, end, steps)
+    
+    for steps in TRAJECTORY_STEPS:
+        yield (f'trajectory_interpolate[{steps}]',
+               functools.partial(setup, steps, False), repeat, steps)
+        yield (f'bezier_trajectory[{steps}]',
+               functools.partial(setup, steps, True), repeat, steps)
+
+
+def interpolation_benchmarks(repeat, num_frames=7):
+    def setup():
+        from ai.rife_wrapper import RIFEInterpolator
+        
+        interpolator = RIFEInterpolator(model_path=None, device='cpu')
+        frame1 = test_frame(1920, 1080)
+        frame2 = np.ascontiguousarray(frame1[:, ::-1])
+        return lambda: interpolator.interpolate_frames(frame1, frame2, num_frames)
+    
+    yield 'rife.blend_fallback[1080p]', setup, repeat, num_frames
+
+
+def server_benchmarks(repeat):
+    def setup(endpoint):
+        from backend import server
+        from core.cache import RenderCache
+        
+        # Measure rendering, not render cache hits
+        server.render_cache = RenderCache(memory_mb=0)
+        client = server.app.test_client()
+        frame = test_frame(1920, 1080)
+        
+        def transform_raw():
+            response = client.post('/api/transform?tilt=10&pan=5&roll=2&fov=1.2&format=raw',
+                                   data=body, headers=headers)
+            assert response.status_code == 200, response.get_data(as_text=True)
+        
+        def transform_png():
+            response = client.post('/api/transform', data={
+                'frame': (io.BytesIO(png.getvalue()), 'frame.png', 'image/png'),
+                'tilt': '10', 'pan': '5', 'roll': '2', 'fov': '1.2'
+            })
+            assert response.status_code == 200, response.get_data(as_text=True)
+        
+        def transition():
+            response = client.post('/api/transition', json={
+                'start_rotation': [0, 0, 0], 'end_rotation': [30, -20, 10], 'duration': 1.0
+            })
+            assert response.status_code == 200, response.get_data(as_text=True)
+        
+        if endpoint == 'transform_raw':
+            body = frame.tobytes()
+            headers = {'Content-Type': 'application/octet-stream', 'X-Frame-Shape': '1080,1920,3'}
+            return transform_raw
+        if endpoint == 'transform_png':
+            from PIL import Image
+            png = io.BytesIO()
+            Image.fromarray(frame).save(png, format='PNG')
+            return transform_png
+        return transition
+    
+    yield ('server.transform[1080p,raw]',
+           functools.partial(setup, 'transform_raw'), repeat, 1)
+    yield ('server.transform[1080p,png-json]',
+           functools.partial(setup, 'transform_png'), max(1, repeat // 4), 1)
+    yield 'server.transition[1s]', functools.partial(setup, 'transition'), repeat, 1
+
+
+def benchmarks(quick=False):
+    """List the benchmarks as ``(name, setup, iterations, items)`` tuples."""
+    repeat = 5 if quick else 20
+    resolutions = {k: v for k, v in RESOLUTIONS.items() if not (quick and k == '4k')}
+    suites = [
+        transform_benchmarks(resolutions, repeat),
+        trajectory_benchmarks(repeat * 5),
+        interpolation_benchmarks(repeat),
+        server_benchmarks(repeat)
+    ]
+    return [benchmark for suite in suites for benchmark in suite]
+
+
+def run_one(name, quick=False):
+    """Run one benchmark in this process and report its peak memory."""
+    for benchmark_name, setup, iterations, items in benchmarks(quick):
+        if benchmark_name == name:
+            result = measure(setup(), iterations, items=items)
+            result['peak_rss_mb'] = peak_rss_mb()
+            return result
+    raise ValueError(f"Unknown benchmark '{name}'")
+
+
+def run_isolated(name, quick=False):
+    """Run one benchmark in a fresh interpreter."""
+    command = [sys.executable, str(Path(__file__).resolve()), '--child', name]
+    if quick:
+        command.append('--quick')
+    completed = subprocess.run(command, stdout=subprocess.PIPE, check=True)
+    return json.loads(completed.stdout)
+
+
+def run(quick=False, only=None, in_process=False):
+    """Run all benchmarks.
+    
+    Args:
+        quick: Fewer iterations and no 4K frames
+        only: Substring filter on benchmark names
+        in_process: Run every benchmark in this process instead of one
+            subprocess each; ``peak_rss_mb`` is then None
+    
+    Returns:
+        Results document
+    """
+    results = {}
+    for name, setup, iterations, items in benchmarks(quick):
+        if only and only not in name:
+            continue
+        if in_process:
+            result = dict(measure(setup(), iterations, items=items), peak_rss_mb=None)
+        else:
+            result = run_isolated(name, quick)
+        results[name] = result
+        print(f"{name:40s} {result['fps']:10.1f} fps  p50 {result['p50_ms']:8.2f} ms  "
+              f"p99 {result['p99_ms']:8.2f} ms", file=sys.stderr)
+    
+    import cv2
+    return {
+        'created': datetime.now(timezone.utc).isoformat(),
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'processor': platform.processor(),
+            'cpu_count': os.cpu_count(),
+            'numpy': np.__version__,
+            'opencv': cv2.__version__,
+            'quick': quick,
+            'isolated': not in_process
+        },
+        'results': results
+    }
+
+
+def compare(current, baseline, tolerance):
+    """Compare results against a baseline.
+    
+    A benchmark regresses when its throughput drops, or its p99 latency
+    grows, by more than ``tolerance`` (a fraction).
+    
+    Returns:
+        List of regression descriptions
+    """
+    regressions = []
+    for name, result in current['results'].items():
+        reference = baseline['results'].get(name)
+        if reference is None:
+            continue
+        
+        fps_ratio = result['fps'] / reference['fps']
+        p99_ratio = result['p99_ms'] / reference['p99_ms']
+        flag = ''
+        if fps_ratio < 1 - tolerance:
+            regressions.append(f"{name}: throughput {fps_ratio - 1:+.1%}")
+            flag = '  REGRESSION'
+        elif p99_ratio > 1 + tolerance:
+            regressions.append(f"{name}: p99 latency {p99_ratio - 1:+.1%}")
+            flag = '  REGRESSION'
+        print(f"{name:40s} fps {fps_ratio - 1:+7.1%}  p99 {p99_ratio - 1:+7.1%}{flag}",
+              file=sys.stderr)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the FPV transition backend')
+    parser.add_argument('--output', help='Write the results JSON to this file')
+    parser.add_argument('--baseline', default=str(DEFAULT_BASELINE),
+                        help='Baseline results file')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='Store this run as the baseline')
+    parser.add_argument('--compare', action='store_true',
+                        help='Compare with the baseline, exit 1 on regressions')
+    parser.add_argument('--tolerance', type=float, default=0.15,
+                        help='Allowed relative slowdown before a regression is reported')
+    parser.add_argument('--quick', action='store_true', help='Fewer iterations, no 4K')
+    parser.add_argument('--only', help='Only run benchmarks whose name contains this')
+    parser.add_argument('--in-process', action='store_true',
+                        help='Run all benchmarks in one process, without peak memory')
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.child:
+        # Worker of run_isolated: report one benchmark on stdout
+        print(json.dumps(run_one(args.child, quick=args.quick)))
+        return
+    
+    results = run(quick=args.quick, only=args.only, in_process=args.in_process)
+    document = json.dumps(results, indent=2)
+    
+    if args.output:
+        Path(args.output).write_text(document)
+    else:
+        print(document)
+    
+    if args.save_baseline:
+        Path(args.baseline).write_text(document)
+        print(f"Baseline saved to {args.baseline}", file=sys.stderr)
+    
+    if args.compare:
+        baseline_path = Path(args.baseline)
+        if not baseline_path.exists():
+            print(f"No baseline at {baseline_path}, run with --save-baseline first",
+                  file=sys.stderr)
+            sys.exit(2)
+        regressions = compare(results, json.loads(baseline_path.read_text()), args.tolerance)
+        if regressions:
+            print("\nPerformance regressions:\n  " + "\n  ".join(regressions), file=sys.stderr)
+            sys.exit(1)
+        print("\nNo performance regressions", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
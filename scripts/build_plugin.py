@@ -43,8 +43,9 @@ def build_plugin():
     backend_dest = plugin_dir / "backend"
     shutil.copytree(backend_source, backend_dest, dirs_exist_ok=True)
     
-    # Copy configuration
-    shutil.copy("config/default.json", plugin_dir / "config.json")
+    # Copy configuration where the server looks for it
+    (plugin_dir / "config").mkdir(exist_ok=True)
+    shutil.copy("config/default.json", plugin_dir / "config" / "default.json")
     
     # Create startup script
     create_startup_script(plugin_dir)
@@ -134,12 +135,13 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from backend.backend.server import app
+from backend.backend.server import serve
 
 if __name__ == "__main__":
     print("Starting FPV Transition Backend Server...")
     print("Server running at http://localhost:8080")
-    app.run(host="0.0.0.0", port=8080)
+    # Serving mode, threads and workers come from the "server" config section
+    serve()
 '''
     
     startup_path = plugin_dir / "start_server.py"
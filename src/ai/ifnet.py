@@ -0,0 +1,156 @@
+"""IFNet flow network used by RIFE v4.x (lite) models."""
+
+import logging
+import threading
+from collections import OrderedDict
+
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+
+logger = logging.getLogger(__name__)
+
+# Backward-warp sampling grids, (1, 2, H, W) per (device, dtype, size),
+# broadcast over the batch; LRU-bounded since each one lives on the device
+GRID_CACHE_SIZE = 8
+_grid_cache = OrderedDict()
+_grid_cache_lock = threading.Lock()
+
+
+def warp(image: torch.Tensor, flow: torch.Tensor) -> torch.Tensor:
+    """Backward-warp an image batch by a per-pixel flow field."""
+    _, _, h, w = flow.shape
+    key = (str(flow.device), flow.dtype, h, w)
+    with _grid_cache_lock:
+        grid = _grid_cache.get(key)
+        if grid is not None:
+            _grid_cache.move_to_end(key)
+    if grid is None:
+        horizontal = torch.linspace(-1.0, 1.0, w, device=flow.device, dtype=flow.dtype)
+        vertical = torch.linspace(-1.0, 1.0, h, device=flow.device, dtype=flow.dtype)
+        grid = torch.cat([
+            horizontal.view(1, 1, 1, w).expand(-1, -1, h, -1),
+            vertical.view(1, 1, h, 1).expand(-1, -1, -1, w)
+        ], 1)
+        with _grid_cache_lock:
+            _grid_cache[key] = grid
+            while len(_grid_cache) > GRID_CACHE_SIZE:
+                _grid_cache.popitem(last=False)
+    
+    flow = torch.cat([
+        flow[:, 0:1] / ((image.shape[3] - 1.0) / 2.0),
+        flow[:, 1:2] / ((image.shape[2] - 1.0) / 2.0)
+    ], 1)
+    sample_grid = (grid + flow).permute(0, 2, 3, 1)
+    return F.grid_sample(image, sample_grid, mode='bilinear',
+                         padding_mode='border', align_corners=True)
+
+
+def conv(in_planes: int, out_planes: int, kernel_size: int = 3,
+         stride: int = 1, padding: int = 1) -> nn.Sequential:
+    return nn.Sequential(
+        nn.Conv2d(in_planes, out_planes, kernel_size=kernel_size,
+                  stride=stride, padding=padding, bias=True),
+        nn.LeakyReLU(0.2, True)
+    )
+
+
+class IFBlock(nn.Module):
+    """Coarse-to-fine flow refinement block."""
+    
+    def __init__(self, in_planes: int, c: int = 64):
+        super().__init__()
+        self.conv0 = nn.Sequential(
+            conv(in_planes, c // 2, 3, 2, 1),
+            conv(c // 2, c, 3, 2, 1)
+        )
+        self.convblock = nn.Sequential(*[conv(c, c) for _ in range(8)])
+        self.lastconv = nn.Sequential(
+            nn.ConvTranspose2d(c, 4 * 6, 4, 2, 1),
+            nn.PixelShuffle(2)
+        )
+    
+    def forward(self, x, flow=None, scale: float = 1):
+        x = F.interpolate(x, scale_factor=1. / scale, mode='bilinear', align_corners=False)
+        if flow is not None:
+            flow = F.interpolate(flow, scale_factor=1. / scale, mode='bilinear',
+                                 align_corners=False) * 1. / scale
+            x = torch.cat((x, flow), 1)
+        feat = self.conv0(x)
+        feat = self.convblock(feat)
+        tmp = self.lastconv(feat)
+        tmp = F.interpolate(tmp, scale_factor=scale, mode='bilinear', align_corners=False)
+        flow = tmp[:, :4] * scale
+        mask = tmp[:, 4:5]
+        return flow, mask
+
+
+class IFNet(nn.Module):
+    """Intermediate flow network with an arbitrary-timestep input.
+    
+    The timestep is an input channel, so a batch may mix different
+    timesteps for the same frame pair and all of them are produced by a
+    single forward pass.
+    """
+    
+    def __init__(self):
+        super().__init__()
+        self.block0 = IFBlock(7, c=192)
+        self.block1 = IFBlock(8 + 4, c=128)
+        self.block2 = IFBlock(8 + 4, c=96)
+        self.block3 = IFBlock(8 + 4, c=64)
+    
+    def forward(self, img0: torch.Tensor, img1: torch.Tensor, timestep: torch.Tensor,
+                scale_list=(8, 4, 2, 1)) -> torch.Tensor:
+        """Synthesize intermediate frames.
+        
+        Args:
+            img0: (B, 3, H, W) first frames in [0, 1]
+            img1: (B, 3, H, W) second frames in [0, 1]
+            timestep: (B, 1, 1, 1) timesteps in [0, 1]
+            scale_list: Downscale factor of each refinement block
+        
+        Returns:
+            (B, 3, H, W) interpolated frames
+        """
+        timestep = timestep.expand(-1, 1, img0.shape[2], img0.shape[3])
+        warped_img0 = img0
+        warped_img1 = img1
+        flow = None
+        mask = None
+        
+        for block, scale in zip((self.block0, self.block1, self.block2, self.block3), scale_list):
+            if flow is None:
+                flow, mask = block(torch.cat((img0, img1, timestep), 1), None, scale=scale)
+            else:
+                flow_delta, mask_delta = block(
+                    torch.cat((warped_img0, warped_img1, timestep, mask), 1), flow, scale=scale)
+                flow = flow + flow_delta
+                mask = mask + mask_delta
+            warped_img0 = warp(img0, flow[:, :2])
+            warped_img1 = warp(img1, flow[:, 2:4])
+        
+        mask = torch.sigmoid(mask)
+        return warped_img0 * mask + warped_img1 * (1 - mask)
+
+
+def load_ifnet(path: str, device: torch.device) -> IFNet:
+    """Load IFNet weights from a RIFE ``flownet.pkl`` checkpoint.
+    
+    Raises:
+        ValueError: If the checkpoint lacks IFNet weights, so a wrong file
+            never runs with randomly initialized layers
+    """
+    state = torch.load(path, map_location=device)
+    # Checkpoints saved from DataParallel prefix every key with "module."
+    state = {k.replace('module.', '', 1): v for k, v in state.items()}
+    model = IFNet()
+    # Some RIFE releases ship extra (teacher) weights, so only missing keys are fatal
+    result = model.load_state_dict(state, strict=False)
+    if result.missing_keys:
+        raise ValueError(f"{path} is not a compatible IFNet checkpoint: "
+                         f"{len(result.missing_keys)} weights missing, e.g. {result.missing_keys[0]}")
+    if result.unexpected_keys:
+        logger.warning(f"Ignoring {len(result.unexpected_keys)} weights in {path} that IFNet "
+                       f"does not use, e.g. {result.unexpected_keys[0]}")
+    return model.to(device).eval()
\ No newline at end of file
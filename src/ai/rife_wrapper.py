@@ -1,60 +1,572 @@
 """RIFE AI frame interpolation wrapper."""
 
+import logging
+import time
+from contextlib import nullcontext
+from pathlib import Path
+
 import torch
+import torch.nn.functional as F
 import numpy as np
-from typing import List, Tuple
+from typing import List, Sequence, Tuple
 import cv2
 
+from core.timing import rife_timesteps
+from .ifnet import load_ifnet
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INFERENCE_ARGS = {
+    'UHD': False,
+    'scale': 1.0,
+    'fp16': False,
+    'tta': False,
+    'time_step': 0.5
+}
+
+# Histogram buckets of the frame fraction skipped by interpolate_with_mask
+SKIPPED_FRACTION_BUCKETS = (0.0, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0)
+
+# Rough peak activation memory of one IFNet pass per input pixel and batch
+# item in fp32, used to decide when frames must be tiled
+BYTES_PER_PIXEL = 320
+
+# Fraction of the VRAM budget available to activations
+VRAM_HEADROOM = 0.5
+
 
 class RIFEInterpolator:
     """Wrapper for RIFE frame interpolation."""
     
-    def __init__(self, model_path: str = None, device: str = 'cuda'):
+    def __init__(self, model_path: str = None, device: str = 'cuda',
+                 inference_args: dict = None, vram_mb: int = 4096,
+                 batch_size: int = 4, tile_overlap: int = 64, cache=None,
+                 metrics=None):
+        """
+        Args:
+            model_path: RIFE ``flownet.pkl`` or the directory containing it
+            device: Torch device, falls back to CPU without CUDA
+            inference_args: ``rife.inference_args`` config (scale, fp16, UHD, tta)
+            vram_mb: Memory budget deciding when frames are split into tiles
+            batch_size: Timesteps synthesized per forward pass
+            tile_overlap: Overlap in pixels between neighbouring tiles
+            cache: Optional ``core.cache.RenderCache`` for interpolated blocks
+            metrics: Optional ``core.metrics.Metrics`` receiving stage timings
+                (``rife.*`` stages)
+        """
         self.device = torch.device(device if torch.cuda.is_available() else 'cpu')
+        self.inference_args = dict(DEFAULT_INFERENCE_ARGS, **(inference_args or {}))
+        
+        self.scale = float(self.inference_args['scale'])
+        if self.inference_args['UHD'] and self.scale == 1.0:
+            self.scale = 0.5
+        self.fp16 = bool(self.inference_args['fp16']) and self.device.type == 'cuda'
+        self.tta = bool(self.inference_args['tta'])
+        self.dtype = torch.float16 if self.fp16 else torch.float32
+        
+        self.vram_mb = vram_mb
+        self.batch_size = max(1, batch_size)
+        self.tile_overlap = tile_overlap
+        self.cache = cache
+        self.metrics = metrics
+        self.model_version = None
         self.model = self._load_model(model_path)
     
     def _load_model(self, model_path: str):
-        """Load RIFE model."""
-        # TODO: Implement actual RIFE model loading
-        # This is a placeholder
-        print(f"Loading RIFE model from {model_path or 'default'}")
-        return None
-    
-    def interpolate_frames(self, frame1: np.ndarray, frame2: np.ndarray, 
-                         num_frames: int) -> List[np.ndarray]:
+        """Load RIFE model.
+        
+        Returns None when no checkpoint is available, in which case frames
+        are linearly blended instead.
+        """
+        if model_path is None:
+            logger.warning("No RIFE model configured, falling back to linear blending")
+            return None
+        
+        path = Path(model_path)
+        if path.is_dir():
+            path = path / 'flownet.pkl'
+        if not path.exists():
+            logger.warning(f"RIFE model not found at {path}, falling back to linear blending")
+            return None
+        
+        logger.info(f"Loading RIFE model from {path} on {self.device}")
+        # Identifies the checkpoint in render cache keys
+        stat = path.stat()
+        self.model_version = f'{path.parent.name}/{path.name}:{stat.st_size}:{int(stat.st_mtime)}'
+        model = load_ifnet(str(path), self.device)
+        if self.fp16:
+            model = model.half()
+        return model
+    
+    def interpolate_frames(self, frame1: np.ndarray, frame2: np.ndarray,
+                         num_frames: int = None, timesteps: Sequence[float] = None,
+                         schedule: str = 'bisect', out: np.ndarray = None,
+                         as_generator: bool = False, curve=None):
         """Interpolate frames between two images.
         
         Args:
             frame1: First frame
             frame2: Second frame
-            num_frames: Number of intermediate frames to generate
+            num_frames: Number of evenly spaced intermediate frames to generate
+            timesteps: Explicit timesteps in [0, 1] (e.g. eased), instead of
+                ``num_frames``
+            schedule: ``'bisect'`` synthesizes the frame nearest the middle
+                first and recursively fills each half from the generated
+                frames; ``'independent'`` synthesizes every frame from the
+                two input frames
+            out: Optional preallocated (N, H, W, C) output block
+            as_generator: Yield views into the output block as frames are
+                filled instead of returning the block
+            curve: Timing curve (see ``core.timing``) spacing the
+                ``num_frames`` timesteps like the transition keyframes
         
         Returns:
-            List of interpolated frames
+            (N, H, W, C) block of interpolated frames, one per timestep (or a
+            generator of (H, W, C) views into it)
         """
-        # TODO: Implement actual RIFE interpolation
-        # This is a placeholder that returns linear blend
+        if timesteps is None:
+            timesteps = _default_timesteps(num_frames, curve)
+        timesteps = [float(t) for t in timesteps]
+        if any(t < 0 or t > 1 for t in timesteps):
+            raise ValueError('Timesteps must lie within [0, 1]')
+        if schedule not in ('bisect', 'independent'):
+            raise ValueError(f"Unknown schedule '{schedule}', expected 'bisect' or 'independent'")
+        if frame1.shape != frame2.shape or frame1.dtype != frame2.dtype:
+            raise ValueError('Frames must share shape and dtype')
+        
+        shape = (len(timesteps),) + frame1.shape
+        if out is None:
+            out = np.empty(shape, dtype=frame1.dtype)
+        elif out.shape != shape or out.dtype != frame1.dtype:
+            raise ValueError(f"Output block {out.shape}/{out.dtype} does not match {shape}/{frame1.dtype}")
         
-        interpolated = []
-        for i in range(1, num_frames + 1):
-            alpha = i / (num_frames + 1)
-            blended = cv2.addWeighted(frame1, 1 - alpha, frame2, alpha, 0)
-            interpolated.append(blended)
+        if self.model is None:
+            # Placeholder without a model: linear blend (cheaper than a cache lookup)
+            filled = self._timed('rife.blend', _blend(frame1, frame2, timesteps, out))
+        else:
+            key = cached = None
+            if self.cache is not None:
+                with self._span('rife.cache_lookup'):
+                    key = self.cache.key((frame1, frame2), 'rife', self.model_version, timesteps,
+                                         schedule, self.scale, self.tta, self.fp16)
+                    cached = self.cache.get(key)
+            
+            if cached is not None:
+                out[...] = cached
+                filled = iter([(0, len(timesteps))])
+            else:
+                infer = self._infer_bisect if schedule == 'bisect' else self._infer
+                filled = _run_once(infer, frame1, frame2, timesteps, out)
+                if key is not None:
+                    filled = _store_when_done(filled, self.cache, key, out)
         
-        return interpolated
+        if as_generator:
+            return (out[i] for start, stop in filled for i in range(start, stop))
+        for _ in filled:
+            pass
+        return out
     
     def interpolate_with_mask(self, frame1: np.ndarray, frame2: np.ndarray,
-                            mask: np.ndarray, num_frames: int) -> List[np.ndarray]:
+                            mask: np.ndarray, num_frames: int = None,
+                            timesteps: Sequence[float] = None, tile_size: int = 64,
+                            seam: int = 16, threshold: float = 0, curve=None,
+                            return_stats: bool = False):
         """Interpolate frames with motion mask for better 3D coherence.
         
+        The frame is divided into ``tile_size`` tiles; only bounding boxes of
+        tiles containing motion (grown by one tile of context) go through
+        ``interpolate_frames``. Static pixels are copied from the nearest
+        input frame and the inner edges of every interpolated box are
+        feathered over ``seam`` pixels. The skipped fraction of the frame is
+        recorded in the ``rife_mask_skipped_fraction`` histogram when
+        metrics are attached.
+        
         Args:
             frame1: First frame
             frame2: Second frame
             mask: Motion mask indicating areas of significant movement
             num_frames: Number of intermediate frames
+            timesteps: Explicit timesteps in [0, 1], instead of ``num_frames``
+            tile_size: Tile edge in pixels
+            seam: Width in pixels of the blend at box edges
+            threshold: Mask values above this count as motion
+            curve: Timing curve spacing the ``num_frames`` timesteps
+            return_stats: Also return the tiling statistics
         
         Returns:
-            List of interpolated frames
+            (N, H, W, C) block of interpolated frames, or ``(block, stats)``
+            with ``skipped_fraction``, ``tiles_total``, ``tiles_interpolated``
+            and ``regions`` when ``return_stats`` is set
+        """
+        if timesteps is None:
+            timesteps = _default_timesteps(num_frames, curve)
+        h, w = frame1.shape[:2]
+        
+        mask = np.asarray(mask)
+        if mask.ndim == 3:
+            mask = mask.max(axis=2)
+        if mask.shape != (h, w):
+            mask = cv2.resize(mask.astype(np.float32), (w, h), interpolation=cv2.INTER_NEAREST)
+        
+        # Moving tiles, grown by one tile so boxes carry context for the seams
+        rows, cols = -(-h // tile_size), -(-w // tile_size)
+        padded = np.zeros((rows * tile_size, cols * tile_size), dtype=bool)
+        padded[:h, :w] = mask > threshold
+        moving = padded.reshape(rows, tile_size, cols, tile_size).any(axis=(1, 3))
+        moving = cv2.dilate(moving.astype(np.uint8), np.ones((3, 3), np.uint8))
+        
+        # Static pixels come from the input frame nearest in time
+        out = np.empty((len(timesteps),) + frame1.shape, dtype=frame1.dtype)
+        for i, t in enumerate(timesteps):
+            out[i] = frame1 if t < 0.5 else frame2
+        
+        covered = np.zeros((rows, cols), dtype=bool)
+        count, _, boxes, _ = cv2.connectedComponentsWithStats(moving, connectivity=8)
+        for col, row, box_cols, box_rows, _ in boxes[1:count]:
+            covered[row:row + box_rows, col:col + box_cols] = True
+            y0, x0 = row * tile_size, col * tile_size
+            y1, x1 = min(h, (row + box_rows) * tile_size), min(w, (col + box_cols) * tile_size)
+            
+            region = self.interpolate_frames(frame1[y0:y1, x0:x1], frame2[y0:y1, x0:x1],
+                                             timesteps=timesteps)
+            weight = np.outer(_ramp(y1 - y0, seam, y0 > 0, y1 < h),
+                              _ramp(x1 - x0, seam, x0 > 0, x1 < w))
+            for i in range(len(timesteps)):
+                _feather(region[i], out[i, y0:y1, x0:x1], weight)
+        
+        # Covered pixel area, counting the clipped edge tiles exactly
+        tile_rows = np.minimum(tile_size, h - np.arange(rows) * tile_size)
+        tile_cols = np.minimum(tile_size, w - np.arange(cols) * tile_size)
+        area = float(tile_rows @ covered @ tile_cols)
+        stats = {
+            'skipped_fraction': 1.0 - area / (h * w),
+            'tiles_total': rows * cols,
+            'tiles_interpolated': int(covered.sum()),
+            'regions': count - 1
+        }
+        logger.debug(f"Mask-aware interpolation skipped {stats['skipped_fraction']:.1%} of the frame")
+        if self.metrics is not None:
+            self.metrics.histogram(
+                'rife_mask_skipped_fraction',
+                'Fraction of the frame left static by mask-aware interpolation',
+                buckets=SKIPPED_FRACTION_BUCKETS
+            ).observe(stats['skipped_fraction'])
+        
+        return (out, stats) if return_stats else out
+    
+    @torch.no_grad()
+    def _infer(self, frame1: np.ndarray, frame2: np.ndarray,
+               timesteps: Sequence[float], out: np.ndarray):
+        """Run the model for every timestep, batching timesteps per pass.
+        
+        Fills the (len(timesteps), H, W, C) block ``out``.
+        """
+        img0 = self._to_tensor(frame1)
+        img1 = self._to_tensor(frame2)
+        
+        for start in range(0, len(timesteps), self.batch_size):
+            batch = timesteps[start:start + self.batch_size]
+            t = torch.tensor(batch, dtype=self.dtype, device=self.device).view(-1, 1, 1, 1)
+            result = self._run_tiled(img0, img1, t)
+            _store_rgb(out[start:start + len(batch)], self._to_numpy(result, frame1.dtype))
+        
+        self._blend_extra_channels(out, frame1, frame2, timesteps)
+    
+    @torch.no_grad()
+    def _infer_bisect(self, frame1: np.ndarray, frame2: np.ndarray,
+                      timesteps: Sequence[float], out: np.ndarray):
+        """Synthesize timesteps by recursive bisection of the time interval.
+        
+        Each level picks, for every open interval, the requested timestep
+        nearest its middle and synthesizes it from the interval's endpoints;
+        the new frame then bounds the two halves. Generated frames stay on
+        the device as inputs to the next level, and all intervals of a level
+        are batched together. For ``2^k - 1`` evenly spaced frames every
+        model call is at t = 0.5 between neighbouring frames. Fills the
+        (len(timesteps), H, W, C) block ``out``.
+        """
+        indices = {}
+        for i, t in enumerate(timesteps):
+            indices.setdefault(t, []).append(i)
+        
+        # Endpoints need no synthesis
+        for t, frame in ((0.0, frame1), (1.0, frame2)):
+            for i in indices.pop(t, []):
+                out[i] = frame
+        
+        known = {0.0: self._to_tensor(frame1), 1.0: self._to_tensor(frame2)}
+        pending = [(0.0, 1.0, sorted(indices))] if indices else []
+        
+        while pending:
+            # Timestep nearest the middle of each open interval
+            jobs = []
+            for ta, tb, targets in pending:
+                middle = (ta + tb) / 2
+                jobs.append((ta, tb, min(targets, key=lambda t: abs(t - middle))))
+            
+            for start in range(0, len(jobs), self.batch_size):
+                batch = jobs[start:start + self.batch_size]
+                img0 = torch.cat([known[ta] for ta, _, _ in batch])
+                img1 = torch.cat([known[tb] for _, tb, _ in batch])
+                local_t = [(t - ta) / (tb - ta) for ta, tb, t in batch]
+                t = torch.tensor(local_t, dtype=self.dtype, device=self.device).view(-1, 1, 1, 1)
+                
+                result = self._run_tiled(img0, img1, t)
+                frames = self._to_numpy(result, frame1.dtype)
+                for k, (_, _, pivot) in enumerate(batch):
+                    known[pivot] = result[k:k + 1].to(self.dtype)
+                    for i in indices[pivot]:
+                        _store_rgb(out[i], frames[k])
+            
+            next_pending = []
+            for (ta, tb, targets), (_, _, pivot) in zip(pending, jobs):
+                left = [t for t in targets if t < pivot]
+                right = [t for t in targets if t > pivot]
+                if left:
+                    next_pending.append((ta, pivot, left))
+                if right:
+                    next_pending.append((pivot, tb, right))
+            pending = next_pending
+            
+            # Only interval endpoints are needed by the next level
+            needed = {t for ta, tb, _ in pending for t in (ta, tb)}
+            known = {t: tensor for t, tensor in known.items() if t in needed}
+        
+        self._blend_extra_channels(out, frame1, frame2, timesteps)
+    
+    def _span(self, stage: str):
+        """Timing span for ``stage``, a no-op without metrics."""
+        if self.metrics is None:
+            return nullcontext()
+        return self.metrics.span(stage)
+    
+    def _timed(self, stage: str, filled):
+        """Attribute the time spent producing each chunk of frames to ``stage``."""
+        if self.metrics is None:
+            return filled
+        return _timed_chunks(filled, self.metrics, stage)
+    
+    def _blend_extra_channels(self, out: np.ndarray, frame1: np.ndarray,
+                              frame2: np.ndarray, timesteps: Sequence[float]):
+        """Blend channels beyond RGB (alpha) linearly into ``out``."""
+        if frame1.ndim != 3 or frame1.shape[2] <= 3:
+            return
+        h, w = frame1.shape[:2]
+        for i, alpha in enumerate(timesteps):
+            out[i, ..., 3:] = cv2.addWeighted(frame1[..., 3:], 1 - alpha,
+                                              frame2[..., 3:], alpha, 0).reshape(h, w, -1)
+    
+    def _run_tiled(self, img0: torch.Tensor, img1: torch.Tensor,
+                   t: torch.Tensor) -> torch.Tensor:
+        """Run the model, timed as the ``rife.inference`` stage."""
+        with self._span('rife.inference'):
+            result = self._run_tiles(img0, img1, t)
+            if self.metrics is not None and self.device.type == 'cuda':
+                # Kernels run asynchronously; wait so their time is attributed here
+                torch.cuda.synchronize(self.device)
+        return result
+    
+    def _run_tiles(self, img0: torch.Tensor, img1: torch.Tensor,
+                   t: torch.Tensor) -> torch.Tensor:
+        """Run the model over the whole frame or over overlapping tiles."""
+        _, _, h, w = img0.shape
+        tile_h, tile_w = self._tile_size(h, w, len(t))
+        if tile_h >= h and tile_w >= w:
+            return self._run_padded(img0, img1, t)
+        
+        overlap = self.tile_overlap
+        acc = torch.zeros((len(t), 3, h, w), dtype=torch.float32, device=self.device)
+        weights = torch.zeros((1, 1, h, w), dtype=torch.float32, device=self.device)
+        
+        for y0 in _tile_starts(h, tile_h, overlap):
+            for x0 in _tile_starts(w, tile_w, overlap):
+                y1, x1 = min(y0 + tile_h, h), min(x0 + tile_w, w)
+                result = self._run_padded(img0[..., y0:y1, x0:x1], img1[..., y0:y1, x0:x1], t)
+                
+                weight = self._feather(y0, y1, h, x0, x1, w, overlap)
+                acc[..., y0:y1, x0:x1] += result.float() * weight
+                weights[..., y0:y1, x0:x1] += weight
+        
+        return acc / weights
+    
+    def _run_padded(self, img0: torch.Tensor, img1: torch.Tensor,
+                    t: torch.Tensor) -> torch.Tensor:
+        """Pad to the model's stride, run one batched forward pass and crop."""
+        _, _, h, w = img0.shape
+        unit = max(128, int(128 / self.scale))
+        ph = ((h - 1) // unit + 1) * unit
+        pw = ((w - 1) // unit + 1) * unit
+        padding = (0, pw - w, 0, ph - h)
+        
+        # Single frames are shared by every timestep of the batch
+        n = len(t)
+        img0 = F.pad(img0, padding).expand(n, -1, -1, -1)
+        img1 = F.pad(img1, padding).expand(n, -1, -1, -1)
+        scale_list = [8 / self.scale, 4 / self.scale, 2 / self.scale, 1 / self.scale]
+        
+        result = self.model(img0, img1, t, scale_list)
+        if self.tta:
+            flipped = self.model(img0.flip(3), img1.flip(3), t, scale_list)
+            result = (result + flipped.flip(3)) / 2
+        
+        return result[..., :h, :w]
+    
+    def _tile_size(self, h: int, w: int, batch: int) -> Tuple[int, int]:
+        """Largest tile that fits the memory budget for a batch."""
+        budget = self.vram_mb * 1024 ** 2 * VRAM_HEADROOM
+        per_pixel = BYTES_PER_PIXEL * batch * (0.5 if self.fp16 else 1.0)
+        max_pixels = budget / per_pixel
+        if h * w <= max_pixels:
+            return h, w
+        
+        # Whole multiples of the padding unit so tiles are not padded further
+        unit = max(128, int(128 / self.scale))
+        side = max(int(max_pixels ** 0.5) // unit * unit, unit, 2 * self.tile_overlap + unit // 2)
+        return min(side, h), min(side, w)
+    
+    def _feather(self, y0: int, y1: int, h: int, x0: int, x1: int, w: int,
+                 overlap: int) -> torch.Tensor:
+        """Blend weights ramping down towards edges shared with other tiles."""
+        wy = _ramp(y1 - y0, overlap, y0 > 0, y1 < h)
+        wx = _ramp(x1 - x0, overlap, x0 > 0, x1 < w)
+        weight = np.outer(wy, wx).astype(np.float32)
+        return torch.from_numpy(weight).to(self.device)[None, None]
+    
+    def _to_tensor(self, frame: np.ndarray) -> torch.Tensor:
+        """Convert an (H, W[, C]) frame to a (1, 3, H, W) tensor in [0, 1].
+        
+        Integer frames are divided by the largest value of their dtype.
         """
-        # TODO: Implement mask-aware interpolation
-        return self.interpolate_frames(frame1, frame2, num_frames)
\ No newline at end of file
+        with self._span('rife.upload'):
+            if frame.ndim == 2:
+                frame = frame[..., None]
+            rgb = frame[..., :3] if frame.shape[2] >= 3 else np.repeat(frame[..., :1], 3, axis=2)
+            if np.issubdtype(rgb.dtype, np.integer) and rgb.dtype != np.uint8:
+                # torch lacks most unsigned types; upload wider integers as float
+                rgb = rgb.astype(np.float32)
+            tensor = torch.from_numpy(np.ascontiguousarray(rgb)).to(self.device)
+            tensor = tensor.permute(2, 0, 1)[None].float()
+            if np.issubdtype(frame.dtype, np.integer):
+                tensor = tensor / float(np.iinfo(frame.dtype).max)
+            return tensor.to(self.dtype)
+    
+    def _to_numpy(self, result: torch.Tensor, dtype) -> np.ndarray:
+        """Convert a (B, 3, H, W) tensor in [0, 1] to (B, H, W, 3) frames.
+        
+        Integer frames are scaled back to the full range of their dtype.
+        """
+        with self._span('rife.download'):
+            result = result.float().clamp_(0, 1).permute(0, 2, 3, 1)
+            if np.issubdtype(dtype, np.integer):
+                result = (result * float(np.iinfo(dtype).max)).round_()
+                if dtype == np.uint8:
+                    result = result.to(torch.uint8)
+            return result.cpu().numpy().astype(dtype, copy=False)
+
+
+def _default_timesteps(num_frames: int, curve=None) -> List[float]:
+    """Evenly spaced timesteps, or the interior samples of a timing curve."""
+    if curve is not None:
+        return rife_timesteps(curve, num_frames).tolist()
+    return [i / (num_frames + 1) for i in range(1, num_frames + 1)]
+
+
+def _store_rgb(target: np.ndarray, rgb: np.ndarray):
+    """Write model RGB output into ``target``, averaging it for grayscale frames."""
+    if target.ndim == rgb.ndim and target.shape[-1] >= 3:
+        target[..., :3] = rgb
+        return
+    gray = rgb.mean(axis=-1)
+    if np.issubdtype(target.dtype, np.integer):
+        gray = np.rint(gray)
+    target[...] = gray[..., None] if target.ndim == rgb.ndim else gray
+
+
+def _run_once(infer, frame1, frame2, timesteps, out):
+    """Run a model inference filling ``out``, reporting the filled range."""
+    infer(frame1, frame2, timesteps, out)
+    yield 0, len(timesteps)
+
+
+def _blend(frame1: np.ndarray, frame2: np.ndarray, timesteps: Sequence[float],
+           out: np.ndarray):
+    """Linearly blend two frames into the preallocated block ``out``.
+    
+    Float frames are blended in place in one broadcast over all timesteps.
+    Integer frames use OpenCV's SIMD blend, which computes in float32 and
+    rounds to the nearest integer, writing straight into each frame's view
+    of ``out``. An integer fixed-point blend in NumPy (uint16 multiply-add
+    and a shift) measured several times slower on 1080p frames.
+    
+    Yields:
+        (start, stop) index ranges of ``out`` as they are filled
+    """
+    n = len(timesteps)
+    alphas = np.asarray(timesteps, dtype=np.float64)
+    
+    if np.issubdtype(frame1.dtype, np.floating):
+        a = alphas.astype(frame1.dtype).reshape((-1,) + (1,) * frame1.ndim)
+        np.multiply(a, frame2 - frame1, out=out)
+        out += frame1
+        yield 0, n
+        return
+    
+    for i, alpha in enumerate(alphas):
+        cv2.addWeighted(frame1, 1 - alpha, frame2, alpha, 0, dst=out[i])
+        yield i, i + 1
+
+
+def _timed_chunks(filled, metrics, stage: str):
+    """Pass ``filled`` through, timing the production of every chunk."""
+    filled = iter(filled)
+    while True:
+        start = time.perf_counter()
+        chunk = next(filled, None)
+        if chunk is None:
+            return
+        metrics.observe(stage, time.perf_counter() - start)
+        yield chunk
+
+
+def _store_when_done(filled, cache, key: str, out: np.ndarray):
+    """Pass ``filled`` through and cache ``out`` once every frame is written."""
+    yield from filled
+    cache.put(key, out)
+
+
+def _tile_starts(length: int, tile: int, overlap: int) -> List[int]:
+    """Start offsets of overlapping tiles covering ``length``."""
+    if tile >= length:
+        return [0]
+    stride = tile - overlap
+    starts = list(range(0, length - tile, stride))
+    starts.append(length - tile)
+    return starts
+
+
+def _feather(region: np.ndarray, target: np.ndarray, weight: np.ndarray):
+    """Blend ``region`` into ``target`` in place with per-pixel ``weight``."""
+    if target.dtype in (np.uint8, np.float32):
+        # blendLinear only takes 8-bit and float32 images
+        target[...] = cv2.blendLinear(region, target, weight, 1 - weight).reshape(target.shape)
+        return
+    if target.ndim == 3:
+        weight = weight[..., None]
+    blended = region * weight + target * (1 - weight)
+    if np.issubdtype(target.dtype, np.integer):
+        info = np.iinfo(target.dtype)
+        blended = np.clip(np.rint(blended), info.min, info.max)
+    target[...] = blended
+
+
+def _ramp(length: int, overlap: int, ramp_start: bool, ramp_end: bool) -> np.ndarray:
+    """1-D blend weights with linear ramps over the overlapping ends."""
+    weights = np.ones(length, dtype=np.float32)
+    n = min(overlap, length // 2)
+    if n > 0:
+        ramp = np.arange(1, n + 1, dtype=np.float32) / (n + 1)
+        if ramp_start:
+            weights[:n] = ramp
+        if ramp_end:
+            weights[-n:] = ramp[::-1]
+    return weights
\ No newline at end of file
@@ -1,20 +1,45 @@
 """Backend server for handling AI processing requests."""
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, has_request_context, request, jsonify, stream_with_context
 from flask_cors import CORS
+import atexit
+import functools
+import ipaddress
 import json
 import logging
+import re
+import signal
+import subprocess
+import tempfile
+import threading
+import time
+import uuid
+import weakref
+from collections import OrderedDict
 from pathlib import Path
 import numpy as np
 
+# Reference point of the startup-time report
+_started = time.perf_counter()
+
 # Import relative modules properly
 import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from core.transform import FPVTransform
+from core.pool import QUALITY_SCALES, TransformPool
+from core.cache import RenderCache
+from core.pipeline import FramePipeline
+from core.farm import RenderFarm
+from core.ring import FrameRing
+from core.sequence import FrameSequence
+from core import codec
 from core.interpolation import trajectory_interpolate
-from ai.rife_wrapper import RIFEInterpolator
+from core.timing import intensity_curve, timing_lut
+from core.metrics import Metrics
+
+# torch and the RIFE model load in the background warm-up thread, so the
+# server starts listening before they are imported
 
 app = Flask(__name__)
 CORS(app)
@@ -31,31 +56,167 @@ else:
         'logging': {'log_level': 'info', 'log_file': 'fpv_plugin.log'}
     }
 
+
+class RequestIdFilter(logging.Filter):
+    """Adds the current request ID (``-`` outside a request) to log records."""
+    
+    def filter(self, record):
+        record.request_id = g.get('request_id', '-') if has_request_context() else '-'
+        return True
+
+
 # Setup logging
 logging.basicConfig(
     level=getattr(logging, config['logging']['log_level'].upper()),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    format='%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s',
     filename=config['logging']['log_file']
 )
+for handler in logging.getLogger().handlers:
+    handler.addFilter(RequestIdFilter())
 logger = logging.getLogger(__name__)
 
+# Stage timings and counters exposed at /api/metrics
+metrics = Metrics()
+# Batch pipelines currently running, for queue depth gauges
+active_pipelines = weakref.WeakSet()
+
+# Requests being handled, drained on graceful shutdown
+in_flight = 0
+in_flight_changed = threading.Condition()
+shutting_down = threading.Event()
+
 # Initialize components
-transform = None
+rendering_config = config.get('3d_rendering', {})
+transform_options = {
+    'warp_method': rendering_config.get('warp_method', 'perspective'),
+    'interpolation': rendering_config.get('interpolation', 'linear'),
+    'border_mode': rendering_config.get('border_mode', 'constant'),
+    'map_cache_size': rendering_config.get('remap_cache_size', 16),
+    'motion_blur_samples': rendering_config.get('motion_blur_samples', 16),
+    'motion_blur_step': rendering_config.get('motion_blur_step_px', 1.0)
+}
+transform_pool = TransformPool(
+    max_entries=config.get('performance', {}).get('transform_pool_size', 4),
+    precompute_grids=transform_options['warp_method'] == 'remap',
+    **transform_options
+)
 interpolator = None
 
-# Check GPU availability
-try:
-    import torch
-    if torch.cuda.is_available() and config['device']['use_cuda']:
-        device = 'cuda'
-        logger.info(f"Using GPU: {torch.cuda.get_device_name(0)}")
-        logger.info(f"VRAM: {torch.cuda.get_device_properties(0).total_memory / 1024**3:.1f} GB")
-    else:
-        device = 'cpu'
-        logger.warning("CUDA not available, falling back to CPU")
-except ImportError:
-    device = 'cpu'
-    logger.warning("PyTorch not installed, using CPU only")
+# Rendered frames keyed by source content and parameters
+performance_config = config.get('performance', {})
+cache_dir = performance_config.get('cache_dir')
+render_cache = RenderCache(
+    memory_mb=performance_config.get('cache_size_mb', 1024),
+    cache_dir=str(config_path.parent.parent / cache_dir) if cache_dir else None,
+    disk_mb=performance_config.get('cache_disk_mb')
+)
+
+# Frame sequences on disk, kept open (mapped) between requests
+sequence_readahead = (performance_config.get('readahead_frames', 8)
+                      if performance_config.get('preload_clips', True) else 0)
+sequence_roots = [(config_path.parent.parent / Path(root).expanduser()).resolve()
+                  for root in performance_config.get('sequence_roots', [])]
+open_sequences = OrderedDict()
+open_sequences_lock = threading.Lock()
+
+# Split the CPU thread budget between pipeline stages; decode and encode
+# (PIL/zlib) dominate the warp itself
+cpu_threads = config['device'].get('cpu_threads', 4)
+pipeline_workers = {
+    'decode_workers': max(1, cpu_threads * 3 // 8),
+    'warp_workers': max(1, cpu_threads // 4),
+    'encode_workers': max(1, cpu_threads * 3 // 8)
+}
+
+# Render farm worker processes are started on the first job
+render_farm = None
+render_farm_lock = threading.Lock()
+
+# Frame rings shared with local clients, keyed by (kind, name or path)
+transport_config = config.get('transport', {})
+frame_ring_dir = Path(transport_config.get('frame_ring_dir')
+                      or Path(tempfile.gettempdir()) / 'fpv-frames')
+frame_rings = {}
+frame_rings_lock = threading.Lock()
+
+# Browser origins allowed on the local-only endpoints, see _local_only();
+# the CEP panel is loaded from disk and sends ``null`` (or ``file://``)
+local_origins = set(config.get('server', {}).get('local_origins', ['null', 'file://']))
+
+# Model warm-up state, see start_warm_up()
+device = None
+model_state = 'pending'
+model_error = None
+startup_timings = {'imports_seconds': time.perf_counter() - _started}
+warm_up_lock = threading.Lock()
+warm_up_thread = None
+
+
+def _local_only(view):
+    """Restrict an endpoint to clients on this machine.
+    
+    Requests must come from a loopback address, and requests made by web
+    pages (which carry an ``Origin`` header) only from the origins listed in
+    ``server.local_origins``, so neither other hosts nor sites open in a
+    local browser can reach the files and memory these endpoints expose.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        origin = request.headers.get('Origin')
+        if not _is_loopback(request.remote_addr) or (origin is not None and origin not in local_origins):
+            return jsonify({'success': False, 'error': 'Only available to local clients'}), 403
+        return view(*args, **kwargs)
+    return wrapper
+
+
+def _is_loopback(address):
+    try:
+        ip = ipaddress.ip_address(address or '')
+    except ValueError:
+        return False
+    mapped = getattr(ip, 'ipv4_mapped', None)
+    return (mapped or ip).is_loopback
+
+
+@app.before_request
+def _start_request():
+    """Assign a request ID, taken from ``X-Request-ID`` when valid."""
+    request_id = request.headers.get('X-Request-ID', '')
+    g.request_id = request_id if re.fullmatch(r'[\w.-]{1,64}', request_id) else uuid.uuid4().hex[:16]
+    g.request_started = time.perf_counter()
+    
+    global in_flight
+    with in_flight_changed:
+        in_flight += 1
+    if shutting_down.is_set() and request.endpoint != 'status':
+        return jsonify({'success': False, 'error': 'Server is shutting down'}), 503
+
+
+@app.teardown_request
+def _end_request(error=None):
+    global in_flight
+    with in_flight_changed:
+        in_flight -= 1
+        in_flight_changed.notify_all()
+
+
+@app.after_request
+def _finish_request(response):
+    """Echo the request ID and record the request latency."""
+    response.headers['X-Request-ID'] = g.request_id
+    metrics.histogram('request_duration_seconds', 'HTTP request latency').observe(
+        time.perf_counter() - g.request_started,
+        endpoint=request.endpoint or 'unknown',
+        method=request.method,
+        status=response.status_code
+    )
+    return response
+
+
+@app.route('/api/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Stage latencies, cache hit rates and queue depths in Prometheus text format."""
+    return Response(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
 
 
 @app.route('/api/status', methods=['GET'])
@@ -63,114 +224,1052 @@ def status():
     """Get server status and hardware info."""
     return jsonify({
         'status': 'running',
+        'ready': model_state == 'ready',
+        'model_state': model_state,
+        'model_error': model_error,
+        'model_loaded': interpolator is not None and interpolator.model is not None,
         'device': device,
         'gpu_available': device == 'cuda',
         'vram_mb': config['device']['vram_mb'],
+        'uptime_seconds': time.perf_counter() - _started,
+        'startup': startup_timings,
+        'shutting_down': shutting_down.is_set(),
+        'render_cache': render_cache.info(),
         'config': config
     })
 
 
 @app.route('/api/transition', methods=['POST'])
 def create_transition():
-    """Create transition between clips."""
+    """Create transition between clips.
+    
+    Frames are spaced by a timing curve: ``curve`` names one of
+    ``core.timing.CURVES`` or gives ``cubic-bezier(x1, y1, x2, y2)``, and
+    defaults to the curve of ``intensity``. ``timing`` in the response is
+    the progress of each keyframe along the move, the LUT that also spaces
+    RIFE in-betweens (``RIFEInterpolator.interpolate_frames(curve=...)``).
+    """
     try:
         data = request.json
         start_rotation = data.get('start_rotation', [0, 0, 0])
         end_rotation = data.get('end_rotation', [0, 0, 0])
         duration = data.get('duration', 1.0)
         intensity = data.get('intensity', 'medium')
+        curve = data.get('curve') or intensity_curve(intensity)
+        
+        logger.info(f"Creating transition: {start_rotation} -> {end_rotation}, "
+                    f"duration: {duration}s, curve: {curve}")
+        
+        # Interpolate straight to angles for ExtendScript
+        with metrics.span('transition.trajectory'):
+            interpolated_angles, timing = _transition_keyframes(start_rotation, end_rotation,
+                                                                duration, curve)
+        num_frames = len(interpolated_angles)
+        
+        with metrics.span('transition.serialize'):
+            return jsonify({
+                'success': True,
+                'frames': num_frames,
+                'keyframes': interpolated_angles.tolist(),
+                'curve': curve,
+                'timing': timing.tolist(),
+                'message': 'Transition created successfully'
+            })
         
-        logger.info(f"Creating transition: {start_rotation} -> {end_rotation}, duration: {duration}s")
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error creating transition: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@app.route('/api/transform', methods=['POST'])
+def transform_frame():
+    """Apply FPV transformation to a single frame.
+    
+    The frame is uploaded as the ``frame`` file field or sent as the raw
+    request body (``application/octet-stream`` with ``X-Frame-Shape`` and
+    ``X-Frame-Dtype`` headers, or ``image/tiff``). The response format is
+    negotiated from ``format`` or the ``Accept`` header, see ``core.codec``.
+    
+    ``quality`` (``final``, ``half`` or ``quarter``) renders a proxy for
+    scrubbing; proxies keep their reduced size unless ``upscale`` is set.
+    """
+    try:
+        fmt = codec.negotiate(request.headers.get('Accept'), request.values.get('format'))
+        shape, dtype = _raw_frame_options()
+        
+        # Read frame
+        with metrics.span('transform.decode'):
+            frame = _upload_frame(shape, dtype)
+        if frame is None:
+            return jsonify({'error': 'Frame required'}), 400
+        quality, upscale = _quality_options()
+        transform = transform_pool.for_frame(frame)
+        
+        # Get transformation parameters
+        rotation = [
+            float(request.values.get('tilt', 0)),
+            float(request.values.get('pan', 0)),
+            float(request.values.get('roll', 0))
+        ]
+        fov_factor = float(request.values.get('fov', 1.0))
+        
+        # Apply rotation and FOV in a single warp, unless this exact frame
+        # was rendered with the same parameters before
+        with metrics.span('transform.cache_key'):
+            key = render_cache.key([frame], 'warp', rotation, fov_factor, transform.focal_length,
+                                   transform.warp_method, transform.interpolation,
+                                   transform.border_mode, quality, upscale)
+        
+        def warp():
+            with metrics.span('transform.warp'):
+                return transform_pool.warp(frame, rotation, fov_factor, quality, upscale)
+        
+        result = render_cache.get_or_compute(key, warp)
         
-        # Calculate number of interpolation steps
-        fps = 30  # Assume 30fps
-        num_frames = int(duration * fps)
+        if fmt != 'json':
+            with metrics.span('transform.encode', format=fmt):
+                body = codec.encode_frame(result, fmt)
+            return Response(body, mimetype=codec.FORMATS[fmt], headers=codec.frame_headers(result))
         
-        # Check if we need to limit frames for GTX 1650
-        if config['device']['vram_mb'] < 6000 and num_frames > 30:
-            logger.warning(f"Limiting frames from {num_frames} to 30 for GTX 1650")
-            num_frames = 30
+        with metrics.span('transform.encode', format='png'):
+            encoded = _encode_frame(result)
+        with metrics.span('transform.serialize'):
+            return jsonify({
+                'success': True,
+                'frame': encoded,
+                'quality': quality
+            })
+        
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error transforming frame: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@app.route('/api/rings', methods=['POST'])
+@_local_only
+def create_ring():
+    """Create a frame ring for zero-copy exchange with a local client.
+    
+    JSON body: ``slots`` and ``slot_bytes``, and ``kind`` (``shm`` for named
+    shared memory, ``file`` for a memory-mapped file in the frame ring
+    directory). The response gives the ring's ``name`` or ``path`` and the
+    byte offset of every slot. Rings created by a client are used directly,
+    without this call, by passing their name or path to
+    ``/api/transform/shm``. Each ring is limited to
+    ``transport.max_ring_mb`` and all rings mapped by the backend together
+    to ``transport.max_total_ring_mb``. Only local clients may call the
+    ring endpoints.
+    """
+    try:
+        if not transport_config.get('shared_memory', True):
+            raise ValueError('Shared memory transport is disabled')
+        data = request.json or {}
+        kind = data.get('kind', 'shm')
+        slots = int(data.get('slots', 4))
+        slot_bytes = int(data['slot_bytes'])
+        max_bytes = transport_config.get('max_ring_mb', 1024) * 1024 ** 2
+        if slots < 1 or slot_bytes < 1 or slots * slot_bytes > max_bytes:
+            raise ValueError(f'Ring of {slots} x {slot_bytes} bytes exceeds the '
+                             f'{max_bytes // 1024 ** 2} MB limit')
         
-        # Generate interpolated rotation matrices
-        # Convert rotation angles to matrices
-        start_mat = _rotation_angles_to_matrix(start_rotation)
-        end_mat = _rotation_angles_to_matrix(end_rotation)
+        if kind not in ('shm', 'file'):
+            raise ValueError(f"Unknown ring kind '{kind}', expected 'shm' or 'file'")
         
-        # Interpolate
-        interpolated_matrices = trajectory_interpolate(start_mat, end_mat, num_frames)
+        with frame_rings_lock:
+            _check_ring_budget(slots * slot_bytes)
+            if kind == 'shm':
+                ring = FrameRing.create_shared(
+                    slots, slot_bytes,
+                    name=f"{transport_config.get('shm_prefix', 'fpv_')}{uuid.uuid4().hex[:16]}")
+            else:
+                frame_ring_dir.mkdir(parents=True, exist_ok=True)
+                ring = FrameRing.create_file(frame_ring_dir.resolve() / f'{uuid.uuid4().hex}.ring',
+                                             slots, slot_bytes)
+            frame_rings[(ring.kind, ring.location)] = ring
+        logger.info(f"Created {kind} frame ring {ring.location} ({slots} x {ring.slot_bytes} bytes)")
         
-        # Convert back to angles for ExtendScript
-        interpolated_angles = [_matrix_to_rotation_angles(mat) for mat in interpolated_matrices]
+        return jsonify(dict(ring.describe(), success=True)), 201
+        
+    except (KeyError, ValueError) as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error creating frame ring: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@app.route('/api/rings', methods=['DELETE'])
+@_local_only
+def close_ring():
+    """Detach from a frame ring, removing it if the backend created it."""
+    try:
+        data = request.json or {}
+        key = _ring_key(data)
+        with frame_rings_lock:
+            ring = frame_rings.get(key)
+            if ring is None:
+                return jsonify({'error': 'Unknown ring'}), 404
+            ring.close()
+            del frame_rings[key]
+        return jsonify({'success': True})
+        
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except BufferError:
+        return jsonify({'success': False, 'error': 'Ring is in use'}), 409
+
+
+@app.route('/api/transform/shm', methods=['POST'])
+@_local_only
+def transform_shared():
+    """Apply FPV transformation to a frame held in a frame ring.
+    
+    Only the frame's location travels over HTTP; the backend reads the
+    input and writes the result in place, without copying either. JSON
+    body:
+    
+    - ``ring``: ``{"kind": "shm", "name": ...}`` or ``{"kind": "file", "path": ...}``
+    - ``input``: ``slot`` or byte ``offset``, ``shape`` and ``dtype``
+    - ``output``: ``slot`` or byte ``offset`` of the result, which must
+      not overlap the input
+    - ``tilt``, ``pan``, ``roll``, ``fov``, ``quality`` and ``upscale`` as
+      for ``/api/transform``
+    
+    Results are not stored in the render cache: hashing the frame would
+    cost more than the copies this path saves. The response gives the
+    result's offset, shape and dtype.
+    """
+    try:
+        data = request.json or {}
+        ring = _frame_ring(data.get('ring') or {})
+        source, target = data.get('input') or {}, data.get('output') or {}
+        
+        shape = source['shape']
+        dtype = source.get('dtype', 'uint8')
+        frame = ring.view(shape, dtype, source.get('slot'), source.get('offset'))
+        
+        rotation = [float(data.get('tilt', 0)), float(data.get('pan', 0)), float(data.get('roll', 0))]
+        fov_factor = float(data.get('fov', 1.0))
+        quality = str(data.get('quality', 'final')).lower()
+        if quality not in QUALITY_SCALES:
+            raise ValueError(f"Unknown quality '{quality}', expected one of {tuple(QUALITY_SCALES)}")
+        upscale = bool(data.get('upscale', False))
+        
+        with metrics.span('transform_shm.warp'):
+            if quality == 'final' or upscale:
+                out = ring.view(shape, dtype, target.get('slot'), target.get('offset'))
+                if np.shares_memory(frame, out):
+                    raise ValueError('Output overlaps the input frame')
+                if quality == 'final':
+                    transform_pool.for_frame(frame).warp(frame, rotation, fov_factor, out=out)
+                else:
+                    out[...] = transform_pool.warp(frame, rotation, fov_factor, quality, upscale)
+            else:
+                # Proxies are small; copy the reduced frame into the output slot
+                result = transform_pool.warp(frame, rotation, fov_factor, quality)
+                out = ring.view(result.shape, dtype, target.get('slot'), target.get('offset'))
+                if np.shares_memory(frame, out):
+                    raise ValueError('Output overlaps the input frame')
+                out[...] = result
         
         return jsonify({
             'success': True,
-            'frames': num_frames,
-            'keyframes': interpolated_angles,
-            'message': 'Transition created successfully'
+            'output': {
+                'offset': ring.slot_offset(target['slot']) if target.get('slot') is not None
+                          else int(target['offset']),
+                'shape': list(out.shape),
+                'dtype': out.dtype.name
+            },
+            'quality': quality
         })
         
+    except (KeyError, ValueError) as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
     except Exception as e:
-        logger.error(f"Error creating transition: {str(e)}")
+        logger.error(f"Error transforming shared frame: {str(e)}")
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
 
 
-@app.route('/api/transform', methods=['POST'])
-def transform_frame():
-    """Apply FPV transformation to a single frame."""
-    global transform
+@app.route('/api/transform/batch', methods=['POST'])
+def transform_batch():
+    """Apply FPV transformation to a clip segment in a single request.
     
+    Frames are uploaded either as repeated ``frames`` file fields or as one
+    ``clip`` container (``.npy`` stack or multi-page image). The schedule is
+    given by ``keyframes`` (JSON list of ``[tilt, pan, roll]``, as returned
+    by ``/api/transition``) and ``fov`` (number or JSON list). Binary
+    responses concatenate all frames, see ``core.codec.pack_frames``.
+    ``quality`` and ``upscale`` work as for ``/api/transform``.
+    ``motion_blur`` (shutter as a fraction of the frame interval, e.g.
+    ``0.5`` for a 180 degree shutter) blurs each frame over the camera move
+    towards the next keyframe.
+    """
     try:
-        if 'frame' not in request.files:
-            return jsonify({'error': 'Frame required'}), 400
+        fmt = codec.negotiate(request.headers.get('Accept'), request.values.get('format'))
+        shape, dtype = _raw_frame_options()
+        decode = functools.partial(_decode_upload, shape=shape, dtype=dtype)
         
-        # Read frame
-        frame = _file_to_numpy(request.files['frame'])
-        h, w = frame.shape[:2]
+        frames = _request_frames(request)
+        if not frames:
+            return jsonify({'error': 'Frames required'}), 400
         
-        # Initialize transform if needed
-        if transform is None:
-            transform = FPVTransform(w, h)
+        rotations, fov_factors = _parse_schedule(request.values, len(frames))
+        if len(frames) == 1 and len(rotations) > 1:
+            # Render a still frame through every keyframe of the schedule
+            frames = [decode(frames[0])] * len(rotations)
+        if len(rotations) != len(frames):
+            return jsonify({
+                'error': f'Schedule has {len(rotations)} keyframes for {len(frames)} frames'
+            }), 400
         
-        # Get transformation parameters
-        rotation = [
-            float(request.form.get('tilt', 0)),
-            float(request.form.get('pan', 0)),
-            float(request.form.get('roll', 0))
-        ]
-        fov_factor = float(request.form.get('fov', 1.0))
+        logger.info(f"Transforming batch of {len(frames)} frames")
         
-        # Apply transformations
-        result = transform.apply_rotation(frame, rotation)
-        result = transform.adjust_fov(result, fov_factor)
+        if fmt == 'json':
+            encode = _encode_frame
+        else:
+            encode = functools.partial(_encode_binary, fmt=fmt)
+        quality, upscale = _quality_options()
+        pipeline = FramePipeline(transform_pool, decode=decode, encode=encode,
+                                 quality=quality, upscale=upscale, metrics=metrics,
+                                 **pipeline_workers)
+        active_pipelines.add(pipeline)
+        results = list(pipeline.run(frames, _motion_blur_schedule(rotations, fov_factors)))
         
-        # Convert to base64
-        from PIL import Image
-        import io
-        import base64
+        if fmt != 'json':
+            body, headers = codec.pack_frames([chunk for chunk, _ in results], fmt, results[0][1])
+            return Response(body, mimetype=codec.FORMATS[fmt], headers=headers)
         
-        img = Image.fromarray(result.astype('uint8'))
-        buffer = io.BytesIO()
-        img.save(buffer, format='PNG')
-        img_str = base64.b64encode(buffer.getvalue()).decode()
+        return jsonify({
+            'success': True,
+            'count': len(results),
+            'frames': results
+        })
+        
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error transforming batch: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@app.route('/api/transform/sequence', methods=['POST'])
+@_local_only
+def transform_sequence():
+    """Apply FPV transformation to frames of a clip stored on disk.
+    
+    ``path`` names an ``.npy`` stack, a ``.raw``/``.bin`` dump (``shape``/
+    ``dtype`` as for raw uploads, optional byte ``offset``), a directory of
+    numbered images or a glob pattern, inside one of
+    ``performance.sequence_roots``; only local clients may call it. Stacks
+    and raw dumps are memory-mapped and only the frames rendered are read,
+    so memory use does not grow with the length of the clip. Frames are
+    chosen by ``frames`` (JSON list of indices) or ``start`` and ``count``
+    (``count`` defaults to the number of keyframes, or the rest of the
+    clip). The schedule, ``quality``, ``upscale``, ``motion_blur`` and
+    response format work as for ``/api/transform/batch``.
+    """
+    try:
+        fmt = codec.negotiate(request.headers.get('Accept'), request.values.get('format'))
+        shape, dtype = _raw_frame_options()
+        if not request.values.get('path'):
+            return jsonify({'error': 'Sequence path required'}), 400
+        sequence = _open_sequence(request.values['path'], shape, dtype,
+                                  int(request.values.get('offset', 0)))
+        
+        if 'frames' in request.values:
+            indices = [int(i) for i in json.loads(request.values['frames'])]
+        else:
+            start = int(request.values.get('start', 0))
+            if 'count' in request.values:
+                count = int(request.values['count'])
+            elif 'keyframes' in request.values:
+                count = len(json.loads(request.values['keyframes']))
+            else:
+                count = len(sequence) - start
+            indices = list(range(start, start + count))
+        if not indices:
+            return jsonify({'error': 'Frames required'}), 400
+        if not all(-len(sequence) <= i < len(sequence) for i in indices):
+            raise ValueError(f'Frame indices out of range for a sequence of {len(sequence)} frames')
+        
+        rotations, fov_factors = _parse_schedule(request.values, len(indices))
+        if len(rotations) != len(indices):
+            return jsonify({
+                'error': f'Schedule has {len(rotations)} keyframes for {len(indices)} frames'
+            }), 400
+        
+        logger.info(f"Transforming {len(indices)} frames of sequence {sequence.path}")
+        
+        if fmt == 'json':
+            encode = _encode_frame
+        else:
+            encode = functools.partial(_encode_binary, fmt=fmt)
+        quality, upscale = _quality_options()
+        pipeline = FramePipeline(transform_pool, decode=sequence.__getitem__, encode=encode,
+                                 quality=quality, upscale=upscale, metrics=metrics,
+                                 **pipeline_workers)
+        active_pipelines.add(pipeline)
+        results = list(pipeline.run(indices, _motion_blur_schedule(rotations, fov_factors)))
+        
+        if fmt != 'json':
+            body, headers = codec.pack_frames([chunk for chunk, _ in results], fmt, results[0][1])
+            return Response(body, mimetype=codec.FORMATS[fmt], headers=headers)
         
         return jsonify({
             'success': True,
-            'frame': img_str
+            'count': len(results),
+            'frames': results
         })
         
+    except (FileNotFoundError, ValueError) as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
     except Exception as e:
-        logger.error(f"Error transforming frame: {str(e)}")
+        logger.error(f"Error transforming sequence: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@app.route('/api/jobs', methods=['POST'])
+@app.route('/api/transform/async', methods=['POST'])
+def submit_job():
+    """Submit a batch transform as a render farm job.
+    
+    Accepts the same fields as ``/api/transform/batch``, including
+    ``quality``, ``upscale`` and ``motion_blur``, as well as the ``frame``
+    field or raw request body of ``/api/transform``, and returns a job ID
+    immediately; frames are sharded across the worker processes.
+    """
+    try:
+        shape, dtype = _raw_frame_options()
+        frames = [_decode_upload(item, shape, dtype) for item in _request_frames(request)]
+        frame = _upload_frame(shape, dtype)
+        if frame is not None:
+            frames.insert(0, frame)
+        if not frames:
+            return jsonify({'error': 'Frames required'}), 400
+        
+        rotations, fov_factors = _parse_schedule(request.values, len(frames))
+        if len(frames) == 1 and len(rotations) > 1:
+            frames = frames * len(rotations)
+        if len(rotations) != len(frames):
+            return jsonify({
+                'error': f'Schedule has {len(rotations)} keyframes for {len(frames)} frames'
+            }), 400
+        
+        job_id = _submit_render_job(frames, rotations, fov_factors)
+        logger.info(f"Submitted render job {job_id} with {len(frames)} frames")
+        
+        return jsonify({
+            'success': True,
+            'job_id': job_id
+        }), 202
+        
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error submitting job: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    """Poll the progress of a render job."""
+    status = render_farm.status(job_id) if render_farm is not None else None
+    if status is None:
+        return jsonify({'error': 'Unknown job'}), 404
+    return jsonify(dict(status, success=True))
+
+
+@app.route('/api/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    """Cancel a running render job, or free the frames of a finished one."""
+    status = render_farm.status(job_id) if render_farm is not None else None
+    if status is None:
+        return jsonify({'error': 'Unknown job'}), 404
+    if status['state'] != 'running' and render_farm.release(job_id):
+        logger.info(f"Released render job {job_id}")
+        return jsonify(dict(status, success=True, released=True))
+    
+    render_farm.cancel(job_id)
+    logger.info(f"Cancelled render job {job_id}")
+    return jsonify(dict(render_farm.status(job_id) or status, success=True, released=False))
+
+
+@app.route('/api/jobs/<job_id>/result', methods=['GET'])
+def job_result(job_id):
+    """Fetch the frames of a finished render job."""
+    status = render_farm.status(job_id) if render_farm is not None else None
+    if status is None:
+        return jsonify({'error': 'Unknown job'}), 404
+    if status['state'] != 'done':
+        return jsonify({'error': f"Job is {status['state']}", 'state': status['state']}), 409
+    
+    try:
+        fmt = codec.negotiate(request.headers.get('Accept'), request.values.get('format'))
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    
+    frames = render_farm.result(job_id)
+    if fmt != 'json':
+        body, headers = codec.encode_frames(frames, fmt)
+        return Response(body, mimetype=codec.FORMATS[fmt], headers=headers)
+    
+    return jsonify({
+        'success': True,
+        'count': len(frames),
+        'frames': [_encode_frame(frame) for frame in frames]
+    })
+
+
+@app.route('/api/transition/async', methods=['POST'])
+def submit_transition_job():
+    """Render uploaded frame(s) through a transition as a background job.
+    
+    Form fields ``start_rotation``/``end_rotation`` (JSON lists), ``duration``,
+    ``intensity``/``curve`` and ``fov`` define the schedule as in
+    ``/api/transition``; a single frame
+    is rendered through every keyframe. ``quality``, ``upscale`` and
+    ``motion_blur`` work as for ``/api/transform/batch``. Returns a job ID
+    immediately.
+    """
+    try:
+        shape, dtype = _raw_frame_options()
+        frames = [_decode_upload(item, shape, dtype) for item in _request_frames(request)]
+        frame = _upload_frame(shape, dtype)
+        if frame is not None:
+            frames.insert(0, frame)
+        if not frames:
+            return jsonify({'error': 'Frame required'}), 400
+        
+        keyframes, _ = _transition_keyframes(
+            json.loads(request.values.get('start_rotation', '[0, 0, 0]')),
+            json.loads(request.values.get('end_rotation', '[0, 0, 0]')),
+            float(request.values.get('duration', 1.0)),
+            request.values.get('curve') or intensity_curve(request.values.get('intensity', 'medium'))
+        )
+        keyframes = keyframes.tolist()
+        if not keyframes:
+            return jsonify({'error': 'Transition is too short to produce any keyframes'}), 400
+        if len(frames) == 1:
+            frames = frames * len(keyframes)
+        if len(frames) != len(keyframes):
+            return jsonify({
+                'error': f'Transition has {len(keyframes)} keyframes for {len(frames)} frames'
+            }), 400
+        fov_factors = [float(request.values.get('fov', 1.0))] * len(keyframes)
+        
+        job_id = _submit_render_job(frames, keyframes, fov_factors)
+        logger.info(f"Submitted transition job {job_id} with {len(frames)} frames")
+        
+        return jsonify({
+            'success': True,
+            'job_id': job_id,
+            'frames': len(frames),
+            'keyframes': keyframes
+        }), 202
+        
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error submitting transition job: {str(e)}")
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
 
 
-def _file_to_numpy(file):
-    """Convert uploaded file to numpy array."""
+@app.route('/api/jobs/<job_id>/stream', methods=['GET'])
+def stream_job(job_id):
+    """Stream a job's frames as server-sent events as soon as each completes.
+    
+    Emits ``frame`` events (``{"index", "frame"}``), ``progress`` events with
+    the job status, and a final ``end`` event.
+    """
+    if render_farm is None or render_farm.status(job_id) is None:
+        return jsonify({'error': 'Unknown job'}), 404
+    
+    def events():
+        sent = set()
+        while True:
+            status = render_farm.status(job_id)
+            if status is None:
+                break
+            
+            done = render_farm.completed_frames(job_id)
+            fresh = [int(i) for i in done if int(i) not in sent] if done is not None else []
+            for index in fresh:
+                frame = render_farm.frame(job_id, index)
+                if frame is None:
+                    # Released while streaming
+                    return
+                sent.add(index)
+                yield _sse('frame', {'index': index, 'frame': _encode_frame(frame)})
+            
+            if fresh or status['state'] != 'running':
+                status.pop('frame_states')
+                yield _sse('progress', status)
+            if status['state'] != 'running':
+                yield _sse('end', {'state': status['state'], 'error': status['error']})
+                break
+            time.sleep(0.02)
+    
+    return Response(stream_with_context(events()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+def _sse(event, data):
+    """Format one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _transition_keyframes(start_rotation, end_rotation, duration, curve='linear'):
+    """Compute the per-frame rotation angles of a transition and their timing.
+    
+    Returns:
+        (angles, progress) with the per-frame progress from ``curve``'s LUT
+    """
+    # Calculate number of interpolation steps
+    fps = 30  # Assume 30fps
+    num_frames = int(duration * fps)
+    
+    # Check if we need to limit frames for GTX 1650
+    if config['device']['vram_mb'] < 6000 and num_frames > 30:
+        logger.warning(f"Limiting frames from {num_frames} to 30 for GTX 1650")
+        num_frames = 30
+    
+    # Convert rotation angles to matrices
+    start_mat = _rotation_angles_to_matrix(start_rotation)
+    end_mat = _rotation_angles_to_matrix(end_rotation)
+    
+    timing = timing_lut(curve, num_frames)
+    return trajectory_interpolate(start_mat, end_mat, num_frames, output='angles',
+                                  timesteps=timing), timing
+
+
+def start_warm_up():
+    """Start loading the RIFE model in a background thread (once).
+    
+    ``/api/status`` reports ``model_state`` as ``pending``, ``loading``,
+    ``ready``, ``unavailable`` (PyTorch not installed) or ``failed``.
+    """
+    global warm_up_thread
+    
+    with warm_up_lock:
+        if warm_up_thread is None:
+            warm_up_thread = threading.Thread(target=_warm_up, name='fpv-warm-up', daemon=True)
+            warm_up_thread.start()
+    return warm_up_thread
+
+
+def _warm_up():
+    """Import torch, load the RIFE model and run one small forward pass."""
+    global device, interpolator, model_state, model_error
+    model_state = 'loading'
+    
+    try:
+        step = time.perf_counter()
+        try:
+            import torch
+        except ImportError:
+            device = 'cpu'
+            model_state = 'unavailable'
+            logger.warning("PyTorch not installed, using CPU only")
+            return
+        startup_timings['torch_import_seconds'] = time.perf_counter() - step
+        
+        # Check GPU availability
+        step = time.perf_counter()
+        if torch.cuda.is_available() and config['device']['use_cuda']:
+            device = 'cuda'
+            logger.info(f"Using GPU: {torch.cuda.get_device_name(0)}")
+            logger.info(f"VRAM: {torch.cuda.get_device_properties(0).total_memory / 1024**3:.1f} GB")
+        else:
+            device = 'cpu'
+            logger.warning("CUDA not available, falling back to CPU")
+        startup_timings['device_probe_seconds'] = time.perf_counter() - step
+        
+        step = time.perf_counter()
+        from ai.rife_wrapper import RIFEInterpolator
+        rife_config = config.get('rife', {})
+        model_path = rife_config.get('model_path')
+        if model_path is not None:
+            model_path = str(config_path.parent.parent / model_path)
+        interpolator = RIFEInterpolator(
+            model_path=model_path,
+            device=device,
+            inference_args=rife_config.get('inference_args'),
+            vram_mb=config['device']['vram_mb'],
+            cache=render_cache,
+            metrics=metrics
+        )
+        startup_timings['model_load_seconds'] = time.perf_counter() - step
+        
+        # The first pass initializes CUDA kernels and cuDNN autotuning
+        step = time.perf_counter()
+        dummy = np.zeros((256, 256, 3), dtype=np.uint8)
+        interpolator.interpolate_frames(dummy, dummy, num_frames=1)
+        startup_timings['warm_up_pass_seconds'] = time.perf_counter() - step
+        
+        model_state = 'ready'
+    except Exception as e:
+        model_state = 'failed'
+        model_error = str(e)
+        logger.error(f"Model warm-up failed: {str(e)}")
+    finally:
+        startup_timings['ready_seconds'] = time.perf_counter() - _started
+        logger.info("Startup report: " + ', '.join(
+            f"{name[:-len('_seconds')]} {seconds:.2f}s" for name, seconds in startup_timings.items()
+        ) + f" (model {model_state})")
+
+
+def _collect_metrics():
+    """Gauge and counter samples for /api/metrics."""
+    cache = render_cache.info()
+    yield ('render_cache_lookups_total', 'counter', 'Render cache lookups by result', [
+        ({'result': 'memory_hit'}, cache['memory_hits']),
+        ({'result': 'disk_hit'}, cache['disk_hits']),
+        ({'result': 'miss'}, cache['misses'])
+    ])
+    yield ('render_cache_hit_ratio', 'gauge', 'Fraction of render cache lookups that hit',
+           [({}, cache['hit_rate'])])
+    yield ('render_cache_bytes', 'gauge', 'Render cache size by tier', [
+        ({'tier': 'memory'}, cache['memory_mb'] * 1024 ** 2),
+        ({'tier': 'disk'}, cache['disk_mb'] * 1024 ** 2)
+    ])
+    
+    samples = []
+    for resolution, info in transform_pool.cache_info().items():
+        for cache_name, hits, misses in (('homography', 'hits', 'misses'),
+                                         ('remap', 'map_hits', 'map_misses')):
+            samples.append(({'resolution': resolution, 'cache': cache_name, 'result': 'hit'},
+                            info[hits]))
+            samples.append(({'resolution': resolution, 'cache': cache_name, 'result': 'miss'},
+                            info[misses]))
+    yield ('transform_cache_lookups_total', 'counter',
+           'Pose cache lookups per resolution and cache', samples)
+    
+    depths = {}
+    for pipeline in list(active_pipelines):
+        for stage, depth in pipeline.queue_depths().items():
+            depths[stage] = depths.get(stage, 0) + depth
+    yield ('pipeline_queue_depth', 'gauge', 'Items queued in front of each batch pipeline stage',
+           [({'stage': stage}, depth) for stage, depth in depths.items()])
+    
+    if render_farm is not None:
+        farm = render_farm.stats()
+        yield ('render_jobs', 'gauge', 'Render farm jobs by state',
+               [({'state': state}, count) for state, count in farm['jobs'].items()])
+        yield ('render_farm_queue_depth', 'gauge', 'Render farm shards not yet finished',
+               [({}, farm['pending_shards'])])
+    
+    yield ('model_ready', 'gauge', 'Whether the RIFE model finished warming up',
+           [({'state': model_state}, int(model_state == 'ready'))])
+
+
+metrics.add_collector(_collect_metrics)
+
+
+def _get_render_farm():
+    """Return the render farm, starting its worker processes on first use."""
+    global render_farm
+    
+    with render_farm_lock:
+        if render_farm is None:
+            workers = config.get('performance', {}).get('max_concurrent_tasks', 2)
+            render_farm = RenderFarm(
+                max_workers=workers,
+                threads_per_worker=max(1, cpu_threads // workers),
+                job_ttl=config.get('performance', {}).get('job_ttl_seconds', 600),
+                transform_kwargs=transform_options
+            )
+            atexit.register(render_farm.shutdown)
+        return render_farm
+
+
+def _submit_render_job(frames, rotations, fov_factors):
+    """Queue frames on the render farm with the request's quality and motion blur."""
+    if not rotations:
+        raise ValueError('Schedule has no keyframes')
+    quality, upscale = _quality_options()
+    schedule = _motion_blur_schedule(rotations, fov_factors)
+    blur_to = [pose[2:] for pose in schedule] if len(schedule[0]) > 2 else None
+    return _get_render_farm().submit(frames, rotations, fov_factors, quality=quality,
+                                     upscale=upscale, blur_to=blur_to)
+
+
+def _request_frames(req):
+    """Collect the frames of a batch request.
+    
+    Uploaded files are returned undecoded so that decoding can run on the
+    pipeline's worker threads; container frames are already numpy arrays.
+    """
+    frames = list(req.files.getlist('frames'))
+    if 'clip' in req.files:
+        frames.extend(_container_to_frames(req.files['clip']))
+    return frames
+
+
+def _upload_frame(shape=None, dtype='uint8'):
+    """Decode the ``frame`` field or raw request body, None if neither was sent."""
+    if 'frame' in request.files:
+        return _file_to_numpy(request.files['frame'], shape, dtype)
+    body_format = _upload_format(request.mimetype)
+    if body_format is not None:
+        return codec.decode_frame(request.get_data(), body_format, shape, dtype)
+    return None
+
+
+def _decode_upload(item, shape=None, dtype='uint8'):
+    """Decode an uploaded file, passing numpy frames through unchanged."""
+    if isinstance(item, np.ndarray):
+        return item
+    return _file_to_numpy(item, shape, dtype)
+
+
+def _open_sequence(path, shape=None, dtype='uint8', offset=0):
+    """Open a frame sequence inside the allowed roots, reusing open ones."""
+    if not sequence_roots:
+        raise ValueError('Frame sequences are disabled, see performance.sequence_roots')
+    resolved = Path(path).expanduser().resolve()
+    if not any(resolved.is_relative_to(root) for root in sequence_roots):
+        raise ValueError(f"Frame sequences must be inside {', '.join(map(str, sequence_roots))}")
+    
+    # Glob patterns have no mtime of their own; their directory changes with its files
+    stat_path = resolved if resolved.exists() else resolved.parent
+    key = (str(resolved), shape, str(dtype), offset, stat_path.stat().st_mtime_ns)
+    with open_sequences_lock:
+        sequence = open_sequences.get(key)
+        if sequence is not None:
+            open_sequences.move_to_end(key)
+            return sequence
+    
+    sequence = FrameSequence(resolved, shape, dtype, offset, readahead=sequence_readahead)
+    with open_sequences_lock:
+        open_sequences[key] = sequence
+        while len(open_sequences) > performance_config.get('open_sequences', 8):
+            # Requests may still be reading the evicted sequence; its mapping
+            # and read-ahead thread are released once the last one drops it
+            open_sequences.popitem(last=False)
+    return sequence
+
+
+def _raw_frame_options():
+    """Shape and dtype of raw frame uploads from request values or headers."""
+    shape = codec.parse_shape(request.values.get('shape') or request.headers.get('X-Frame-Shape'))
+    dtype = request.values.get('dtype') or request.headers.get('X-Frame-Dtype') or 'uint8'
+    return shape, dtype
+
+
+def _quality_options():
+    """Read the ``quality`` and ``upscale`` request parameters."""
+    quality = request.values.get('quality', 'final').lower()
+    if quality not in QUALITY_SCALES:
+        raise ValueError(f"Unknown quality '{quality}', expected one of {tuple(QUALITY_SCALES)}")
+    upscale = request.values.get('upscale', 'false').lower() in ('1', 'true', 'yes')
+    return quality, upscale
+
+
+def _ring_key(spec):
+    """Validate a ring reference and return its ``(kind, name or path)`` key.
+    
+    Shared memory names must carry the configured prefix and files must lie
+    in the frame ring directory, so requests cannot map arbitrary memory or
+    files into the backend.
+    """
+    kind = spec.get('kind', 'shm')
+    if kind == 'shm':
+        name = str(spec.get('name', '')).lstrip('/')
+        prefix = transport_config.get('shm_prefix', 'fpv_')
+        if not name.startswith(prefix) or not re.fullmatch(r'[\w.-]{1,200}', name):
+            raise ValueError(f"Shared memory name must start with '{prefix}'")
+        return kind, name
+    if kind == 'file':
+        path = Path(str(spec.get('path', ''))).resolve()
+        if not path.is_relative_to(frame_ring_dir.resolve()):
+            raise ValueError(f"Frame ring files must be in {frame_ring_dir}")
+        return kind, str(path)
+    raise ValueError(f"Unknown ring kind '{kind}', expected 'shm' or 'file'")
+
+
+def _frame_ring(spec):
+    """Return the referenced frame ring, attaching to it on first use."""
+    if not transport_config.get('shared_memory', True):
+        raise ValueError('Shared memory transport is disabled')
+    key = _ring_key(spec)
+    with frame_rings_lock:
+        ring = frame_rings.get(key)
+        if ring is None:
+            kind, location = key
+            try:
+                if kind == 'shm':
+                    ring = FrameRing.attach_shared(location)
+                else:
+                    ring = FrameRing.attach_file(location)
+            except FileNotFoundError:
+                raise ValueError(f"No frame ring at '{location}'")
+            try:
+                _check_ring_budget(ring.nbytes)
+            except ValueError:
+                ring.close()
+                raise
+            frame_rings[key] = ring
+            logger.info(f"Attached to {kind} frame ring {location}")
+        return ring
+
+
+def _check_ring_budget(nbytes):
+    """Refuse to map ``nbytes`` more ring memory past ``transport.max_total_ring_mb``.
+    
+    Call with ``frame_rings_lock`` held.
+    """
+    max_bytes = transport_config.get('max_total_ring_mb', 4096) * 1024 ** 2
+    mapped = sum(ring.nbytes for ring in frame_rings.values())
+    if mapped + nbytes > max_bytes:
+        raise ValueError(f'Frame rings would exceed the {max_bytes // 1024 ** 2} MB total limit '
+                         f'({mapped // 1024 ** 2} MB mapped)')
+
+
+def _close_frame_rings():
+    """Detach from all frame rings, removing the ones the backend created."""
+    with frame_rings_lock:
+        for ring in frame_rings.values():
+            try:
+                ring.close()
+            except BufferError:
+                pass
+        frame_rings.clear()
+
+
+atexit.register(_close_frame_rings)
+
+
+def _upload_format(mimetype):
+    """Map an upload MIME type to a codec format decoded without PIL."""
+    for fmt in ('raw', 'tiff', 'qoi'):
+        if mimetype == codec.FORMATS[fmt]:
+            return fmt
+    return None
+
+
+def _container_to_frames(file):
+    """Split an uploaded frame container into individual frames."""
+    from PIL import Image, ImageSequence
+    import io
+    
+    data = file.read()
+    if data[:6] == b'\x93NUMPY':
+        stack = np.load(io.BytesIO(data), allow_pickle=False)
+        if stack.ndim not in (3, 4):
+            raise ValueError(f'Expected (N, H, W[, C]) frame stack, got shape {stack.shape}')
+        return list(stack)
+    
+    img = Image.open(io.BytesIO(data))
+    return [np.array(page) for page in ImageSequence.Iterator(img)]
+
+
+def _parse_schedule(form, count):
+    """Parse per-frame rotations and FOV factors from batch request values.
+    
+    A single keyframe or FOV value is broadcast to ``count`` frames.
+    """
+    if 'keyframes' in form:
+        rotations = json.loads(form['keyframes'])
+    else:
+        rotations = [[
+            float(form.get('tilt', 0)),
+            float(form.get('pan', 0)),
+            float(form.get('roll', 0))
+        ]]
+    rotations = [[float(a) for a in rotation] for rotation in rotations]
+    if any(len(rotation) != 3 for rotation in rotations):
+        raise ValueError('Each keyframe must be [tilt, pan, roll]')
+    if len(rotations) == 1:
+        rotations = rotations * count
+    
+    fov = json.loads(form.get('fov', '1.0'))
+    if isinstance(fov, list):
+        fov_factors = [float(f) for f in fov]
+    else:
+        fov_factors = [float(fov)] * len(rotations)
+    if len(fov_factors) != len(rotations):
+        raise ValueError(f'Got {len(fov_factors)} FOV values for {len(rotations)} keyframes')
+    
+    return rotations, fov_factors
+
+
+def _motion_blur_schedule(rotations, fov_factors):
+    """Pair each keyframe with its shutter-close pose when ``motion_blur`` is set.
+    
+    The shutter closes ``motion_blur`` of the way towards the next keyframe;
+    the last frame continues the motion of the one before it. Keyframes are
+    one frame apart, so interpolating their angles linearly is accurate here.
+    """
+    shutter = float(request.values.get('motion_blur', 0))
+    if not 0 <= shutter <= 1:
+        raise ValueError('motion_blur must be between 0 and 1')
+    if shutter == 0 or len(rotations) < 2:
+        return list(zip(rotations, fov_factors))
+    
+    angles = np.asarray(rotations, dtype=float)
+    fovs = np.asarray(fov_factors, dtype=float)
+    angle_steps = np.diff(angles, axis=0, append=2 * angles[-1:] - angles[-2:-1])
+    fov_steps = np.diff(fovs, append=2 * fovs[-1] - fovs[-2])
+    end_angles = angles + shutter * angle_steps
+    end_fovs = fovs + shutter * fov_steps
+    return [(rotation, fov, list(end), float(end_fov))
+            for rotation, fov, end, end_fov in zip(rotations, fov_factors, end_angles, end_fovs)]
+
+
+def _encode_frame(frame):
+    """Encode a frame as a base64 PNG string."""
+    from PIL import Image
+    import io
+    import base64
+    
+    img = Image.fromarray(frame.astype('uint8'))
+    buffer = io.BytesIO()
+    img.save(buffer, format='PNG')
+    return base64.b64encode(buffer.getvalue()).decode()
+
+
+def _encode_binary(frame, fmt):
+    """Encode a frame for a binary response, keeping its shape headers."""
+    return codec.encode_frame(frame, fmt), codec.frame_headers(frame)
+
+
+def _file_to_numpy(file, shape=None, dtype='uint8'):
+    """Convert uploaded file to numpy array.
+    
+    Raw (``application/octet-stream``) and TIFF/QOI uploads are decoded
+    without going through PIL; raw uploads need ``shape``.
+    """
+    fmt = _upload_format(file.mimetype)
+    if fmt is not None:
+        return codec.decode_frame(file.read(), fmt, shape, dtype)
+    
     from PIL import Image
     import io
     
@@ -187,14 +1286,175 @@ def _rotation_angles_to_matrix(angles):
     return rotation_matrix
 
 
-def _matrix_to_rotation_angles(matrix):
-    """Convert rotation matrix to angles."""
-    import cv2
-    rotation_vector, _ = cv2.Rodrigues(matrix)
-    angles = [np.degrees(a) for a in rotation_vector.flatten()]
-    return angles
+def serve(mode=None, host=None, port=None):
+    """Run the backend in the configured serving mode.
+    
+    ``development`` runs Flask's built-in server. ``threaded`` serves
+    requests from a pool of threads (waitress, or werkzeug's threaded server
+    without it) sharing one model and one set of caches. ``processes``
+    forks gunicorn workers after the app is loaded, so read-only state built
+    beforehand (CPU model weights, transform pixel grids) is shared
+    copy-on-write; it falls back to ``threaded`` where gunicorn is not
+    available (Windows). SIGINT/SIGTERM stop accepting requests and drain
+    the ones in flight for up to ``server.graceful_timeout`` seconds.
+    
+    Args:
+        mode: ``development``, ``threaded`` or ``processes``
+        host: Interface to bind
+        port: Port to bind
+    """
+    server_config = config.get('server', {})
+    mode = mode or server_config.get('mode', 'threaded')
+    host = host or server_config.get('host', '0.0.0.0')
+    port = int(port or server_config.get('port', 8080))
+    threads = server_config.get('threads', cpu_threads)
+    timeout = server_config.get('graceful_timeout', 30)
+    
+    # Build the transforms of the usual resolutions before serving
+    for resolution in server_config.get('preload_resolutions', []):
+        width, height = (int(d) for d in resolution.lower().split('x'))
+        transform_pool.get(width, height)
+    
+    if mode == 'processes':
+        try:
+            from gunicorn.app.base import BaseApplication
+        except ImportError:
+            logger.warning("gunicorn is not available, serving with threads instead")
+            mode = 'threaded'
+    
+    logger.info(f"Serving on {host}:{port} in {mode} mode")
+    startup_timings['serving_seconds'] = time.perf_counter() - _started
+    
+    if mode == 'development':
+        start_warm_up()
+        app.run(host=host, port=port, debug=False, threaded=True)
+    elif mode == 'threaded':
+        start_warm_up()
+        _serve_threaded(host, port, threads, timeout)
+    elif mode == 'processes':
+        _serve_processes(BaseApplication, host, port, threads, timeout, server_config)
+    else:
+        raise ValueError(f"Unknown serving mode '{mode}', "
+                         f"expected 'development', 'threaded' or 'processes'")
+
+
+def _serve_threaded(host, port, threads, timeout):
+    """Serve from a thread pool until SIGINT/SIGTERM, then drain."""
+    try:
+        from waitress import create_server
+    except ImportError:
+        create_server = None
+    
+    if create_server is not None:
+        import _thread
+        server = create_server(app, host=host, port=port, threads=threads)
+        run = server.run
+        
+        def stop():
+            # Let waitress send the finished responses, then interrupt its
+            # loop in the main thread
+            deadline = time.monotonic() + timeout
+            while time.monotonic() < deadline and any(
+                    channel.requests or channel.total_outbufs_len
+                    for channel in list(server.active_channels.values())):
+                time.sleep(0.05)
+            _thread.interrupt_main()
+    else:
+        from werkzeug.serving import make_server
+        logger.warning("waitress is not installed, using werkzeug's threaded server")
+        server = make_server(host, port, app, threaded=True)
+        run = server.serve_forever
+        stop = server.shutdown
+    
+    def request_shutdown(signum, frame):
+        if shutting_down.is_set():
+            # Drained (see _drain_and_stop), or a second Ctrl+C: stop now
+            raise KeyboardInterrupt
+        shutting_down.set()
+        logger.info(f"Shutting down, draining {in_flight} in-flight requests")
+        threading.Thread(target=_drain_and_stop, args=(stop, timeout), daemon=True).start()
+    
+    signal.signal(signal.SIGINT, request_shutdown)
+    signal.signal(signal.SIGTERM, request_shutdown)
+    try:
+        run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if create_server is not None:
+            server.close()
+        else:
+            server.server_close()
+        logger.info("Server stopped")
+
+
+def _drain_and_stop(stop, timeout):
+    """Wait until no request is in flight (or ``timeout`` passes), then stop."""
+    deadline = time.monotonic() + timeout
+    with in_flight_changed:
+        while in_flight > 0 and time.monotonic() < deadline:
+            in_flight_changed.wait(deadline - time.monotonic())
+    if in_flight > 0:
+        logger.warning(f"Stopping with {in_flight} requests still in flight")
+    stop()
+
+
+def _cuda_available():
+    """Whether the model will run on CUDA.
+    
+    ``torch.cuda.is_available()`` initializes the CUDA driver, which forked
+    workers cannot use afterwards, so the probe runs in a child process.
+    """
+    probe = 'import sys, torch; sys.exit(0 if torch.cuda.is_available() else 1)'
+    try:
+        return subprocess.run([sys.executable, '-c', probe], stdout=subprocess.DEVNULL,
+                              stderr=subprocess.DEVNULL, timeout=120).returncode == 0
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+
+
+def _serve_processes(base_application, host, port, threads, timeout, server_config):
+    """Serve with preforked gunicorn workers sharing the preloaded app."""
+    workers = server_config.get('workers', 2)
+    use_cuda = config['device'].get('use_cuda', False) and _cuda_available()
+    
+    if not use_cuda:
+        # Load the CPU model before forking so the workers share its weights
+        start_warm_up().join()
+    
+    def post_fork(arbiter, worker):
+        # CUDA contexts do not survive fork, so each worker loads its own model
+        if use_cuda:
+            start_warm_up()
+    
+    if workers > 1:
+        logger.warning("Render jobs live in the worker that created them; "
+                       "use sticky routing or a single worker for /api/jobs")
+    
+    class Application(base_application):
+        def load_config(self):
+            self.cfg.set('bind', f'{host}:{port}')
+            self.cfg.set('workers', workers)
+            self.cfg.set('threads', threads)
+            self.cfg.set('worker_class', server_config.get('worker_class', 'gthread'))
+            self.cfg.set('graceful_timeout', timeout)
+            self.cfg.set('timeout', server_config.get('worker_timeout', 120))
+            self.cfg.set('post_fork', post_fork)
+        
+        def load(self):
+            return app
+    
+    Application().run()
 
 
 if __name__ == '__main__':
-    # Use lower port for development
-    app.run(host='0.0.0.0', port=8080, debug=False)
\ No newline at end of file
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='FPV Transition backend server')
+    parser.add_argument('--mode', choices=['development', 'threaded', 'processes'],
+                        help='Serving mode, defaults to server.mode in the config')
+    parser.add_argument('--host', help='Interface to bind')
+    parser.add_argument('--port', type=int, help='Port to bind')
+    args = parser.parse_args()
+    
+    serve(args.mode, args.host, args.port)
\ No newline at end of file
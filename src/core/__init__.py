@@ -2,5 +2,6 @@
 
 from .transform import FPVTransform
 from .interpolation import trajectory_interpolate
+from .pool import TransformPool
 
-__all__ = ['FPVTransform', 'trajectory_interpolate']
\ No newline at end of file
+__all__ = ['FPVTransform', 'TransformPool', 'trajectory_interpolate']
\ No newline at end of file
@@ -0,0 +1,209 @@
+"""Content-addressed cache of rendered frames."""
+
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+from typing import Callable, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+class RenderCache:
+    """Two-tier cache of rendered frames keyed by source content and parameters.
+    
+    Keys combine a BLAKE2b digest of the source frames with the render
+    parameters (pose, FOV, model version), so an unchanged frame rendered
+    with unchanged settings is found again no matter where it came from.
+    The memory tier is an LRU bounded by ``memory_mb``; the optional disk
+    tier stores one ``.npy`` file per entry, reads it back memory-mapped and
+    survives restarts.
+    """
+    
+    def __init__(self, memory_mb: float = 1024, cache_dir: Optional[str] = None,
+                 disk_mb: Optional[float] = None):
+        """
+        Args:
+            memory_mb: Budget of the in-memory tier, 0 disables it
+            cache_dir: Directory of the on-disk tier, None disables it
+            disk_mb: Budget of the on-disk tier, unbounded if None
+        """
+        self.memory_bytes = int(memory_mb * 1024 ** 2)
+        self.disk_bytes = int(disk_mb * 1024 ** 2) if disk_mb is not None else None
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._memory_used = 0
+        self._disk = OrderedDict()
+        self._disk_used = 0
+        self._lock = threading.Lock()
+        
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._scan_disk()
+    
+    @staticmethod
+    def key(frames: Sequence[np.ndarray], *params) -> str:
+        """Build a cache key from source frames and render parameters.
+        
+        Args:
+            frames: Source frames the result is rendered from
+            *params: Render parameters; their ``repr`` is hashed, so pass
+                plain numbers, strings and tuples/lists of them
+        
+        Returns:
+            Hex digest
+        """
+        digest = hashlib.blake2b(digest_size=20)
+        for frame in frames:
+            frame = np.ascontiguousarray(frame)
+            digest.update(f'{frame.shape}{frame.dtype.str}'.encode())
+            digest.update(memoryview(frame).cast('B'))
+        digest.update(repr(params).encode())
+        return digest.hexdigest()
+    
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """Return a cached result (read-only), or None on a miss."""
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return value
+            on_disk = key in self._disk
+            if on_disk:
+                self._disk.move_to_end(key)
+        
+        if on_disk:
+            try:
+                value = np.load(self._path(key), mmap_mode='r')
+            except (OSError, ValueError) as e:
+                logger.warning(f"Dropping unreadable cache entry {key}: {e}")
+                self._drop_disk(key)
+            else:
+                with self._lock:
+                    self.disk_hits += 1
+                return value
+        
+        with self._lock:
+            self.misses += 1
+        return None
+    
+    def put(self, key: str, value: np.ndarray):
+        """Store a result in both tiers. The value is copied."""
+        value = np.array(value)
+        value.flags.writeable = False
+        
+        if 0 < value.nbytes <= self.memory_bytes:
+            with self._lock:
+                previous = self._memory.pop(key, None)
+                if previous is not None:
+                    self._memory_used -= previous.nbytes
+                self._memory[key] = value
+                self._memory_used += value.nbytes
+                while self._memory_used > self.memory_bytes:
+                    _, evicted = self._memory.popitem(last=False)
+                    self._memory_used -= evicted.nbytes
+        
+        if self.cache_dir is not None:
+            self._put_disk(key, value)
+    
+    def get_or_compute(self, key: str, compute: Callable[[], np.ndarray]) -> np.ndarray:
+        """Return the cached result for ``key``, computing and storing it on a miss."""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+    
+    def info(self) -> dict:
+        """Return hit/miss counters and tier sizes."""
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+                'memory_entries': len(self._memory),
+                'memory_mb': self._memory_used / 1024 ** 2,
+                'disk_entries': len(self._disk),
+                'disk_mb': self._disk_used / 1024 ** 2
+            }
+    
+    def clear(self):
+        """Drop every entry from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_used = 0
+            keys = list(self._disk)
+        for key in keys:
+            self._drop_disk(key)
+    
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f'{key}.npy'
+    
+    def _scan_disk(self):
+        """Index entries left by earlier runs, oldest first."""
+        entries = []
+        for path in self.cache_dir.glob('*/*.npy'):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, path.stem, stat.st_size))
+        for _, key, size in sorted(entries):
+            self._disk[key] = size
+            self._disk_used += size
+    
+    def _put_disk(self, key: str, value: np.ndarray):
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        # Write under a temporary name so readers never see a partial file;
+        # preforked workers share the directory and may reuse thread idents
+        temporary = path.with_name(f'{key}.{os.getpid()}.{threading.get_ident()}.tmp')
+        try:
+            with open(temporary, 'wb') as f:
+                np.save(f, value)
+            os.replace(temporary, path)
+        except OSError as e:
+            logger.warning(f"Could not write cache entry {key}: {e}")
+            temporary.unlink(missing_ok=True)
+            return
+        
+        size = path.stat().st_size
+        evict = []
+        with self._lock:
+            self._disk_used += size - self._disk.pop(key, 0)
+            self._disk[key] = size
+            if self.disk_bytes is not None:
+                used = self._disk_used
+                for old_key, old_size in self._disk.items():
+                    if used <= self.disk_bytes or old_key == key:
+                        break
+                    evict.append(old_key)
+                    used -= old_size
+        for old_key in evict:
+            self._drop_disk(old_key)
+    
+    def _drop_disk(self, key: str):
+        with self._lock:
+            size = self._disk.pop(key, None)
+            if size is None:
+                return
+            self._disk_used -= size
+        try:
+            self._path(key).unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            # Windows refuses to delete files another request has mapped;
+            # the entry is forgotten and the file left for a later scan
+            logger.warning(f"Could not remove cache entry {key}: {e}")
\ No newline at end of file
@@ -0,0 +1,144 @@
+"""Frame encoding for the backend transport."""
+
+import cv2
+import numpy as np
+from typing import Optional, Sequence, Tuple
+
+# Transport formats and their MIME types
+FORMATS = {
+    'raw': 'application/octet-stream',
+    'tiff': 'image/tiff',
+    'qoi': 'image/qoi',
+    'png': 'image/png'
+}
+
+_EXTENSIONS = {
+    'tiff': ('.tiff', [cv2.IMWRITE_TIFF_COMPRESSION, 1]),
+    'qoi': ('.qoi', []),
+    # Fastest zlib level, still lossless
+    'png': ('.png', [cv2.IMWRITE_PNG_COMPRESSION, 1])
+}
+
+
+def available_formats() -> Sequence[str]:
+    """Return the transport formats supported by this OpenCV build."""
+    return ['raw'] + [fmt for fmt, (ext, _) in _EXTENSIONS.items()
+                      if cv2.haveImageWriter('frame' + ext)]
+
+
+def negotiate(accept: Optional[str], requested: Optional[str] = None) -> str:
+    """Pick a response format from an explicit request or an Accept header.
+    
+    Args:
+        accept: Value of the HTTP ``Accept`` header
+        requested: Explicit ``format`` parameter, takes precedence
+    
+    Returns:
+        ``'json'`` for the legacy base64 PNG JSON response, otherwise one of
+        ``FORMATS``
+    """
+    if requested:
+        requested = requested.lower()
+        if requested != 'json' and requested not in available_formats():
+            raise ValueError(f"Unsupported frame format '{requested}'")
+        return requested
+    
+    if accept:
+        for mime in (part.split(';')[0].strip() for part in accept.split(',')):
+            for fmt, fmt_mime in FORMATS.items():
+                if mime == fmt_mime and fmt in available_formats():
+                    return fmt
+    return 'json'
+
+
+def encode_frame(frame: np.ndarray, fmt: str) -> bytes:
+    """Encode an RGB(A) frame in a transport format."""
+    if fmt == 'raw':
+        return np.ascontiguousarray(frame).tobytes()
+    
+    ext, params = _EXTENSIONS[fmt]
+    ok, buffer = cv2.imencode(ext, _swap_rb(frame), params)
+    if not ok:
+        raise ValueError(f"Could not encode frame as {fmt}")
+    return buffer.tobytes()
+
+
+def encode_frames(frames: Sequence[np.ndarray], fmt: str) -> Tuple[bytes, dict]:
+    """Encode several frames into one binary body, see ``pack_frames``."""
+    chunks = [encode_frame(frame, fmt) for frame in frames]
+    return pack_frames(chunks, fmt, frame_headers(frames[0]) if len(frames) else {})
+
+
+def pack_frames(chunks: Sequence[bytes], fmt: str, headers: dict) -> Tuple[bytes, dict]:
+    """Concatenate encoded frames into one binary body.
+    
+    Raw frames form a single contiguous (N, H, W, C) buffer; for encoded
+    formats the byte length of every frame is listed in ``X-Frame-Lengths``.
+    
+    Args:
+        chunks: Frames encoded with ``encode_frame``
+        fmt: Format of the chunks
+        headers: Shape/dtype headers of one frame (see ``frame_headers``)
+    
+    Returns:
+        (body, headers)
+    """
+    headers = dict(headers, **{'X-Frame-Count': str(len(chunks))})
+    if fmt != 'raw':
+        headers['X-Frame-Lengths'] = ','.join(str(len(chunk)) for chunk in chunks)
+    return b''.join(chunks), headers
+
+
+def frame_headers(frame: np.ndarray) -> dict:
+    """Headers describing the shape and dtype of a frame."""
+    return {
+        'X-Frame-Shape': ','.join(str(d) for d in frame.shape),
+        'X-Frame-Dtype': frame.dtype.name
+    }
+
+
+def decode_frame(data, fmt: str = 'raw', shape: Optional[Sequence[int]] = None,
+                 dtype: str = 'uint8') -> np.ndarray:
+    """Decode a frame from a transport buffer.
+    
+    Raw buffers are wrapped without copying (the result is read-only when
+    ``data`` is immutable).
+    
+    Args:
+        data: Bytes-like buffer
+        fmt: ``'raw'`` or an image format decodable by OpenCV
+        shape: Frame shape, required for raw buffers
+        dtype: Element type of raw buffers
+    
+    Returns:
+        RGB(A) frame
+    """
+    if fmt == 'raw':
+        if shape is None:
+            raise ValueError('Raw frames require a shape')
+        shape = tuple(int(d) for d in shape)
+        frame = np.frombuffer(data, dtype=np.dtype(dtype))
+        if frame.size != int(np.prod(shape)):
+            raise ValueError(f"Raw buffer of {frame.size} elements does not match shape {shape}")
+        return frame.reshape(shape)
+    
+    frame = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_UNCHANGED)
+    if frame is None:
+        raise ValueError(f"Could not decode {fmt} frame")
+    return _swap_rb(frame)
+
+
+def parse_shape(value: Optional[str]) -> Optional[Tuple[int, ...]]:
+    """Parse an ``X-Frame-Shape`` style ``"H,W,C"`` string."""
+    if not value:
+        return None
+    return tuple(int(d) for d in value.replace('x', ',').split(',') if d.strip())
+
+
+def _swap_rb(frame: np.ndarray) -> np.ndarray:
+    """Convert between RGB(A) and OpenCV's BGR(A) channel order."""
+    if frame.ndim == 3 and frame.shape[2] == 3:
+        return cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
+    if frame.ndim == 3 and frame.shape[2] == 4:
+        return cv2.cvtColor(frame, cv2.COLOR_RGBA2BGRA)
+    return frame
\ No newline at end of file
@@ -0,0 +1,424 @@
+"""Multi-process render farm sharding transitions across worker processes."""
+
+import math
+import multiprocessing
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+from typing import List, Optional, Sequence, Tuple
+
+from .pool import QUALITY_SCALES, TransformPool, proxy_size
+
+# Per-frame state flags stored in shared memory
+FRAME_PENDING = 0
+FRAME_DONE = 1
+
+# Worker-process state, set up by _init_worker
+_worker_pool = None
+
+
+def _init_worker(threads: int, transform_kwargs: dict):
+    """Initialize a render worker process."""
+    global _worker_pool
+    import cv2
+    cv2.setNumThreads(threads)
+    _worker_pool = TransformPool(
+        precompute_grids=transform_kwargs.get('warp_method') == 'remap',
+        **transform_kwargs
+    )
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attach to an existing shared memory block owned by the parent.
+    
+    Spawned workers share the parent's resource tracker, which already
+    tracks the block, so only the parent ever unlinks it.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    return shared_memory.SharedMemory(name=name)
+
+
+def _render_shard(spec: dict) -> int:
+    """Warp frames ``[start, stop)`` of a job, reading and writing shared memory.
+    
+    Returns:
+        Number of frames rendered
+    """
+    blocks = [_attach(spec['input']), _attach(spec['output']), _attach(spec['flags'])]
+    frames = output = flags = None
+    rendered = 0
+    try:
+        shape = tuple(spec['shape'])
+        frames = np.ndarray(shape, dtype=spec['dtype'], buffer=blocks[0].buf)
+        output = np.ndarray(tuple(spec['output_shape']), dtype=spec['dtype'], buffer=blocks[1].buf)
+        # One flag per frame plus a trailing cancellation flag
+        flags = np.ndarray((shape[0] + 1,), dtype=np.uint8, buffer=blocks[2].buf)
+        
+        height, width = shape[1:3]
+        transform = _worker_pool.get(width, height, spec['focal_length'])
+        blur_to = spec['blur_to']
+        in_place = spec['quality'] == 'final' and blur_to is None
+        
+        for offset, index in enumerate(range(spec['start'], spec['stop'])):
+            if flags[-1]:
+                break
+            if in_place:
+                transform.warp(frames[index], spec['rotations'][offset],
+                               spec['fov_factors'][offset], out=output[index])
+            else:
+                output[index] = _worker_pool.warp(
+                    frames[index], spec['rotations'][offset], spec['fov_factors'][offset],
+                    spec['quality'], spec['upscale'], spec['focal_length'],
+                    blur_to[offset] if blur_to is not None else None)
+            flags[index] = FRAME_DONE
+            rendered += 1
+        
+        return rendered
+    finally:
+        # Views must be released before the blocks can be closed
+        del frames, output, flags
+        for block in blocks:
+            block.close()
+
+
+class RenderJob:
+    """State of a render job submitted to a RenderFarm."""
+    
+    def __init__(self, job_id: str, shape: Tuple[int, ...], dtype: np.dtype,
+                 output_shape: Optional[Tuple[int, ...]] = None):
+        self.id = job_id
+        self.shape = shape
+        self.output_shape = output_shape or shape
+        self.dtype = np.dtype(dtype)
+        self.total = shape[0]
+        self.state = 'running'
+        self.error = None
+        self.created_at = time.time()
+        self.finished_at = None
+        self.futures = []
+        # Held while frames are read from shared memory, so release() cannot
+        # unmap the blocks under a reader
+        self.lock = threading.Lock()
+        
+        nbytes = max(1, int(np.prod(shape)) * self.dtype.itemsize)
+        output_nbytes = max(1, int(np.prod(self.output_shape)) * self.dtype.itemsize)
+        self.input_block = shared_memory.SharedMemory(create=True, size=nbytes)
+        self.output_block = shared_memory.SharedMemory(create=True, size=output_nbytes)
+        self.flags_block = shared_memory.SharedMemory(create=True, size=self.total + 1)
+        self.flags = np.ndarray((self.total + 1,), dtype=np.uint8, buffer=self.flags_block.buf)
+        self.flags[:] = FRAME_PENDING
+    
+    def input_view(self) -> np.ndarray:
+        return np.ndarray(self.shape, dtype=self.dtype, buffer=self.input_block.buf)
+    
+    def output_view(self) -> np.ndarray:
+        return np.ndarray(self.output_shape, dtype=self.dtype, buffer=self.output_block.buf)
+    
+    @property
+    def completed(self) -> int:
+        return int(np.count_nonzero(self.flags[:-1] == FRAME_DONE))
+    
+    def done_indices(self) -> np.ndarray:
+        """Indices of the frames rendered so far."""
+        return np.flatnonzero(self.flags[:-1] == FRAME_DONE)
+    
+    def to_dict(self) -> dict:
+        frame_states = self.flags[:-1].tolist()
+        completed = frame_states.count(FRAME_DONE)
+        end = self.finished_at or time.time()
+        elapsed = end - self.created_at
+        
+        eta = None
+        if self.state == 'running' and completed:
+            eta = elapsed / completed * (self.total - completed)
+        elif self.state == 'done':
+            eta = 0.0
+        
+        return {
+            'job_id': self.id,
+            'state': self.state,
+            'completed': completed,
+            'total': self.total,
+            'progress': completed / self.total if self.total else 1.0,
+            'frame_states': frame_states,
+            'elapsed_seconds': elapsed,
+            'eta_seconds': eta,
+            'error': self.error
+        }
+    
+    def release(self):
+        """Free the job's shared memory blocks."""
+        with self.lock:
+            self.flags = None
+            for block in (self.input_block, self.output_block, self.flags_block):
+                try:
+                    block.close()
+                    block.unlink()
+                except FileNotFoundError:
+                    pass
+
+
+class RenderFarm:
+    """Shards transition frame ranges across a pool of worker processes.
+    
+    Frames are exchanged through ``multiprocessing.shared_memory`` blocks:
+    the parent copies the input frames in once, workers warp straight into
+    the shared output block and mark per-frame completion flags, so no
+    frame data is pickled between processes.
+    
+    Finished jobs keep their blocks for polling until they are released,
+    outlive ``job_ttl`` seconds or are among the oldest past ``max_jobs``;
+    a background thread frees expired jobs.
+    """
+    
+    def __init__(self, max_workers: int = 2, threads_per_worker: int = 1,
+                 shard_size: Optional[int] = None, max_jobs: int = 16,
+                 job_ttl: Optional[float] = 600, transform_kwargs: Optional[dict] = None):
+        """
+        Args:
+            max_workers: Number of worker processes
+            threads_per_worker: OpenCV threads inside each worker
+            shard_size: Frames per shard, defaults to an even split over
+                four shards per worker
+            max_jobs: Finished jobs kept for polling before the oldest is freed
+            job_ttl: Seconds a finished job is kept for polling, None keeps
+                it until it is released or evicted past ``max_jobs``
+            transform_kwargs: FPVTransform options used by the workers
+                (warp method, interpolation, border mode)
+        """
+        self.max_workers = max_workers
+        self.threads_per_worker = threads_per_worker
+        self.shard_size = shard_size
+        self.max_jobs = max_jobs
+        self.job_ttl = job_ttl
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(threads_per_worker, dict(transform_kwargs or {}))
+        )
+        if job_ttl is not None:
+            threading.Thread(target=self._expire_jobs, name='fpv-farm-expiry', daemon=True).start()
+    
+    def submit(self, frames: Sequence[np.ndarray],
+               rotations: Sequence[Sequence[float]],
+               fov_factors: Sequence[float],
+               focal_length: Optional[float] = None, quality: str = 'final',
+               upscale: bool = False,
+               blur_to: Optional[Sequence[Tuple[Sequence[float], float]]] = None) -> str:
+        """Queue a render job.
+        
+        Args:
+            frames: Frames of identical shape and dtype
+            rotations: Per-frame (x, y, z) rotation angles in degrees
+            fov_factors: Per-frame FOV factors
+            focal_length: Focal length in pixels, defaults to the frame width
+            quality: One of ``QUALITY_SCALES``; proxy tiers render (and
+                return) frames at the reduced resolution
+            upscale: Resize proxy renders back to the frame size
+            blur_to: Per-frame ``(rotation, fov_factor)`` when the shutter
+                closes, rendering motion blur as ``TransformPool.warp`` does
+        
+        Returns:
+            Job ID
+        """
+        if not len(frames):
+            raise ValueError('No frames to render')
+        if not (len(frames) == len(rotations) == len(fov_factors)):
+            raise ValueError('Frames, rotations and FOV factors must have the same length')
+        first = frames[0]
+        if any(f.shape != first.shape or f.dtype != first.dtype for f in frames):
+            raise ValueError('All frames of a render job must share shape and dtype')
+        if quality not in QUALITY_SCALES:
+            raise ValueError(f"Unknown quality '{quality}', expected one of {tuple(QUALITY_SCALES)}")
+        if blur_to is not None and len(blur_to) != len(frames):
+            raise ValueError('Motion blur needs one shutter-close pose per frame')
+        
+        output_shape = first.shape
+        if not upscale:
+            width, height = proxy_size(first.shape[1], first.shape[0], quality)
+            output_shape = (height, width) + first.shape[2:]
+        job = RenderJob(uuid.uuid4().hex, (len(frames),) + first.shape, first.dtype,
+                        (len(frames),) + output_shape)
+        inputs = job.input_view()
+        for index, frame in enumerate(frames):
+            inputs[index] = frame
+        del inputs
+        
+        rotations = [[float(a) for a in rotation] for rotation in rotations]
+        fov_factors = [float(f) for f in fov_factors]
+        if blur_to is not None:
+            blur_to = [([float(a) for a in rotation], float(fov)) for rotation, fov in blur_to]
+        
+        for start, stop in self._shards(job.total):
+            spec = {
+                'input': job.input_block.name,
+                'output': job.output_block.name,
+                'flags': job.flags_block.name,
+                'shape': job.shape,
+                'output_shape': job.output_shape,
+                'dtype': job.dtype.str,
+                'start': start,
+                'stop': stop,
+                'rotations': rotations[start:stop],
+                'fov_factors': fov_factors[start:stop],
+                'focal_length': focal_length,
+                'quality': quality,
+                'upscale': bool(upscale),
+                'blur_to': blur_to[start:stop] if blur_to is not None else None
+            }
+            job.futures.append(self._executor.submit(_render_shard, spec))
+        
+        with self._lock:
+            self._jobs[job.id] = job
+            evicted = self._evict()
+        for old in evicted:
+            old.release()
+        
+        for future in job.futures:
+            future.add_done_callback(lambda f, job=job: self._on_shard_done(job, f))
+        
+        return job.id
+    
+    def status(self, job_id: str) -> Optional[dict]:
+        """Return progress information for a job, or None if unknown."""
+        job = self._get(job_id)
+        if job is None:
+            return None
+        with job.lock:
+            return job.to_dict() if job.flags is not None else None
+    
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a job; running shards stop after their current frame."""
+        job = self._get(job_id)
+        if job is None:
+            return False
+        
+        with self._lock:
+            if job.state == 'running':
+                job.flags[-1] = 1
+                job.state = 'cancelled'
+                job.finished_at = time.time()
+        for future in job.futures:
+            future.cancel()
+        return True
+    
+    def completed_frames(self, job_id: str) -> Optional[np.ndarray]:
+        """Return the indices of a job's frames that have been rendered."""
+        job = self._get(job_id)
+        if job is None:
+            return None
+        with job.lock:
+            return job.done_indices() if job.flags is not None else None
+    
+    def frame(self, job_id: str, index: int) -> Optional[np.ndarray]:
+        """Return a copy of one rendered frame, available while the job runs."""
+        job = self._get(job_id)
+        if job is None:
+            return None
+        with job.lock:
+            if job.flags is None or job.flags[index] != FRAME_DONE:
+                return None
+            return job.output_view()[index].copy()
+    
+    def result(self, job_id: str) -> Optional[np.ndarray]:
+        """Return a copy of a finished job's frames as an (N, H, W, C) array."""
+        job = self._get(job_id)
+        if job is None:
+            return None
+        with job.lock:
+            if job.flags is None or job.state != 'done':
+                return None
+            return job.output_view().copy()
+    
+    def release(self, job_id: str) -> bool:
+        """Forget a job and free its shared memory once it is no longer running."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or not all(f.done() for f in job.futures):
+                return False
+            del self._jobs[job_id]
+        job.release()
+        return True
+    
+    def shutdown(self):
+        """Cancel outstanding work, stop the workers and free all jobs."""
+        self._stopped.set()
+        with self._lock:
+            jobs = list(self._jobs.values())
+            self._jobs.clear()
+        for job in jobs:
+            if job.state == 'running':
+                job.flags[-1] = 1
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        for job in jobs:
+            job.release()
+    
+    def stats(self) -> dict:
+        """Return job counts per state and the number of shards not yet finished."""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        counts = {}
+        for job in jobs:
+            counts[job.state] = counts.get(job.state, 0) + 1
+        return {
+            'jobs': counts,
+            'pending_shards': sum(not f.done() for job in jobs for f in job.futures)
+        }
+    
+    def _get(self, job_id: str) -> Optional[RenderJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+    
+    def _shards(self, total: int) -> List[Tuple[int, int]]:
+        size = self.shard_size or max(1, math.ceil(total / (self.max_workers * 4)))
+        return [(start, min(start + size, total)) for start in range(0, total, size)]
+    
+    def _on_shard_done(self, job: RenderJob, future):
+        with self._lock:
+            if job.state != 'running' or job.flags is None:
+                return
+            if not future.cancelled() and future.exception() is not None:
+                job.state = 'failed'
+                job.error = str(future.exception())
+                job.flags[-1] = 1
+                job.finished_at = time.time()
+            elif all(f.done() for f in job.futures):
+                job.state = 'done'
+                job.finished_at = time.time()
+    
+    def _evict(self) -> List[RenderJob]:
+        """Forget expired finished jobs and the oldest ones beyond ``max_jobs``.
+        
+        Caller holds the lock and releases the returned jobs after dropping it.
+        """
+        finished = [job_id for job_id, job in self._jobs.items()
+                    if job.state != 'running' and all(f.done() for f in job.futures)]
+        evicted = []
+        if self.job_ttl is not None:
+            deadline = time.time() - self.job_ttl
+            for job_id in [j for j in finished if self._jobs[j].finished_at <= deadline]:
+                finished.remove(job_id)
+                evicted.append(self._jobs.pop(job_id))
+        while len(self._jobs) > self.max_jobs and finished:
+            evicted.append(self._jobs.pop(finished.pop(0)))
+        return evicted
+    
+    def _expire_jobs(self):
+        """Free finished jobs past ``job_ttl`` until the farm shuts down."""
+        interval = min(max(self.job_ttl / 4, 0.1), 60)
+        while not self._stopped.wait(interval):
+            with self._lock:
+                evicted = self._evict()
+            for job in evicted:
+                job.release()
\ No newline at end of file
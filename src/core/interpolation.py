@@ -1,65 +1,192 @@
 """3D trajectory interpolation for smooth transitions."""
 
+from functools import lru_cache
+from math import comb
+
 import numpy as np
-import cv2
-from typing import List, Tuple
+
+# Above this degree the Bernstein coefficients lose precision, use De Casteljau
+MAX_BASIS_DEGREE = 24
 
 
-def trajectory_interpolate(pose_a: np.ndarray, pose_b: np.ndarray, 
-                         steps: int) -> List[np.ndarray]:
+def trajectory_interpolate(pose_a: np.ndarray, pose_b: np.ndarray,
+                         steps: int, output: str = 'matrices',
+                         dtype=np.float64, timesteps=None) -> np.ndarray:
     """Interpolate between two 3D poses using SLERP.
     
+    All steps are computed at once with vectorized quaternion SLERP.
+    
     Args:
         pose_a: Starting pose (3x3 rotation matrix)
         pose_b: Ending pose (3x3 rotation matrix)
         steps: Number of interpolation steps
+        output: ``'matrices'`` for rotation matrices or ``'angles'`` for
+            rotation vectors in degrees (the format used for keyframes)
+        dtype: Output dtype, e.g. ``np.float32``
+        timesteps: Optional (steps,) progress values replacing the even
+            ``np.linspace(0, 1, steps)`` spacing, e.g. a ``core.timing``
+            LUT; values past 1 overshoot along the same arc
     
     Returns:
-        List of interpolated rotation matrices
+        Contiguous (steps, 3, 3) array of rotation matrices, or a
+        (steps, 3) array of rotation angles
     """
-    # Convert to rotation vectors
-    rvec_a, _ = cv2.Rodrigues(pose_a)
-    rvec_b, _ = cv2.Rodrigues(pose_b)
+    if output not in ('matrices', 'angles'):
+        raise ValueError(f"Unknown output '{output}', expected 'matrices' or 'angles'")
+    
+    if timesteps is None:
+        t = np.linspace(0, 1, steps)
+    else:
+        t = np.asarray(timesteps, dtype=float)
+        if t.shape != (steps,):
+            raise ValueError(f"Expected {steps} timesteps, got shape {t.shape}")
+    quats = _slerp(_matrix_to_quaternion(pose_a), _matrix_to_quaternion(pose_b), t)
+    
+    if output == 'angles':
+        return np.degrees(_quaternion_to_rotation_vector(quats)).astype(dtype)
+    return _quaternion_to_matrix(quats).astype(dtype, copy=False)
+
+
+def _slerp(qa: np.ndarray, qb: np.ndarray, t: np.ndarray) -> np.ndarray:
+    """Spherical linear interpolation of unit quaternions for every t."""
+    dot = float(np.dot(qa, qb))
+    if dot < 0:
+        # Take the shorter arc
+        qb = -qb
+        dot = -dot
+    
+    t = t[:, None]
+    if dot > 0.9995:
+        # Nearly identical rotations, fall back to normalized lerp
+        quats = (1 - t) * qa + t * qb
+        return quats / np.linalg.norm(quats, axis=1, keepdims=True)
+    
+    theta = np.arccos(dot)
+    return (np.sin((1 - t) * theta) * qa + np.sin(t * theta) * qb) / np.sin(theta)
+
+
+def _matrix_to_quaternion(matrix: np.ndarray) -> np.ndarray:
+    """Convert a 3x3 rotation matrix to a unit quaternion (w, x, y, z)."""
+    m = np.asarray(matrix, dtype=float)
+    trace = m[0, 0] + m[1, 1] + m[2, 2]
+    
+    if trace > 0:
+        s = 2.0 * np.sqrt(trace + 1.0)
+        q = [0.25 * s,
+             (m[2, 1] - m[1, 2]) / s,
+             (m[0, 2] - m[2, 0]) / s,
+             (m[1, 0] - m[0, 1]) / s]
+    elif m[0, 0] > m[1, 1] and m[0, 0] > m[2, 2]:
+        s = 2.0 * np.sqrt(1.0 + m[0, 0] - m[1, 1] - m[2, 2])
+        q = [(m[2, 1] - m[1, 2]) / s,
+             0.25 * s,
+             (m[0, 1] + m[1, 0]) / s,
+             (m[0, 2] + m[2, 0]) / s]
+    elif m[1, 1] > m[2, 2]:
+        s = 2.0 * np.sqrt(1.0 + m[1, 1] - m[0, 0] - m[2, 2])
+        q = [(m[0, 2] - m[2, 0]) / s,
+             (m[0, 1] + m[1, 0]) / s,
+             0.25 * s,
+             (m[1, 2] + m[2, 1]) / s]
+    else:
+        s = 2.0 * np.sqrt(1.0 + m[2, 2] - m[0, 0] - m[1, 1])
+        q = [(m[1, 0] - m[0, 1]) / s,
+             (m[0, 2] + m[2, 0]) / s,
+             (m[1, 2] + m[2, 1]) / s,
+             0.25 * s]
+    
+    q = np.array(q)
+    return q / np.linalg.norm(q)
+
+
+def _quaternion_to_matrix(quats: np.ndarray) -> np.ndarray:
+    """Convert (N, 4) unit quaternions to a (N, 3, 3) rotation matrix array."""
+    w, x, y, z = quats.T
+    matrices = np.empty((len(quats), 3, 3))
+    
+    matrices[:, 0, 0] = 1 - 2 * (y * y + z * z)
+    matrices[:, 0, 1] = 2 * (x * y - z * w)
+    matrices[:, 0, 2] = 2 * (x * z + y * w)
+    matrices[:, 1, 0] = 2 * (x * y + z * w)
+    matrices[:, 1, 1] = 1 - 2 * (x * x + z * z)
+    matrices[:, 1, 2] = 2 * (y * z - x * w)
+    matrices[:, 2, 0] = 2 * (x * z - y * w)
+    matrices[:, 2, 1] = 2 * (y * z + x * w)
+    matrices[:, 2, 2] = 1 - 2 * (x * x + y * y)
+    
+    return matrices
+
+
+def _quaternion_to_rotation_vector(quats: np.ndarray) -> np.ndarray:
+    """Convert (N, 4) unit quaternions to (N, 3) rotation vectors in radians."""
+    # Use the w >= 0 hemisphere so angles stay within [0, pi] like cv2.Rodrigues
+    quats = np.where(quats[:, :1] < 0, -quats, quats)
+    w = quats[:, 0]
+    v = quats[:, 1:]
+    
+    sin_half = np.linalg.norm(v, axis=1)
+    angle = 2 * np.arctan2(sin_half, w)
     
-    # Interpolate rotation vectors
-    interpolated_poses = []
-    for t in np.linspace(0, 1, steps):
-        # Linear interpolation of rotation vectors
-        rvec_interp = (1 - t) * rvec_a + t * rvec_b
-        
-        # Convert back to rotation matrix
-        rmat_interp, _ = cv2.Rodrigues(rvec_interp)
-        interpolated_poses.append(rmat_interp)
+    # angle / sin(angle / 2), with the small-angle limit of 2 / w
+    scale = np.full_like(angle, 2.0)
+    nonzero = sin_half > 1e-12
+    scale[nonzero] = angle[nonzero] / sin_half[nonzero]
+    scale[~nonzero] = 2.0 / w[~nonzero]
     
-    return interpolated_poses
+    return v * scale[:, None]
 
 
-def bezier_trajectory(control_points: List[Tuple[float, float, float]], 
-                     steps: int) -> List[Tuple[float, float, float]]:
+def bezier_trajectory(control_points, steps: int,
+                     method: str = 'auto') -> np.ndarray:
     """Generate smooth trajectory using Bezier curves.
     
+    Curves are evaluated against a cached Bernstein basis matrix, so a whole
+    trajectory (or a batch of trajectories) is a single matrix product.
+    
     Args:
-        control_points: List of (x, y, z) control points
+        control_points: (n+1, 3) control points, or a (B, n+1, 3) batch of
+            curves sharing the same degree
         steps: Number of points to generate
+        method: ``'basis'``, ``'de_casteljau'`` (numerically stable for high
+            degrees) or ``'auto'`` to pick by degree
     
     Returns:
-        List of interpolated positions
+        (steps, 3) array of positions, or (B, steps, 3) for a batch
     """
-    n = len(control_points) - 1
-    trajectory = []
+    points = np.asarray(control_points, dtype=float)
+    if points.ndim not in (2, 3) or points.shape[-2] < 1:
+        raise ValueError(f"Expected (n+1, D) or (B, n+1, D) control points, got shape {points.shape}")
+    
+    degree = points.shape[-2] - 1
+    if method == 'auto':
+        method = 'basis' if degree <= MAX_BASIS_DEGREE else 'de_casteljau'
     
-    for t in np.linspace(0, 1, steps):
-        point = np.zeros(3)
-        for i, cp in enumerate(control_points):
-            # Bernstein polynomial
-            coeff = _bernstein_poly(i, n, t)
-            point += coeff * np.array(cp)
-        trajectory.append(tuple(point))
+    if method == 'basis':
+        return _bernstein_basis(degree, steps) @ points
+    if method == 'de_casteljau':
+        return _de_casteljau(points, np.linspace(0, 1, steps))
+    raise ValueError(f"Unknown method '{method}', expected 'basis', 'de_casteljau' or 'auto'")
+
+
+@lru_cache(maxsize=64)
+def _bernstein_basis(degree: int, steps: int) -> np.ndarray:
+    """Return the read-only (steps, degree+1) Bernstein basis matrix."""
+    t = np.linspace(0, 1, steps)[:, None]
+    i = np.arange(degree + 1)
+    coeffs = np.array([comb(degree, k) for k in i], dtype=float)
     
-    return trajectory
+    basis = coeffs * t ** i * (1 - t) ** (degree - i)
+    basis.setflags(write=False)
+    return basis
 
 
-def _bernstein_poly(i: int, n: int, t: float) -> float:
-    """Calculate Bernstein polynomial coefficient."""
-    from math import comb
-    return comb(n, i) * (t ** i) * ((1 - t) ** (n - i))
\ No newline at end of file
+def _de_casteljau(points: np.ndarray, t: np.ndarray) -> np.ndarray:
+    """Evaluate Bezier curves at every t with De Casteljau's algorithm."""
+    t = t[:, None, None]
+    # (..., steps, n+1, D) working set, reduced by one point per pass
+    work = np.repeat(points[..., None, :, :], len(t), axis=-3)
+    
+    for _ in range(points.shape[-2] - 1):
+        work = (1 - t) * work[..., :-1, :] + t * work[..., 1:, :]
+    
+    return work[..., 0, :]
\ No newline at end of file
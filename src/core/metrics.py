@@ -0,0 +1,152 @@
+"""Latency histograms and Prometheus text exposition."""
+
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple
+
+# Upper bounds in seconds, from sub-millisecond math to multi-second renders
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Cumulative latency histogram with one series per label set."""
+    
+    def __init__(self, name: str, help_text: str, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+        self._lock = threading.Lock()
+    
+    def observe(self, value: float, **labels):
+        """Record one observation."""
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # Per-bucket counts (last one is +Inf), sum, count
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            index = next((i for i, bound in enumerate(self.buckets) if value <= bound),
+                         len(self.buckets))
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+    
+    def snapshot(self) -> dict:
+        """Return ``{labels: (cumulative bucket counts, sum, count)}``."""
+        with self._lock:
+            return {
+                key: (_cumulative(counts), total, count)
+                for key, (counts, total, count) in self._series.items()
+            }
+    
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} histogram']
+        bounds = [_format_value(b) for b in self.buckets] + ['+Inf']
+        for key, (cumulative, total, count) in sorted(self.snapshot().items()):
+            for bound, value in zip(bounds, cumulative):
+                lines.append(f'{self.name}_bucket{_labels(key + (("le", bound),))} {value}')
+            lines.append(f'{self.name}_sum{_labels(key)} {_format_value(total)}')
+            lines.append(f'{self.name}_count{_labels(key)} {count}')
+        return lines
+
+
+class Metrics:
+    """Registry of histograms and collected gauges.
+    
+    Stage spans go to the ``<namespace>_stage_duration_seconds`` histogram
+    labelled by stage. Collectors are callables returning
+    ``(name, type, help, samples)`` tuples, with ``samples`` a list of
+    ``(labels dict, value)``; they are evaluated on every ``render``, so
+    cache hit rates and queue depths are always current.
+    """
+    
+    def __init__(self, namespace: str = 'fpv', buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """
+        Args:
+            namespace: Prefix of every metric name
+            buckets: Default histogram bucket upper bounds in seconds
+        """
+        self.namespace = namespace
+        self.buckets = buckets
+        self._histograms = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+    
+    def histogram(self, name: str, help_text: str = '',
+                  buckets: Optional[Sequence[float]] = None) -> Histogram:
+        """Return the histogram ``<namespace>_<name>``, creating it if needed."""
+        full_name = f'{self.namespace}_{name}'
+        with self._lock:
+            histogram = self._histograms.get(full_name)
+            if histogram is None:
+                histogram = Histogram(full_name, help_text, buckets or self.buckets)
+                self._histograms[full_name] = histogram
+            return histogram
+    
+    def observe(self, stage: str, seconds: float, **labels):
+        """Record the duration of one processing stage."""
+        self.histogram('stage_duration_seconds', 'Duration of processing stages').observe(
+            seconds, stage=stage, **labels)
+    
+    @contextmanager
+    def span(self, stage: str, **labels):
+        """Time the enclosed block as ``stage``."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start, **labels)
+    
+    def add_collector(self, collector: Callable[[], Iterable[Tuple[str, str, str, list]]]):
+        """Register a callable producing gauge or counter samples."""
+        with self._lock:
+            self._collectors.append(collector)
+    
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        with self._lock:
+            histograms = list(self._histograms.values())
+            collectors = list(self._collectors)
+        
+        lines = []
+        for histogram in histograms:
+            lines.extend(histogram.render())
+        for collector in collectors:
+            for name, kind, help_text, samples in collector():
+                name = f'{self.namespace}_{name}'
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} {kind}')
+                for labels, value in samples:
+                    lines.append(f'{name}{_labels(tuple(sorted(labels.items())))} '
+                                 f'{_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+
+def _cumulative(counts: Sequence[int]) -> List[int]:
+    total = 0
+    result = []
+    for count in counts:
+        total += count
+        result.append(total)
+    return result
+
+
+def _labels(pairs: Tuple[Tuple[str, object], ...]) -> str:
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+               for _, value in pairs)
+    return '{' + ','.join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)) + '}'
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    if isinstance(value, float) and math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(value) if isinstance(value, float) else str(value)
\ No newline at end of file
@@ -0,0 +1,225 @@
+"""Streaming decode -> warp -> encode frame pipeline."""
+
+import queue
+import threading
+from contextlib import nullcontext
+
+import numpy as np
+from typing import Callable, Iterable, Iterator, Optional, Tuple
+
+from .pool import TransformPool
+
+# Marks the end of the input stream between stages
+_DONE = object()
+
+
+class _Failure:
+    """Exception raised by a stage, carried downstream to the consumer."""
+    
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+class _Stage:
+    """A pool of worker threads applying ``fn`` between two bounded queues."""
+    
+    def __init__(self, name: str, fn: Callable, workers: int,
+                 inbox: queue.Queue, outbox: queue.Queue, stop: threading.Event):
+        self.name = name
+        self.fn = fn
+        self.inbox = inbox
+        self.outbox = outbox
+        self.stop = stop
+        self._remaining = workers
+        self._lock = threading.Lock()
+        self.threads = [
+            threading.Thread(target=self._work, name=f'fpv-{name}-{i}', daemon=True)
+            for i in range(workers)
+        ]
+    
+    def start(self):
+        for thread in self.threads:
+            thread.start()
+    
+    def _work(self):
+        while True:
+            item = _get(self.inbox, self.stop)
+            if item is None:
+                return
+            
+            if item is _DONE:
+                with self._lock:
+                    self._remaining -= 1
+                    last = self._remaining == 0
+                # Hand the marker to the next sibling, or downstream once all are done
+                _put(self.outbox if last else self.inbox, _DONE, self.stop)
+                return
+            
+            index, value = item
+            if not isinstance(value, _Failure):
+                try:
+                    value = self.fn(value)
+                except Exception as e:
+                    value = _Failure(e)
+            
+            if not _put(self.outbox, (index, value), self.stop):
+                return
+
+
+def _get(q: queue.Queue, stop: threading.Event):
+    """Blocking get that gives up (returning None) once ``stop`` is set."""
+    while not stop.is_set():
+        try:
+            return q.get(timeout=0.1)
+        except queue.Empty:
+            continue
+    return None
+
+
+def _put(q: queue.Queue, item, stop: threading.Event) -> bool:
+    """Blocking put that gives up (returning False) once ``stop`` is set."""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+class FramePipeline:
+    """Overlaps frame decoding, warping and encoding across thread pools.
+    
+    Each stage runs on its own workers and the stages are connected by
+    bounded queues, so a slow consumer applies backpressure all the way up
+    to the input iterator. OpenCV and PIL release the GIL while working, so
+    the stages run concurrently. Results are yielded in input order.
+    """
+    
+    def __init__(self, pool: TransformPool,
+                 decode: Optional[Callable] = None,
+                 encode: Optional[Callable] = None,
+                 decode_workers: int = 2, warp_workers: int = 2,
+                 encode_workers: int = 4, queue_size: int = 8,
+                 quality: str = 'final', upscale: bool = False, metrics=None):
+        """
+        Args:
+            pool: Transform pool used to look up the transform per frame
+            decode: Converts an input item to a frame, identity by default
+            encode: Converts a warped frame to an output item, identity by default
+            decode_workers: Threads decoding input items
+            warp_workers: Threads warping frames
+            encode_workers: Threads encoding warped frames
+            queue_size: Capacity of each queue between stages
+            quality: Render quality tier, see ``TransformPool.warp``
+            upscale: Resize proxy renders back to the input resolution
+            metrics: Optional ``core.metrics.Metrics`` receiving per-stage
+                timings (``pipeline.decode``/``warp``/``encode``)
+        """
+        self.pool = pool
+        self.decode = decode
+        self.encode = encode
+        self.workers = {
+            'decode': max(1, decode_workers),
+            'warp': max(1, warp_workers),
+            'encode': max(1, encode_workers)
+        }
+        self.queue_size = queue_size
+        self.quality = quality
+        self.upscale = upscale
+        self.metrics = metrics
+        self._queues = None
+        # Bound on items between the input iterator and the consumer
+        self.max_in_flight = queue_size * 3 + sum(self.workers.values())
+    
+    def run(self, items: Iterable,
+            schedule: Iterable[Tuple[Tuple[float, float, float], float]]) -> Iterator:
+        """Process items through the pipeline.
+        
+        Args:
+            items: Iterable of input items (encoded frames or numpy arrays)
+            schedule: Iterable of ``(rotation, fov_factor)`` pairs, one per
+                item; ``(rotation, fov_factor, end_rotation, end_fov)``
+                entries render motion blur up to the end pose
+        
+        Yields:
+            Processed items in input order
+        """
+        stop = threading.Event()
+        in_flight = threading.Semaphore(self.max_in_flight)
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in range(4)]
+        self._queues = queues
+        stages = [
+            _Stage('decode', self._decode, self.workers['decode'], queues[0], queues[1], stop),
+            _Stage('warp', self._warp, self.workers['warp'], queues[1], queues[2], stop),
+            _Stage('encode', self._encode, self.workers['encode'], queues[2], queues[3], stop)
+        ]
+        
+        def feed():
+            try:
+                for index, (item, pose) in enumerate(zip(items, schedule)):
+                    while not in_flight.acquire(timeout=0.1):
+                        if stop.is_set():
+                            return
+                    if not _put(queues[0], (index, (item, tuple(pose))), stop):
+                        return
+            except Exception as e:
+                _put(queues[0], (-1, _Failure(e)), stop)
+            _put(queues[0], _DONE, stop)
+        
+        feeder = threading.Thread(target=feed, name='fpv-feed', daemon=True)
+        for stage in stages:
+            stage.start()
+        feeder.start()
+        
+        pending = {}
+        next_index = 0
+        try:
+            while True:
+                item = _get(queues[3], stop)
+                if item is None or item is _DONE:
+                    break
+                
+                index, value = item
+                if isinstance(value, _Failure):
+                    raise value.error
+                pending[index] = value
+                
+                while next_index in pending:
+                    value = pending.pop(next_index)
+                    next_index += 1
+                    in_flight.release()
+                    yield value
+        finally:
+            stop.set()
+            self._queues = None
+    
+    def queue_depths(self) -> dict:
+        """Items waiting in front of each stage (and the consumer) while running."""
+        queues = self._queues
+        if queues is None:
+            return {}
+        return {name: q.qsize() for name, q in zip(('decode', 'warp', 'encode', 'output'), queues)}
+    
+    def _span(self, stage: str):
+        if self.metrics is None:
+            return nullcontext()
+        return self.metrics.span(f'pipeline.{stage}')
+    
+    def _decode(self, item):
+        source, pose = item
+        with self._span('decode'):
+            frame = self.decode(source) if self.decode is not None else source
+        return frame, pose
+    
+    def _warp(self, item) -> np.ndarray:
+        frame, pose = item
+        rotation, fov_factor = pose[:2]
+        blur_to = pose[2:] or None
+        with self._span('warp'):
+            return self.pool.warp(frame, rotation, fov_factor, self.quality, self.upscale,
+                                  blur_to=blur_to)
+    
+    def _encode(self, frame: np.ndarray):
+        with self._span('encode'):
+            return self.encode(frame) if self.encode is not None else frame
\ No newline at end of file
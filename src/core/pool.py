@@ -0,0 +1,161 @@
+"""Thread-safe registry of FPVTransform instances keyed by resolution."""
+
+import threading
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+from typing import Optional, Tuple
+
+from .transform import FPVTransform
+
+# Render scale of each quality tier
+QUALITY_SCALES = {
+    'final': 1.0,
+    'half': 0.5,
+    'quarter': 0.25
+}
+
+
+class TransformPool:
+    """Bounded LRU pool of FPVTransform objects per (width, height, focal length).
+    
+    Each transform owns its camera matrix, homography cache and pixel grid,
+    so frames of different resolutions never share intrinsics and concurrent
+    requests for the same resolution reuse the same precomputed state.
+    """
+    
+    def __init__(self, max_entries: int = 4, precompute_grids: bool = True, **transform_kwargs):
+        """
+        Args:
+            max_entries: Maximum number of resolutions kept alive
+            precompute_grids: Build the remap pixel grid when a transform is
+                created; only useful with ``warp_method='remap'``
+            **transform_kwargs: Extra arguments forwarded to FPVTransform
+        """
+        self.max_entries = max_entries
+        self.precompute_grids = precompute_grids
+        self.transform_kwargs = transform_kwargs
+        self._transforms = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, width: int, height: int,
+            focal_length: Optional[float] = None) -> FPVTransform:
+        """Return the transform for a resolution, creating it if needed.
+        
+        New transforms are built outside the lock so a grid precomputation
+        does not stall lookups of other resolutions; when two threads race
+        on the same resolution the first one stored wins.
+        """
+        key = self._key(width, height, focal_length)
+        
+        with self._lock:
+            transform = self._transforms.get(key)
+            if transform is not None:
+                self._transforms.move_to_end(key)
+                return transform
+        
+        created = FPVTransform(width, height, focal_length, **self.transform_kwargs)
+        if self.precompute_grids:
+            created.pixel_grid()
+        
+        with self._lock:
+            transform = self._transforms.setdefault(key, created)
+            self._transforms.move_to_end(key)
+            while len(self._transforms) > self.max_entries:
+                self._transforms.popitem(last=False)
+        
+        return transform
+    
+    def for_frame(self, frame: np.ndarray,
+                  focal_length: Optional[float] = None) -> FPVTransform:
+        """Return the transform matching a frame's resolution."""
+        h, w = frame.shape[:2]
+        return self.get(w, h, focal_length)
+    
+    def warp(self, frame: np.ndarray, rotation: Tuple[float, float, float],
+             fov_factor: float = 1.0, quality: str = 'final', upscale: bool = False,
+             focal_length: Optional[float] = None,
+             blur_to: Optional[Tuple[Tuple[float, float, float], float]] = None) -> np.ndarray:
+        """Warp a frame at a quality tier.
+        
+        Proxy tiers downscale the frame with ``INTER_AREA`` and warp it with
+        the transform of the proxy resolution, whose focal length is scaled
+        by the same factor so the framing matches the full-resolution
+        render. ``'final'`` warps at the uploaded resolution.
+        
+        Args:
+            frame: Input frame
+            rotation: (x, y, z) rotation angles in degrees
+            fov_factor: FOV adjustment factor (0.5-2.0)
+            quality: One of ``QUALITY_SCALES``
+            upscale: Resize proxy renders back to the frame size for display
+            focal_length: Focal length in pixels at full resolution, defaults
+                to the frame width
+            blur_to: ``(rotation, fov_factor)`` when the shutter closes;
+                renders motion blur with ``FPVTransform.warp_motion_blur``
+        
+        Returns:
+            Transformed frame, at proxy resolution unless ``upscale`` is set
+        """
+        if quality not in QUALITY_SCALES:
+            raise ValueError(f"Unknown quality '{quality}', expected one of {tuple(QUALITY_SCALES)}")
+        
+        h, w = frame.shape[:2]
+        proxy_w, proxy_h = proxy_size(w, h, quality)
+        if (proxy_w, proxy_h) == (w, h):
+            return _warp(self.for_frame(frame, focal_length), frame, rotation, fov_factor, blur_to)
+        
+        proxy = _downscale(frame, proxy_w, proxy_h)
+        transform = self.get(proxy_w, proxy_h, (focal_length or w) * proxy_w / w)
+        result = _warp(transform, proxy, rotation, fov_factor, blur_to)
+        
+        if upscale:
+            result = cv2.resize(result, (w, h), interpolation=cv2.INTER_LINEAR)
+        return result
+    
+    def cache_info(self) -> dict:
+        """Return per-resolution homography cache statistics."""
+        with self._lock:
+            transforms = list(self._transforms.items())
+        return {
+            f'{w}x{h}@{focal:g}': transform.cache_info()
+            for (w, h, focal), transform in transforms
+        }
+    
+    def clear(self):
+        """Drop all pooled transforms."""
+        with self._lock:
+            self._transforms.clear()
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._transforms)
+    
+    @staticmethod
+    def _key(width: int, height: int, focal_length: Optional[float]) -> Tuple[int, int, float]:
+        return int(width), int(height), float(focal_length or width)
+
+
+def proxy_size(width: int, height: int, quality: str) -> Tuple[int, int]:
+    """Render resolution ``(width, height)`` of a quality tier."""
+    scale = QUALITY_SCALES[quality]
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def _warp(transform: FPVTransform, frame: np.ndarray, rotation, fov_factor: float,
+          blur_to=None) -> np.ndarray:
+    if blur_to is None:
+        return transform.warp(frame, rotation, fov_factor)
+    end_rotation, end_fov = blur_to
+    return transform.warp_motion_blur(frame, rotation, end_rotation, fov_factor, end_fov)
+
+
+def _downscale(frame: np.ndarray, width: int, height: int) -> np.ndarray:
+    """Area-downscale a frame, halving repeatedly (OpenCV's fast 2x path)."""
+    while frame.shape[1] >= 2 * width and frame.shape[0] >= 2 * height:
+        frame = cv2.resize(frame, (frame.shape[1] // 2, frame.shape[0] // 2),
+                           interpolation=cv2.INTER_AREA)
+    if frame.shape[:2] != (height, width):
+        frame = cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA)
+    return frame
\ No newline at end of file
@@ -0,0 +1,205 @@
+"""Shared-memory and memory-mapped frame rings for same-machine clients."""
+
+import mmap
+import os
+import struct
+import sys
+import threading
+import weakref
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+from typing import Optional, Sequence, Tuple
+
+# Header: magic, version, slot count, slot size in bytes
+_HEADER = struct.Struct('<4sIQQ')
+_MAGIC = b'FPVR'
+_VERSION = 1
+HEADER_BYTES = 64
+
+# Slots start on cache-line boundaries
+_ALIGNMENT = 64
+
+
+class FrameRing:
+    """Ring of fixed-size frame slots in shared memory or a memory-mapped file.
+    
+    The buffer starts with a small header (magic, version, slot count, slot
+    size) followed by the slots, so a client can attach to a ring knowing
+    only its name or path. Frames are exchanged as ``np.ndarray`` views
+    into the buffer: the client writes a frame into a slot, sends the slot
+    (or byte offset), shape and dtype, and the backend reads and writes the
+    frames in place without copying them.
+    """
+    
+    def __init__(self, buffer, slots: int, slot_bytes: int, kind: str, location: str,
+                 owner: bool, handle):
+        """Use ``create_shared``, ``create_file``, ``attach_shared`` or ``attach_file``.
+        
+        Args:
+            buffer: Writable buffer spanning the header and all slots
+            slots: Number of slots
+            slot_bytes: Size of each slot
+            kind: ``'shm'`` or ``'file'``
+            location: Shared memory name or file path
+            owner: Whether closing the ring also removes the memory/file
+            handle: ``SharedMemory`` or ``mmap`` object backing ``buffer``
+        """
+        self.buffer = buffer
+        self.slots = slots
+        self.slot_bytes = slot_bytes
+        self.kind = kind
+        self.location = location
+        self.owner = owner
+        self._handle = handle
+        self._views = []
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def create_shared(cls, slots: int, slot_bytes: int,
+                      name: Optional[str] = None) -> 'FrameRing':
+        """Create a ring in named shared memory owned by this process."""
+        slot_bytes = _aligned(slot_bytes)
+        block = shared_memory.SharedMemory(name=name, create=True,
+                                           size=HEADER_BYTES + slots * slot_bytes)
+        _write_header(block.buf, slots, slot_bytes)
+        return cls(block.buf, slots, slot_bytes, 'shm', block.name, True, block)
+    
+    @classmethod
+    def create_file(cls, path: str, slots: int, slot_bytes: int) -> 'FrameRing':
+        """Create a ring in a new memory-mapped file owned by this process."""
+        slot_bytes = _aligned(slot_bytes)
+        size = HEADER_BYTES + slots * slot_bytes
+        with open(path, 'xb') as f:
+            f.truncate(size)
+        with open(path, 'r+b') as f:
+            handle = mmap.mmap(f.fileno(), size)
+        _write_header(handle, slots, slot_bytes)
+        return cls(handle, slots, slot_bytes, 'file', str(path), True, handle)
+    
+    @classmethod
+    def attach_shared(cls, name: str) -> 'FrameRing':
+        """Attach to a ring in shared memory created by another process."""
+        if sys.version_info >= (3, 13):
+            block = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            block = shared_memory.SharedMemory(name=name)
+            # The creator owns the block; keep this process from unlinking it at exit
+            resource_tracker.unregister(block._name, 'shared_memory')
+        try:
+            slots, slot_bytes = _read_header(block.buf, block.size)
+        except ValueError:
+            block.close()
+            raise
+        return cls(block.buf, slots, slot_bytes, 'shm', name, False, block)
+    
+    @classmethod
+    def attach_file(cls, path: str) -> 'FrameRing':
+        """Attach to a ring in a memory-mapped file created by another process."""
+        with open(path, 'r+b') as f:
+            handle = mmap.mmap(f.fileno(), 0)
+        try:
+            slots, slot_bytes = _read_header(handle, len(handle))
+        except ValueError:
+            handle.close()
+            raise
+        return cls(handle, slots, slot_bytes, 'file', str(path), False, handle)
+    
+    def slot_offset(self, slot: int) -> int:
+        """Byte offset of a slot within the buffer."""
+        if not 0 <= slot < self.slots:
+            raise ValueError(f"Slot {slot} out of range for a ring of {self.slots} slots")
+        return HEADER_BYTES + slot * self.slot_bytes
+    
+    def view(self, shape: Sequence[int], dtype='uint8', slot: Optional[int] = None,
+             offset: Optional[int] = None) -> np.ndarray:
+        """Wrap a frame stored in the ring without copying it.
+        
+        Args:
+            shape: Frame shape
+            dtype: Element type
+            slot: Slot holding the frame
+            offset: Byte offset of the frame, instead of ``slot``
+        
+        Returns:
+            Writable array backed by the ring buffer
+        """
+        shape = tuple(int(d) for d in shape)
+        dtype = np.dtype(dtype)
+        nbytes = int(np.prod(shape)) * dtype.itemsize
+        if slot is not None:
+            offset = self.slot_offset(slot)
+            if nbytes > self.slot_bytes:
+                raise ValueError(f"Frame of {nbytes} bytes does not fit a {self.slot_bytes} byte slot")
+        elif offset is None:
+            raise ValueError('A slot or byte offset is required')
+        
+        offset = int(offset)
+        if offset < HEADER_BYTES or offset + nbytes > HEADER_BYTES + self.slots * self.slot_bytes:
+            raise ValueError(f"Frame at offset {offset} ({nbytes} bytes) lies outside the ring")
+        if offset % dtype.itemsize:
+            raise ValueError(f"Offset {offset} is not aligned to {dtype.name}")
+        with self._lock:
+            if self.buffer is None:
+                raise ValueError('Frame ring is closed')
+            frame = np.ndarray(shape, dtype=dtype, buffer=self.buffer, offset=offset)
+            self._views = [ref for ref in self._views if ref() is not None]
+            self._views.append(weakref.ref(frame))
+        return frame
+    
+    def describe(self) -> dict:
+        """Ring parameters for clients."""
+        return {
+            'kind': self.kind,
+            'location': self.location,
+            'slots': self.slots,
+            'slot_bytes': self.slot_bytes,
+            'header_bytes': HEADER_BYTES,
+            'offsets': [self.slot_offset(i) for i in range(self.slots)]
+        }
+    
+    @property
+    def nbytes(self) -> int:
+        """Size of the ring, header included."""
+        return HEADER_BYTES + self.slots * self.slot_bytes
+    
+    def close(self):
+        """Release the mapping, removing the memory/file if this process owns it.
+        
+        Views returned by ``view`` must be dropped first; while any are
+        alive this raises ``BufferError`` and leaves the ring usable.
+        """
+        with self._lock:
+            # NumPy does not pin the buffers arrays are built on, so the
+            # mapping itself would close under live views
+            if any(ref() is not None for ref in self._views):
+                raise BufferError('Frames viewed in the ring are still in use')
+            self._handle.close()
+            self.buffer = None
+        if self.kind == 'shm':
+            if self.owner:
+                self._handle.unlink()
+        elif self.owner:
+            try:
+                os.remove(self.location)
+            except FileNotFoundError:
+                pass
+
+
+def _aligned(nbytes: int) -> int:
+    return -(-int(nbytes) // _ALIGNMENT) * _ALIGNMENT
+
+
+def _write_header(buffer, slots: int, slot_bytes: int):
+    buffer[:_HEADER.size] = _HEADER.pack(_MAGIC, _VERSION, slots, slot_bytes)
+
+
+def _read_header(buffer, size: int) -> Tuple[int, int]:
+    if size < HEADER_BYTES:
+        raise ValueError('Buffer too small for a frame ring')
+    magic, version, slots, slot_bytes = _HEADER.unpack(bytes(buffer[:_HEADER.size]))
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError('Not a frame ring (bad header)')
+    if HEADER_BYTES + slots * slot_bytes > size:
+        raise ValueError('Frame ring header does not match the buffer size')
+    return slots, slot_bytes
\ No newline at end of file
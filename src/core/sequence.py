@@ -0,0 +1,200 @@
+"""Memory-mapped access to frame sequences stored on disk."""
+
+import mmap
+import re
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from typing import Optional, Sequence
+
+# Files picked up from image sequence directories
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.tif', '.tiff', '.bmp', '.npy')
+
+# Files read as raw dumps of consecutive frames
+RAW_EXTENSIONS = ('.raw', '.bin')
+
+
+class FrameSequence:
+    """Random access to the frames of a clip without loading the whole clip.
+    
+    ``path`` may be an ``.npy`` stack of shape (N, H, W[, C]), a ``.raw`` or
+    ``.bin`` dump of consecutive frames (``shape`` gives the frame shape), a
+    directory of numbered images, a glob pattern such as
+    ``clip/frame_*.png`` or a single image. Files with other extensions are
+    rejected.
+    Stacks and raw dumps are memory-mapped, so indexing returns a read-only
+    view and only the pages of frames actually read are pulled in from
+    disk; images are decoded one at a time. Memory use therefore depends on
+    the frames touched, not on the length of the clip.
+    
+    With ``readahead`` set, reading frame ``i`` asks for frames
+    ``i + 1 .. i + readahead`` in the background: the OS is advised to page
+    them in for mapped files, and images are decoded on a helper thread.
+    """
+    
+    def __init__(self, path: str, shape: Optional[Sequence[int]] = None,
+                 dtype='uint8', offset: int = 0, readahead: int = 0):
+        """
+        Args:
+            path: Stack, raw dump, image directory, glob pattern or image
+            shape: Frame shape (H, W[, C]), required for raw dumps
+            dtype: Element type of raw dumps
+            offset: Bytes to skip at the start of a raw dump
+            readahead: Frames to prefetch after each one read, 0 disables
+        """
+        self.path = str(path)
+        self.readahead = max(0, int(readahead))
+        self._mmap = None
+        self._offset = 0
+        self._frames = None
+        self._files = None
+        self._pending = {}
+        self._executor = None
+        self._lock = threading.Lock()
+        
+        source = Path(path)
+        suffix = source.suffix.lower()
+        if source.is_dir() or any(c in source.name for c in '*?['):
+            directory, pattern = (source, '*') if source.is_dir() else (source.parent, source.name)
+            self._files = sorted(
+                (p for p in directory.glob(pattern)
+                 if p.suffix.lower() in IMAGE_EXTENSIONS and p.is_file()),
+                key=_natural_key
+            )
+            if not self._files:
+                raise ValueError(f"No frames found at '{path}'")
+            if self.readahead:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='fpv-readahead')
+        elif suffix == '.npy':
+            frame_shape, dtype, offset = _npy_layout(source)
+            if len(frame_shape) not in (3, 4):
+                raise ValueError(f'Expected (N, H, W[, C]) frame stack, got shape {frame_shape}')
+            self._map(source, frame_shape, dtype, offset)
+        elif suffix in IMAGE_EXTENSIONS:
+            if not source.is_file():
+                raise FileNotFoundError(f"No frame at '{path}'")
+            self._files = [source]
+        elif suffix in RAW_EXTENSIONS:
+            if shape is None:
+                raise ValueError('Raw frame sequences need the frame shape')
+            dtype = np.dtype(dtype)
+            frame_bytes = int(np.prod(shape)) * dtype.itemsize
+            count = (source.stat().st_size - offset) // frame_bytes
+            if count < 1:
+                raise ValueError(f"'{path}' holds no complete {tuple(shape)} frame")
+            self._map(source, (count,) + tuple(int(d) for d in shape), dtype, offset)
+        else:
+            raise ValueError(f"Unsupported frame sequence '{path}', expected a directory, glob "
+                             f"pattern or a file ending in {', '.join(IMAGE_EXTENSIONS + RAW_EXTENSIONS)}")
+    
+    def __len__(self) -> int:
+        if self._files is not None:
+            return len(self._files)
+        if self._frames is None:
+            raise ValueError('Frame sequence is closed')
+        return len(self._frames)
+    
+    def __getitem__(self, index: int) -> np.ndarray:
+        """Return frame ``index`` (read-only for mapped sequences)."""
+        count = len(self)
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError(f'Frame {index} out of range for a sequence of {count} frames')
+        
+        if self._files is None:
+            with self._lock:
+                if self._frames is None:
+                    raise ValueError('Frame sequence is closed')
+                self._advise(index + 1, index + 1 + self.readahead)
+                return self._frames[index]
+        
+        with self._lock:
+            pending = self._pending.pop(index, None)
+            self._schedule(index)
+        if pending is not None:
+            return pending.result()
+        return _read_image(self._files[index])
+    
+    @property
+    def frame_shape(self) -> tuple:
+        """Shape of one frame."""
+        return self[0].shape if self._files is not None else self._frames.shape[1:]
+    
+    def close(self):
+        """Release the mapping and stop read-ahead.
+        
+        Frames of mapped sequences must be dropped first; while any are
+        alive this raises ``BufferError`` and leaves the sequence usable.
+        """
+        with self._lock:
+            if self._frames is not None:
+                # NumPy does not pin the mapping, but every frame handed out
+                # (and every view of one) references the stack array
+                stack = weakref.ref(self._frames)
+                self._frames = None
+                if stack() is not None:
+                    self._frames = stack()
+                    raise BufferError('Frames read from the sequence are still in use')
+            if self._mmap is not None:
+                self._mmap.close()
+                self._mmap = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+        self._pending.clear()
+    
+    def _map(self, path: Path, shape: tuple, dtype, offset: int):
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._offset = offset
+        self._frames = np.ndarray(shape, dtype=dtype, buffer=self._mmap, offset=offset)
+    
+    def _advise(self, start: int, stop: int):
+        """Ask the OS to page in frames ``[start, stop)``."""
+        stop = min(stop, len(self._frames))
+        if start >= stop or not hasattr(self._mmap, 'madvise'):
+            return
+        frame_bytes = self._frames[0].nbytes
+        begin = self._offset + start * frame_bytes
+        aligned = begin - begin % mmap.PAGESIZE
+        self._mmap.madvise(mmap.MADV_WILLNEED, aligned, begin - aligned + (stop - start) * frame_bytes)
+    
+    def _schedule(self, index: int):
+        """Queue image decodes ahead of ``index``, dropping ones left behind."""
+        if self._executor is None:
+            return
+        window = range(index + 1, min(index + 1 + self.readahead, len(self._files)))
+        for stale in [i for i in self._pending if i not in window]:
+            self._pending.pop(stale).cancel()
+        for i in window:
+            if i not in self._pending:
+                self._pending[i] = self._executor.submit(_read_image, self._files[i])
+
+
+def _npy_layout(path: Path):
+    """Return the shape, dtype and data offset of an ``.npy`` file."""
+    with open(path, 'rb') as f:
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+        if fortran_order or dtype.hasobject:
+            raise ValueError(f"'{path}' is not a C-ordered numeric frame stack")
+        return shape, dtype, f.tell()
+
+
+def _read_image(path: Path) -> np.ndarray:
+    if path.suffix.lower() == '.npy':
+        return np.load(path, mmap_mode='r')
+    from PIL import Image
+    with Image.open(path) as img:
+        return np.array(img)
+
+
+def _natural_key(path: Path):
+    """Sort ``frame_2`` before ``frame_10``."""
+    return [int(part) if part.isdigit() else part for part in re.split(r'(\d+)', path.name)]
\ No newline at end of file
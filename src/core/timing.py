@@ -0,0 +1,138 @@
+"""Timing curves mapping transition time to progress along the trajectory."""
+
+import re
+from functools import lru_cache
+
+import numpy as np
+from typing import Tuple, Union
+
+# Named curves: ('bezier', (x1, y1, x2, y2)) as in CSS cubic-bezier(), or
+# ('spring', (damping ratio, angular frequency in radians per transition))
+CURVES = {
+    'linear': ('bezier', (0.0, 0.0, 1.0, 1.0)),
+    'ease_in': ('bezier', (0.42, 0.0, 1.0, 1.0)),
+    'ease_out': ('bezier', (0.0, 0.0, 0.58, 1.0)),
+    'ease_in_out': ('bezier', (0.42, 0.0, 0.58, 1.0)),
+    'whip': ('bezier', (0.7, 0.0, 0.2, 1.0)),
+    'spring': ('spring', (0.6, 8.0))
+}
+
+# Curve used for each FPV intensity of the panel
+INTENSITY_CURVES = {
+    'low': 'ease_in_out',
+    'medium': 'whip',
+    'high': 'spring'
+}
+
+# Bisection passes solving x(s) = t on a cubic Bezier, enough for float64
+_BEZIER_ITERATIONS = 40
+
+CurveSpec = Tuple[str, Tuple[float, ...]]
+
+
+def resolve_curve(curve: Union[str, CurveSpec]) -> CurveSpec:
+    """Turn a curve name, ``cubic-bezier(x1, y1, x2, y2)`` string or spec into a spec.
+    
+    Raises:
+        ValueError: For unknown names and Bezier control points with x outside [0, 1]
+    """
+    if not isinstance(curve, str):
+        kind, params = curve
+        spec = (kind, tuple(float(p) for p in params))
+    elif curve in CURVES:
+        spec = CURVES[curve]
+    else:
+        match = re.fullmatch(r'\s*cubic-bezier\(([^)]*)\)\s*', curve)
+        if match is None:
+            raise ValueError(f"Unknown timing curve '{curve}', expected one of {tuple(CURVES)} "
+                             f"or 'cubic-bezier(x1, y1, x2, y2)'")
+        spec = ('bezier', tuple(float(p) for p in match.group(1).split(',')))
+    
+    kind, params = spec
+    if kind == 'bezier':
+        if len(params) != 4 or not (0 <= params[0] <= 1 and 0 <= params[2] <= 1):
+            raise ValueError('cubic-bezier needs four values with x1 and x2 in [0, 1]')
+    elif kind == 'spring':
+        if len(params) != 2 or not (params[0] > 0 and params[1] > 0):
+            raise ValueError('spring needs a positive damping ratio and frequency')
+    else:
+        raise ValueError(f"Unknown timing curve kind '{kind}', expected 'bezier' or 'spring'")
+    return spec
+
+
+def intensity_curve(intensity: str) -> str:
+    """Name of the timing curve of an FPV intensity (``low``, ``medium``, ``high``)."""
+    try:
+        return INTENSITY_CURVES[intensity]
+    except KeyError:
+        raise ValueError(f"Unknown intensity '{intensity}', "
+                         f"expected one of {tuple(INTENSITY_CURVES)}") from None
+
+
+def timing_lut(curve: Union[str, CurveSpec], steps: int) -> np.ndarray:
+    """Progress at ``steps`` evenly spaced times from 0 to 1.
+    
+    Matches the ``np.linspace(0, 1, steps)`` spacing of
+    ``trajectory_interpolate``, so the result can be passed as its
+    ``timesteps``. Springs overshoot, giving values slightly above 1.
+    
+    Args:
+        curve: Curve name, ``cubic-bezier(...)`` string or spec tuple
+        steps: Number of samples
+    
+    Returns:
+        Read-only (steps,) float64 array, shared between callers
+    """
+    return _lut(resolve_curve(curve), int(steps))
+
+
+def rife_timesteps(curve: Union[str, CurveSpec], num_frames: int) -> np.ndarray:
+    """Eased timesteps of ``num_frames`` in-between frames for ``RIFEInterpolator``.
+    
+    The in-betweens sit at the interior samples of the same LUT that drives
+    the keyframes, clipped to [0, 1] since the model cannot extrapolate.
+    """
+    return np.clip(timing_lut(curve, num_frames + 2)[1:-1], 0.0, 1.0)
+
+
+@lru_cache(maxsize=128)
+def _lut(spec: CurveSpec, steps: int) -> np.ndarray:
+    t = np.linspace(0, 1, steps)
+    kind, params = spec
+    values = _bezier(t, *params) if kind == 'bezier' else _spring(t, *params)
+    if steps > 1:
+        # Start and end exactly on the keyframes
+        values[0], values[-1] = 0.0, 1.0
+    values.setflags(write=False)
+    return values
+
+
+def _bezier(t: np.ndarray, x1: float, y1: float, x2: float, y2: float) -> np.ndarray:
+    """Evaluate a CSS-style cubic Bezier timing function at every t."""
+    def coordinate(s, p1, p2):
+        # Bernstein form with P0 = 0 and P3 = 1
+        return 3 * (1 - s) ** 2 * s * p1 + 3 * (1 - s) * s ** 2 * p2 + s ** 3
+    
+    # x(s) is monotonic for x1, x2 in [0, 1]; bisect all samples at once
+    low = np.zeros_like(t)
+    high = np.ones_like(t)
+    for _ in range(_BEZIER_ITERATIONS):
+        mid = (low + high) / 2
+        below = coordinate(mid, x1, x2) < t
+        low = np.where(below, mid, low)
+        high = np.where(below, high, mid)
+    return coordinate((low + high) / 2, y1, y2)
+
+
+def _spring(t: np.ndarray, damping: float, frequency: float) -> np.ndarray:
+    """Step response of a damped spring, corrected to end exactly at 1."""
+    def response(x):
+        if damping < 1:
+            damped = frequency * np.sqrt(1 - damping ** 2)
+            return 1 - np.exp(-damping * frequency * x) * (
+                np.cos(damped * x) + damping * frequency / damped * np.sin(damped * x))
+        # Critically or over-damped: no oscillation
+        return 1 - np.exp(-frequency * x) * (1 + frequency * x)
+    
+    values = response(t)
+    return values + t * (1 - response(np.ones(1)))
\ No newline at end of file
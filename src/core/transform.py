@@ -1,21 +1,101 @@
 """FPV transformation utilities using OpenCV."""
 
+import threading
+from collections import OrderedDict
+
 import cv2
 import numpy as np
-from typing import Tuple, List
+from typing import Tuple, List, Optional
+
+from .interpolation import trajectory_interpolate
+
+WARP_METHODS = ('perspective', 'remap')
+
+INTERPOLATIONS = {
+    'nearest': cv2.INTER_NEAREST,
+    'linear': cv2.INTER_LINEAR,
+    'cubic': cv2.INTER_CUBIC,
+    'lanczos': cv2.INTER_LANCZOS4
+}
+
+BORDER_MODES = {
+    'constant': cv2.BORDER_CONSTANT,
+    'replicate': cv2.BORDER_REPLICATE,
+    'reflect': cv2.BORDER_REFLECT_101,
+    'wrap': cv2.BORDER_WRAP
+}
 
 
 class FPVTransform:
     """Handles 3D transformations for FPV effect."""
     
-    def __init__(self, frame_width: int, frame_height: int):
+    def __init__(self, frame_width: int, frame_height: int,
+                 focal_length: Optional[float] = None,
+                 cache_size: int = 256, angle_step: float = 0.01,
+                 fov_step: float = 0.001, warp_method: str = 'perspective',
+                 interpolation: str = 'linear', border_mode: str = 'constant',
+                 map_cache_size: int = 16, motion_blur_samples: int = 16,
+                 motion_blur_step: float = 1.0):
+        """
+        Args:
+            frame_width: Frame width in pixels
+            frame_height: Frame height in pixels
+            focal_length: Focal length in pixels, defaults to the frame width
+            cache_size: Maximum number of cached homographies
+            angle_step: Quantization step in degrees for homography cache keys
+            fov_step: Quantization step of the FOV factor for cache keys
+            warp_method: ``'perspective'`` maps every pixel through the
+                homography on each call; ``'remap'`` builds fixed-point
+                ``cv2.remap`` maps once per pose and caches them
+            interpolation: One of ``INTERPOLATIONS``
+            border_mode: One of ``BORDER_MODES``
+            map_cache_size: Maximum number of cached remap maps (about
+                12 MB each at 1080p)
+            motion_blur_samples: Most sub-frames accumulated by
+                ``warp_motion_blur``
+            motion_blur_step: Largest image motion in pixels between two
+                motion blur sub-frames
+        """
+        if warp_method not in WARP_METHODS:
+            raise ValueError(f"Unknown warp method '{warp_method}', expected one of {WARP_METHODS}")
+        if interpolation not in INTERPOLATIONS:
+            raise ValueError(f"Unknown interpolation '{interpolation}', "
+                             f"expected one of {tuple(INTERPOLATIONS)}")
+        if border_mode not in BORDER_MODES:
+            raise ValueError(f"Unknown border mode '{border_mode}', "
+                             f"expected one of {tuple(BORDER_MODES)}")
+        
         self.width = frame_width
         self.height = frame_height
+        self.focal_length = float(focal_length or frame_width)
         self.camera_matrix = self._create_camera_matrix()
+        self.camera_matrix_inv = np.linalg.inv(self.camera_matrix)
+        
+        self.cache_size = cache_size
+        self.angle_step = angle_step
+        self.fov_step = fov_step
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._homography_cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._pixel_grid = None
+        
+        self.warp_method = warp_method
+        self.interpolation = interpolation
+        self.border_mode = border_mode
+        self.map_cache_size = map_cache_size
+        self.map_hits = 0
+        self.map_misses = 0
+        self._map_cache = OrderedDict()
+        
+        self.motion_blur_samples = max(1, int(motion_blur_samples))
+        self.motion_blur_step = motion_blur_step
+        # Per-thread accumulation buffers of warp_motion_blur
+        self._blur_buffers = threading.local()
     
     def _create_camera_matrix(self) -> np.ndarray:
         """Create camera intrinsic matrix."""
-        focal_length = self.width
+        focal_length = self.focal_length
         center = (self.width / 2, self.height / 2)
         return np.array([
             [focal_length, 0, center[0]],
@@ -23,6 +103,100 @@ class FPVTransform:
             [0, 0, 1]
         ], dtype=float)
     
+    def cache_info(self) -> dict:
+        """Return homography cache statistics."""
+        with self._cache_lock:
+            return {
+                'hits': self.cache_hits,
+                'misses': self.cache_misses,
+                'size': len(self._homography_cache),
+                'max_size': self.cache_size,
+                'map_hits': self.map_hits,
+                'map_misses': self.map_misses,
+                'map_size': len(self._map_cache)
+            }
+    
+    def clear_cache(self):
+        """Drop all cached homographies and remap maps and reset the counters."""
+        with self._cache_lock:
+            self._homography_cache.clear()
+            self._map_cache.clear()
+            self.cache_hits = 0
+            self.cache_misses = 0
+            self.map_hits = 0
+            self.map_misses = 0
+    
+    def pixel_grid(self) -> np.ndarray:
+        """Return the pixel coordinate grid for this resolution.
+        
+        Returns:
+            (2, height * width) float32 array of ``[x, y]`` columns, built
+            once and shared read-only between callers
+        """
+        grid = self._pixel_grid
+        if grid is None:
+            ys, xs = np.mgrid[0:self.height, 0:self.width].astype(np.float32)
+            grid = np.stack([xs.ravel(), ys.ravel()])
+            grid.setflags(write=False)
+            self._pixel_grid = grid
+        return grid
+    
+    def remap_grids(self, rotation: Tuple[float, float, float],
+                    fov_factor: float = 1.0) -> Tuple[np.ndarray, np.ndarray]:
+        """Build ``cv2.remap`` lookup maps equivalent to ``warp``.
+        
+        Args:
+            rotation: (x, y, z) rotation angles in degrees
+            fov_factor: FOV adjustment factor (0.5-2.0)
+        
+        Returns:
+            (map_x, map_y) float32 arrays of shape (height, width)
+        """
+        inverse = np.linalg.inv(self.homography(rotation, fov_factor)).astype(np.float32)
+        src = inverse[:, :2] @ self.pixel_grid()
+        src += inverse[:, 2:]
+        src[:2] /= src[2]
+        shape = (self.height, self.width)
+        return src[0].reshape(shape), src[1].reshape(shape)
+    
+    def remap_maps(self, rotation: Tuple[float, float, float],
+                   fov_factor: float = 1.0) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """Return cached fixed-point ``cv2.remap`` maps for a pose.
+        
+        The float maps of ``remap_grids`` are converted with
+        ``cv2.convertMaps`` to CV_16SC2 coordinates plus interpolation table
+        indices, which ``cv2.remap`` applies without any per-pixel projective
+        math. Maps are cached per quantized pose like the homographies.
+        
+        Args:
+            rotation: (x, y, z) rotation angles in degrees
+            fov_factor: FOV adjustment factor (0.5-2.0)
+        
+        Returns:
+            (map1, map2); map2 is None for nearest-neighbour interpolation
+        """
+        key = self._pose_key(rotation, fov_factor, self.width, self.height)
+        
+        with self._cache_lock:
+            cached = self._map_cache.get(key)
+            if cached is not None:
+                self._map_cache.move_to_end(key)
+                self.map_hits += 1
+                return cached
+            self.map_misses += 1
+        
+        map_x, map_y = self.remap_grids(rotation, fov_factor)
+        nearest = self.interpolation == 'nearest'
+        map1, map2 = cv2.convertMaps(map_x, map_y, cv2.CV_16SC2, nninterpolation=nearest)
+        maps = (map1, None if nearest else map2)
+        
+        with self._cache_lock:
+            self._map_cache[key] = maps
+            while len(self._map_cache) > self.map_cache_size:
+                self._map_cache.popitem(last=False)
+        
+        return maps
+    
     def apply_rotation(self, frame: np.ndarray, 
                       rotation: Tuple[float, float, float]) -> np.ndarray:
         """Apply 3D rotation to frame.
@@ -34,16 +208,8 @@ class FPVTransform:
         Returns:
             Transformed frame
         """
-        # Convert rotation to radians
-        rx, ry, rz = [np.radians(angle) for angle in rotation]
-        
-        # Create rotation matrix
-        rotation_vector = np.array([rx, ry, rz])
-        rotation_matrix, _ = cv2.Rodrigues(rotation_vector)
-        
-        # Apply perspective transformation
         h, w = frame.shape[:2]
-        transform_matrix = self.camera_matrix @ rotation_matrix @ np.linalg.inv(self.camera_matrix)
+        transform_matrix = self.homography(rotation, 1.0, (w, h))
         
         # Warp perspective
         result = cv2.warpPerspective(frame, transform_matrix, (w, h))
@@ -72,4 +238,197 @@ class FPVTransform:
         # Apply transformation
         result = cv2.warpPerspective(frame, scale_matrix, (w, h))
         
-        return result
\ No newline at end of file
+        return result
+    
+    def homography(self, rotation: Tuple[float, float, float], fov_factor: float = 1.0,
+                   size: Optional[Tuple[int, int]] = None) -> np.ndarray:
+        """Build the combined rotation + FOV homography.
+        
+        Equivalent to ``apply_rotation`` followed by ``adjust_fov``, i.e.
+        ``S @ K @ R @ K^-1`` where ``S`` is the FOV scale matrix. Results are
+        kept in a bounded LRU cache keyed by the pose quantized to
+        ``angle_step``/``fov_step``; see ``cache_info`` for hit/miss counters.
+        
+        Args:
+            rotation: (x, y, z) rotation angles in degrees
+            fov_factor: FOV adjustment factor (0.5-2.0)
+            size: (width, height) of the frame, defaults to the transform size
+        
+        Returns:
+            3x3 homography matrix (read-only, shared through the pose cache)
+        """
+        w, h = size if size is not None else (self.width, self.height)
+        key = self._pose_key(rotation, fov_factor, w, h)
+        
+        with self._cache_lock:
+            cached = self._homography_cache.get(key)
+            if cached is not None:
+                self._homography_cache.move_to_end(key)
+                self.cache_hits += 1
+                return cached
+            self.cache_misses += 1
+        
+        # Build from the quantized pose so cached and fresh results agree
+        matrix = self._compose_homography(np.array(key[:3], dtype=float) * self.angle_step,
+                                          key[3] * self.fov_step, w, h)
+        matrix.setflags(write=False)
+        
+        with self._cache_lock:
+            self._homography_cache[key] = matrix
+            while len(self._homography_cache) > self.cache_size:
+                self._homography_cache.popitem(last=False)
+        
+        return matrix
+    
+    def _compose_homography(self, rotation, fov_factor: float, w: int, h: int) -> np.ndarray:
+        """Build ``S @ K @ R @ K^-1`` for a pose without touching the cache."""
+        rotation_matrix, _ = cv2.Rodrigues(np.radians(np.asarray(rotation, dtype=float)))
+        rotation_homography = self.camera_matrix @ rotation_matrix @ self.camera_matrix_inv
+        
+        scale_matrix = np.array([
+            [fov_factor, 0, w * (1 - fov_factor) / 2],
+            [0, fov_factor, h * (1 - fov_factor) / 2],
+            [0, 0, 1]
+        ])
+        
+        return scale_matrix @ rotation_homography
+    
+    def _pose_key(self, rotation: Tuple[float, float, float], fov_factor: float,
+                  w: int, h: int) -> Tuple[int, ...]:
+        """Cache key of a pose quantized to ``angle_step``/``fov_step``."""
+        step = self.angle_step
+        return (
+            int(round(rotation[0] / step)),
+            int(round(rotation[1] / step)),
+            int(round(rotation[2] / step)),
+            int(round(fov_factor / self.fov_step)),
+            w, h
+        )
+    
+    def warp(self, frame: np.ndarray, rotation: Tuple[float, float, float],
+             fov_factor: float = 1.0, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Apply rotation and FOV adjustment in a single resampling pass.
+        
+        Uses ``warp_method``, ``interpolation`` and ``border_mode``; frames
+        that do not match the transform resolution always go through
+        ``cv2.warpPerspective``.
+        
+        Args:
+            frame: Input frame
+            rotation: (x, y, z) rotation angles in degrees
+            fov_factor: FOV adjustment factor (0.5-2.0)
+            out: Optional preallocated output buffer with the frame's shape and dtype
+        
+        Returns:
+            Transformed frame (``out`` if given)
+        """
+        h, w = frame.shape[:2]
+        if out is not None and (out.shape != frame.shape or out.dtype != frame.dtype):
+            raise ValueError(f"Output buffer {out.shape}/{out.dtype} does not match "
+                             f"frame {frame.shape}/{frame.dtype}")
+        
+        interpolation = INTERPOLATIONS[self.interpolation]
+        border_mode = BORDER_MODES[self.border_mode]
+        
+        if self.warp_method == 'remap' and (w, h) == (self.width, self.height):
+            map1, map2 = self.remap_maps(rotation, fov_factor)
+            return cv2.remap(frame, map1, map2, interpolation, dst=out, borderMode=border_mode)
+        
+        transform_matrix = self.homography(rotation, fov_factor, (w, h))
+        
+        return cv2.warpPerspective(frame, transform_matrix, (w, h), dst=out,
+                                   flags=interpolation, borderMode=border_mode)
+    
+    def motion_blur_samples_for(self, rotation: Tuple[float, float, float],
+                                end_rotation: Tuple[float, float, float],
+                                fov_factor: float = 1.0, end_fov: Optional[float] = None,
+                                size: Optional[Tuple[int, int]] = None) -> int:
+        """Number of sub-frames needed to blur the motion between two poses.
+        
+        The frame corners and centre are projected with both homographies;
+        the largest displacement divided by ``motion_blur_step`` gives the
+        sample count, capped at ``motion_blur_samples``. A static or slowly
+        moving camera needs a single sample.
+        """
+        w, h = size if size is not None else (self.width, self.height)
+        end_fov = fov_factor if end_fov is None else end_fov
+        points = np.array([[0, 0], [w, 0], [0, h], [w, h], [w / 2, h / 2]],
+                          dtype=np.float64).reshape(-1, 1, 2)
+        start = cv2.perspectiveTransform(points, np.asarray(self.homography(rotation, fov_factor, (w, h))))
+        end = cv2.perspectiveTransform(points, np.asarray(self.homography(end_rotation, end_fov, (w, h))))
+        motion = float(np.max(np.linalg.norm(end - start, axis=-1)))
+        return int(min(self.motion_blur_samples, max(1, np.ceil(motion / self.motion_blur_step))))
+    
+    def warp_motion_blur(self, frame: np.ndarray, rotation: Tuple[float, float, float],
+                         end_rotation: Tuple[float, float, float], fov_factor: float = 1.0,
+                         end_fov: Optional[float] = None, samples: Optional[int] = None,
+                         out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Warp with motion blur over the camera move from one pose to another.
+        
+        Sub-frame poses are SLERPed with ``trajectory_interpolate`` and each
+        sub-frame is warped into a scratch frame and added to a float32
+        accumulator (float64 for float64 frames) with ``cv2.accumulate``.
+        Both buffers are kept per thread and reused, so no sub-frame
+        allocates an image. Sub-frames always go through
+        ``cv2.warpPerspective`` with homographies built outside the pose
+        cache: their poses are too transient to be worth caching and would
+        evict the keyframe entries.
+        
+        Args:
+            frame: Input frame
+            rotation: (x, y, z) rotation angles in degrees when the shutter opens
+            end_rotation: Rotation angles when the shutter closes
+            fov_factor: FOV adjustment factor when the shutter opens
+            end_fov: FOV factor when the shutter closes, defaults to ``fov_factor``
+            samples: Number of sub-frames, chosen from the motion when None
+                (see ``motion_blur_samples_for``)
+            out: Optional preallocated output buffer with the frame's shape and dtype
+        
+        Returns:
+            Motion-blurred frame (``out`` if given)
+        """
+        h, w = frame.shape[:2]
+        end_fov = fov_factor if end_fov is None else end_fov
+        if samples is None:
+            samples = self.motion_blur_samples_for(rotation, end_rotation, fov_factor, end_fov, (w, h))
+        if samples <= 1:
+            return self.warp(frame, rotation, fov_factor, out=out)
+        if out is not None and (out.shape != frame.shape or out.dtype != frame.dtype):
+            raise ValueError(f"Output buffer {out.shape}/{out.dtype} does not match "
+                             f"frame {frame.shape}/{frame.dtype}")
+        
+        start_matrix, _ = cv2.Rodrigues(np.radians(np.asarray(rotation, dtype=float)))
+        end_matrix, _ = cv2.Rodrigues(np.radians(np.asarray(end_rotation, dtype=float)))
+        poses = trajectory_interpolate(start_matrix, end_matrix, samples, output='angles')
+        fovs = np.linspace(fov_factor, end_fov, samples)
+        
+        accumulator, scratch = self._motion_blur_buffers(frame)
+        accumulator.fill(0)
+        interpolation = INTERPOLATIONS[self.interpolation]
+        border_mode = BORDER_MODES[self.border_mode]
+        for pose, fov in zip(poses, fovs):
+            cv2.warpPerspective(frame, self._compose_homography(pose, fov, w, h), (w, h),
+                                dst=scratch, flags=interpolation, borderMode=border_mode)
+            cv2.accumulate(scratch, accumulator)
+        
+        if out is None:
+            out = np.empty_like(frame)
+        if frame.dtype == np.uint8:
+            cv2.convertScaleAbs(accumulator, dst=out, alpha=1.0 / samples)
+        else:
+            accumulator *= 1.0 / samples
+            if np.issubdtype(frame.dtype, np.integer):
+                np.rint(accumulator, out=accumulator)
+            np.copyto(out, accumulator.reshape(out.shape), casting='unsafe')
+        return out
+    
+    def _motion_blur_buffers(self, frame: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Return this thread's float32 accumulator and scratch frame for ``frame``."""
+        buffers = self._blur_buffers
+        scratch = getattr(buffers, 'scratch', None)
+        if scratch is None or scratch.shape != frame.shape or scratch.dtype != frame.dtype:
+            buffers.scratch = scratch = np.empty_like(frame)
+            # cv2.accumulate only adds float64 sources into a float64 buffer
+            accumulator_dtype = np.float64 if frame.dtype == np.float64 else np.float32
+            buffers.accumulator = np.empty(frame.shape, dtype=accumulator_dtype)
+        return buffers.accumulator, scratch
\ No newline at end of file
@@ -0,0 +1,6 @@
+"""Make the backend packages importable as ``core``, ``ai`` and ``backend``."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
\ No newline at end of file
@@ -0,0 +1,117 @@
+"""Tests for the two-tier render cache."""
+
+import numpy as np
+
+from core.cache import RenderCache
+
+MB = 1024 ** 2
+
+
+def block(value, mb=1):
+    """A ``mb`` MB uint8 array filled with ``value``."""
+    return np.full(mb * MB, value, dtype=np.uint8)
+
+
+def test_key_depends_on_content_and_parameters():
+    frame = np.zeros((4, 4, 3), dtype=np.uint8)
+    
+    assert RenderCache.key([frame], 1.0) == RenderCache.key([frame.copy()], 1.0)
+    assert RenderCache.key([frame], 1.0) != RenderCache.key([frame], 2.0)
+    assert RenderCache.key([frame], 1.0) != RenderCache.key([frame + 1], 1.0)
+    assert RenderCache.key([frame], 1.0) != RenderCache.key([frame.astype(np.uint16)], 1.0)
+
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = RenderCache(memory_mb=2.5)
+    cache.put('a', block(1))
+    cache.put('b', block(2))
+    cache.get('a')
+    cache.put('c', block(3))
+    
+    assert cache.get('b') is None
+    assert cache.get('a')[0] == 1
+    assert cache.get('c')[0] == 3
+    info = cache.info()
+    assert info['memory_entries'] == 2
+    assert info['memory_mb'] == 2
+
+
+def test_memory_values_are_read_only_copies():
+    cache = RenderCache(memory_mb=1)
+    value = np.zeros(16, dtype=np.uint8)
+    cache.put('a', value)
+    value[:] = 7
+    
+    cached = cache.get('a')
+    assert not cached.flags.writeable
+    assert cached.max() == 0
+
+
+def test_entries_larger_than_the_memory_budget_are_skipped():
+    cache = RenderCache(memory_mb=1)
+    cache.put('big', block(1, mb=2))
+    
+    assert cache.get('big') is None
+    assert cache.info()['memory_entries'] == 0
+
+
+def test_disk_tier_survives_restarts(tmp_path):
+    RenderCache(memory_mb=0, cache_dir=str(tmp_path)).put('a' * 40, np.arange(10))
+    
+    cache = RenderCache(memory_mb=0, cache_dir=str(tmp_path))
+    
+    np.testing.assert_array_equal(cache.get('a' * 40), np.arange(10))
+    assert cache.info()['disk_hits'] == 1
+    assert not list(tmp_path.glob('*/*.tmp'))
+
+
+def test_disk_tier_evicts_oldest_past_its_budget(tmp_path):
+    cache = RenderCache(memory_mb=0, cache_dir=str(tmp_path), disk_mb=2.5)
+    keys = [f'{i:040x}' for i in range(3)]
+    for i, key in enumerate(keys):
+        cache.put(key, block(i))
+    
+    assert cache.get(keys[0]) is None
+    assert cache.get(keys[1])[0] == 1
+    assert cache.get(keys[2])[0] == 2
+    assert cache.info()['disk_entries'] == 2
+    assert len(list(tmp_path.glob('*/*.npy'))) == 2
+
+
+def test_get_or_compute_only_computes_on_a_miss():
+    cache = RenderCache(memory_mb=1)
+    calls = []
+    
+    def compute():
+        calls.append(1)
+        return np.ones(4)
+    
+    cache.get_or_compute('a', compute)
+    cache.get_or_compute('a', compute)
+    
+    assert len(calls) == 1
+    assert cache.info()['memory_hits'] == 1
+
+
+def test_clear_empties_both_tiers(tmp_path):
+    cache = RenderCache(memory_mb=1, cache_dir=str(tmp_path))
+    cache.put('a' * 40, np.ones(4))
+    
+    cache.clear()
+    
+    assert cache.get('a' * 40) is None
+    assert not list(tmp_path.glob('*/*.npy'))
+
+
+def test_undeletable_entries_do_not_fail_puts(tmp_path, monkeypatch):
+    cache = RenderCache(memory_mb=0, cache_dir=str(tmp_path), disk_mb=1.5)
+    cache.put('a' * 40, block(1))
+    
+    def unlink(self, missing_ok=False):
+        raise PermissionError('file is mapped by another process')
+    
+    monkeypatch.setattr(type(tmp_path), 'unlink', unlink)
+    cache.put('b' * 40, block(2))
+    
+    assert cache.info()['disk_entries'] == 1
+    assert cache.get('b' * 40)[0] == 2
\ No newline at end of file
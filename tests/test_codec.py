@@ -0,0 +1,76 @@
+"""Tests for the binary frame transport."""
+
+import numpy as np
+import pytest
+
+from core import codec
+
+
+def frame(shape=(12, 16, 3), dtype=np.uint8):
+    info = np.iinfo(dtype)
+    return np.random.default_rng(0).integers(info.min, info.max, shape, dtype=dtype, endpoint=True)
+
+
+@pytest.mark.parametrize('fmt', codec.available_formats())
+@pytest.mark.parametrize('shape', [(12, 16, 3), (12, 16, 4), (12, 16)])
+def test_lossless_round_trip(fmt, shape):
+    original = frame(shape)
+    
+    decoded = codec.decode_frame(codec.encode_frame(original, fmt), fmt, shape)
+    
+    np.testing.assert_array_equal(decoded, original)
+
+
+@pytest.mark.parametrize('fmt', [fmt for fmt in ('raw', 'tiff', 'png') if fmt in codec.available_formats()])
+def test_16_bit_round_trip(fmt):
+    original = frame(dtype=np.uint16)
+    
+    decoded = codec.decode_frame(codec.encode_frame(original, fmt), fmt, original.shape, 'uint16')
+    
+    assert decoded.dtype == np.uint16
+    np.testing.assert_array_equal(decoded, original)
+
+
+def test_raw_decode_checks_the_shape():
+    data = codec.encode_frame(frame(), 'raw')
+    
+    with pytest.raises(ValueError):
+        codec.decode_frame(data, 'raw')
+    with pytest.raises(ValueError):
+        codec.decode_frame(data, 'raw', (12, 16, 4))
+
+
+def test_pack_frames_lists_lengths():
+    frames = [frame(), frame()]
+    
+    raw, raw_headers = codec.encode_frames(frames, 'raw')
+    png, png_headers = codec.encode_frames(frames, 'png')
+    
+    assert raw == b''.join(f.tobytes() for f in frames)
+    assert raw_headers == {'X-Frame-Shape': '12,16,3', 'X-Frame-Dtype': 'uint8', 'X-Frame-Count': '2'}
+    lengths = [int(n) for n in png_headers['X-Frame-Lengths'].split(',')]
+    assert sum(lengths) == len(png)
+    np.testing.assert_array_equal(codec.decode_frame(png[lengths[0]:], 'png'), frames[1])
+
+
+@pytest.mark.parametrize('accept, requested, expected', [
+    (None, None, 'json'),
+    ('application/json', None, 'json'),
+    ('image/png', None, 'png'),
+    ('text/html, application/octet-stream;q=0.9', None, 'raw'),
+    ('image/png', 'RAW', 'raw'),
+    ('application/octet-stream', 'json', 'json')
+])
+def test_negotiate(accept, requested, expected):
+    assert codec.negotiate(accept, requested) == expected
+
+
+def test_negotiate_rejects_unknown_formats():
+    with pytest.raises(ValueError):
+        codec.negotiate(None, 'gif')
+
+
+def test_parse_shape():
+    assert codec.parse_shape('1080,1920,3') == (1080, 1920, 3)
+    assert codec.parse_shape('1920x1080') == (1920, 1080)
+    assert codec.parse_shape('') is None
\ No newline at end of file
@@ -0,0 +1,110 @@
+"""Tests for the multi-process render farm job lifecycle."""
+
+import time
+
+import numpy as np
+import pytest
+
+from core.farm import RenderFarm
+from core.pool import TransformPool
+
+
+@pytest.fixture(scope='module')
+def farm():
+    farm = RenderFarm(max_workers=1, shard_size=1, job_ttl=None)
+    yield farm
+    farm.shutdown()
+
+
+def frames(count, height=48, width=64):
+    rng = np.random.default_rng(0)
+    return [rng.integers(0, 256, (height, width, 3), dtype=np.uint8) for _ in range(count)]
+
+
+def wait(farm, job_id, timeout=30):
+    deadline = time.monotonic() + timeout
+    while farm.status(job_id)['state'] == 'running':
+        assert time.monotonic() < deadline, 'render job did not finish'
+        time.sleep(0.02)
+    return farm.status(job_id)
+
+
+def test_result_matches_a_local_render(farm):
+    inputs = frames(4)
+    rotations = [[i, 2 * i, 0] for i in range(4)]
+    
+    job_id = farm.submit(inputs, rotations, [1.1] * 4)
+    status = wait(farm, job_id)
+    
+    assert status['state'] == 'done'
+    assert status['completed'] == status['total'] == 4
+    assert status['progress'] == 1.0
+    pool = TransformPool()
+    expected = np.stack([pool.warp(f, r, 1.1) for f, r in zip(inputs, rotations)])
+    np.testing.assert_array_equal(farm.result(job_id), expected)
+    np.testing.assert_array_equal(farm.frame(job_id, 2), expected[2])
+
+
+def test_proxy_quality_renders_at_reduced_size(farm):
+    job_id = farm.submit(frames(2), [[5, 0, 0]] * 2, [1.0] * 2, quality='half')
+    wait(farm, job_id)
+    
+    assert farm.result(job_id).shape == (2, 24, 32, 3)
+
+
+def test_cancel_stops_pending_shards(farm):
+    job_id = farm.submit(frames(64, 256, 256), [[5, 0, 0]] * 64, [1.0] * 64)
+    
+    assert farm.cancel(job_id)
+    status = farm.status(job_id)
+    assert status['state'] == 'cancelled'
+    assert farm.result(job_id) is None
+    
+    # Shards already running finish their frame; the rest never start
+    deadline = time.monotonic() + 30
+    while not farm.release(job_id):
+        assert time.monotonic() < deadline, 'cancelled shards did not stop'
+        time.sleep(0.02)
+    assert farm.status(job_id) is None
+
+
+def test_release_forgets_a_finished_job(farm):
+    job_id = farm.submit(frames(1), [[0, 0, 0]], [1.0])
+    wait(farm, job_id)
+    
+    assert farm.release(job_id)
+    assert farm.status(job_id) is None
+    assert farm.result(job_id) is None
+    assert not farm.release(job_id)
+
+
+def test_unknown_jobs(farm):
+    assert farm.status('missing') is None
+    assert not farm.cancel('missing')
+    assert farm.result('missing') is None
+
+
+def test_invalid_jobs_are_rejected(farm):
+    with pytest.raises(ValueError):
+        farm.submit([], [], [])
+    with pytest.raises(ValueError):
+        farm.submit(frames(2), [[0, 0, 0]], [1.0])
+    with pytest.raises(ValueError):
+        farm.submit(frames(1) + frames(1, 32, 32), [[0, 0, 0]] * 2, [1.0] * 2)
+    with pytest.raises(ValueError):
+        farm.submit(frames(1), [[0, 0, 0]], [1.0], quality='eighth')
+
+
+def test_finished_jobs_expire():
+    farm = RenderFarm(max_workers=1, job_ttl=0.2)
+    try:
+        job_id = farm.submit(frames(1), [[0, 0, 0]], [1.0])
+        wait(farm, job_id)
+        
+        deadline = time.monotonic() + 10
+        while farm.status(job_id) is not None:
+            assert time.monotonic() < deadline, 'finished job was not freed'
+            time.sleep(0.05)
+        assert farm.stats()['jobs'] == {}
+    finally:
+        farm.shutdown()
\ No newline at end of file
@@ -0,0 +1,110 @@
+"""Tests for the vectorized SLERP trajectory."""
+
+import cv2
+import numpy as np
+import pytest
+
+from core.interpolation import bezier_trajectory, trajectory_interpolate
+
+
+def rotation(degrees):
+    matrix, _ = cv2.Rodrigues(np.radians(np.asarray(degrees, dtype=float)))
+    return matrix
+
+
+def reference_slerp(pose_a, pose_b, t):
+    """Rotate from ``pose_a`` by the fraction ``t`` of the relative rotation."""
+    relative, _ = cv2.Rodrigues(pose_a.T @ pose_b)
+    step, _ = cv2.Rodrigues(t * relative)
+    return pose_a @ step
+
+
+@pytest.mark.parametrize('start, end', [
+    ([0, 0, 0], [30, -20, 10]),
+    ([10, 5, -3], [-25, 40, 15]),
+    ([0, 0, 0], [0, 0, 0.01])
+])
+def test_matches_reference_slerp(start, end):
+    pose_a, pose_b = rotation(start), rotation(end)
+    steps = 11
+    
+    poses = trajectory_interpolate(pose_a, pose_b, steps)
+    
+    assert poses.shape == (steps, 3, 3)
+    for t, pose in zip(np.linspace(0, 1, steps), poses):
+        np.testing.assert_allclose(pose, reference_slerp(pose_a, pose_b, t), atol=1e-9)
+
+
+def test_endpoints_and_orthonormality():
+    pose_a, pose_b = rotation([5, 10, 0]), rotation([-40, 20, 30])
+    
+    poses = trajectory_interpolate(pose_a, pose_b, 7)
+    
+    np.testing.assert_allclose(poses[0], pose_a, atol=1e-12)
+    np.testing.assert_allclose(poses[-1], pose_b, atol=1e-12)
+    np.testing.assert_allclose(poses @ poses.transpose(0, 2, 1), np.broadcast_to(np.eye(3), poses.shape),
+                               atol=1e-12)
+
+
+def test_takes_the_shorter_arc():
+    # 350 degrees one way is 10 degrees the other
+    pose_b = rotation([0, 0, 350])
+    
+    middle = trajectory_interpolate(np.eye(3), pose_b, 3)[1]
+    
+    np.testing.assert_allclose(middle, rotation([0, 0, -5]), atol=1e-9)
+
+
+def test_angles_output_matches_matrices():
+    pose_a, pose_b = rotation([0, 0, 0]), rotation([30, -20, 10])
+    
+    angles = trajectory_interpolate(pose_a, pose_b, 5, output='angles')
+    matrices = trajectory_interpolate(pose_a, pose_b, 5)
+    
+    for angle, matrix in zip(angles, matrices):
+        np.testing.assert_allclose(rotation(angle), matrix, atol=1e-9)
+
+
+def test_custom_timesteps():
+    pose_a, pose_b = rotation([0, 0, 0]), rotation([0, 60, 0])
+    timesteps = np.array([0.0, 0.1, 0.5, 1.0])
+    
+    poses = trajectory_interpolate(pose_a, pose_b, 4, timesteps=timesteps)
+    
+    for t, pose in zip(timesteps, poses):
+        np.testing.assert_allclose(pose, reference_slerp(pose_a, pose_b, t), atol=1e-9)
+    with pytest.raises(ValueError):
+        trajectory_interpolate(pose_a, pose_b, 3, timesteps=timesteps)
+
+
+@pytest.mark.parametrize('degree', [1, 3, 7, 20])
+def test_bezier_basis_matches_de_casteljau(degree):
+    points = np.random.default_rng(degree).normal(size=(degree + 1, 3)) * 10
+    
+    basis = bezier_trajectory(points, 33, method='basis')
+    reference = bezier_trajectory(points, 33, method='de_casteljau')
+    
+    assert basis.shape == (33, 3)
+    np.testing.assert_allclose(basis, reference, atol=1e-9)
+    np.testing.assert_allclose(basis[0], points[0])
+    np.testing.assert_allclose(basis[-1], points[-1])
+
+
+def test_bezier_batches_match_single_curves():
+    batch = np.random.default_rng(0).normal(size=(4, 5, 3))
+    
+    curves = bezier_trajectory(batch, 9)
+    
+    assert curves.shape == (4, 9, 3)
+    for points, curve in zip(batch, curves):
+        np.testing.assert_allclose(curve, bezier_trajectory(points, 9), atol=1e-12)
+
+
+def test_high_degree_bezier_uses_de_casteljau():
+    # Bernstein coefficients of degree 60 overflow float precision
+    points = np.random.default_rng(1).normal(size=(61, 3))
+    
+    np.testing.assert_allclose(bezier_trajectory(points, 17),
+                               bezier_trajectory(points, 17, method='de_casteljau'))
+    with pytest.raises(ValueError):
+        bezier_trajectory(points, 17, method='spline')
\ No newline at end of file
@@ -0,0 +1,87 @@
+"""Tests for the threaded decode/warp/encode pipeline."""
+
+import random
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from core.pipeline import FramePipeline
+from core.pool import TransformPool
+
+SCHEDULE_POSE = ((0.0, 0.0, 0.0), 1.0)
+
+
+def make_pipeline(**kwargs):
+    return FramePipeline(TransformPool(), **kwargs)
+
+
+def test_results_come_out_in_input_order():
+    rng = random.Random(0)
+    
+    def decode(index):
+        # Finish out of order across the decode workers
+        time.sleep(rng.random() * 0.01)
+        return np.full((8, 8, 3), index, dtype=np.uint8)
+    
+    pipeline = make_pipeline(decode=decode, encode=lambda frame: int(frame[4, 4, 0]),
+                             decode_workers=4, encode_workers=4)
+    
+    assert list(pipeline.run(range(50), [SCHEDULE_POSE] * 50)) == list(range(50))
+
+
+def test_slow_consumer_bounds_items_in_flight():
+    pulled = 0
+    
+    def items():
+        nonlocal pulled
+        for index in range(1000):
+            pulled += 1
+            yield np.zeros((8, 8, 3), dtype=np.uint8)
+    
+    pipeline = make_pipeline(queue_size=2, decode_workers=1, warp_workers=1, encode_workers=1)
+    results = pipeline.run(items(), [SCHEDULE_POSE] * 1000)
+    next(results)
+    time.sleep(0.3)
+    
+    # The item yielded, max_in_flight inside the pipeline and the one the
+    # feeder holds while it waits for room
+    assert pulled <= pipeline.max_in_flight + 2
+    results.close()
+
+
+def test_stage_error_reaches_the_consumer():
+    def decode(index):
+        if index == 3:
+            raise RuntimeError('corrupt frame')
+        return np.zeros((8, 8, 3), dtype=np.uint8)
+    
+    pipeline = make_pipeline(decode=decode)
+    
+    with pytest.raises(RuntimeError, match='corrupt frame'):
+        list(pipeline.run(range(10), [SCHEDULE_POSE] * 10))
+
+
+def test_input_iterator_error_reaches_the_consumer():
+    def items():
+        yield np.zeros((8, 8, 3), dtype=np.uint8)
+        raise OSError('read failed')
+    
+    pipeline = make_pipeline()
+    
+    with pytest.raises(OSError, match='read failed'):
+        list(pipeline.run(items(), [SCHEDULE_POSE] * 2))
+
+
+def test_stage_threads_stop_after_an_error():
+    before = threading.active_count()
+    pipeline = make_pipeline(decode=lambda item: 1 / 0)
+    
+    with pytest.raises(ZeroDivisionError):
+        list(pipeline.run(range(5), [SCHEDULE_POSE] * 5))
+    
+    deadline = time.monotonic() + 2
+    while threading.active_count() > before and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert threading.active_count() <= before
\ No newline at end of file
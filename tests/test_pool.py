@@ -0,0 +1,55 @@
+"""Tests for the per-resolution transform pool."""
+
+import threading
+
+import numpy as np
+
+from core.pool import TransformPool, proxy_size
+
+
+def test_transforms_are_shared_per_resolution():
+    pool = TransformPool(max_entries=2)
+    
+    first = pool.get(160, 120)
+    assert pool.get(160, 120) is first
+    assert pool.get(160, 120, focal_length=200) is not first
+    pool.get(80, 60)
+    
+    assert len(pool) == 2
+    # The least recently used resolution was evicted
+    assert pool.get(160, 120) is not first
+
+
+def test_grids_are_only_precomputed_on_request():
+    assert TransformPool(precompute_grids=False).get(160, 120)._pixel_grid is None
+    assert TransformPool(precompute_grids=True).get(160, 120)._pixel_grid is not None
+
+
+def test_concurrent_gets_return_one_transform():
+    pool = TransformPool(warp_method='remap')
+    barrier = threading.Barrier(8)
+    results = []
+    
+    def get():
+        barrier.wait()
+        results.append(pool.get(640, 480))
+    
+    threads = [threading.Thread(target=get) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert len(results) == 8
+    assert all(transform is results[0] for transform in results)
+    assert len(pool) == 1
+
+
+def test_proxy_tiers_scale_the_focal_length():
+    pool = TransformPool()
+    frame = np.zeros((120, 160, 3), dtype=np.uint8)
+    
+    assert pool.warp(frame, (0, 0, 0), quality='half').shape == (60, 80, 3)
+    assert pool.warp(frame, (0, 0, 0), quality='half', upscale=True).shape == frame.shape
+    assert '80x60@80' in pool.cache_info()
+    assert proxy_size(3, 3, 'quarter') == (1, 1)
\ No newline at end of file
@@ -0,0 +1,162 @@
+"""Tests for batched RIFE inference with a stand-in model."""
+
+import numpy as np
+import pytest
+
+from ai.rife_wrapper import RIFEInterpolator
+
+HEIGHT, WIDTH = 24, 32
+
+
+class LinearModel:
+    """Stand-in for IFNet blending its inputs linearly, recording each call's timesteps."""
+    
+    def __init__(self):
+        self.calls = []
+    
+    def __call__(self, img0, img1, t, scale_list):
+        self.calls.append([round(float(value), 6) for value in t.flatten()])
+        return img0 * (1 - t) + img1 * t
+
+
+def interpolator(batch_size=4):
+    interp = RIFEInterpolator(device='cpu', batch_size=batch_size)
+    interp.model = LinearModel()
+    return interp
+
+
+def frames(dtype=np.float32, channels=3):
+    rng = np.random.default_rng(0)
+    shape = (HEIGHT, WIDTH, channels)
+    if np.issubdtype(dtype, np.integer):
+        top = np.iinfo(dtype).max
+        return (rng.integers(0, top, shape, endpoint=True).astype(dtype),
+                rng.integers(0, top, shape, endpoint=True).astype(dtype))
+    return rng.random(shape).astype(dtype), rng.random(shape).astype(dtype)
+
+
+def linear(frame1, frame2, timesteps):
+    t = np.asarray(timesteps, dtype=np.float64).reshape(-1, 1, 1, 1)
+    return frame1 * (1 - t) + frame2.astype(np.float64) * t
+
+
+@pytest.mark.parametrize('batch_size, sizes', [(1, [1] * 5), (2, [2, 2, 1]), (8, [5])])
+def test_independent_timesteps_are_batched(batch_size, sizes):
+    interp = interpolator(batch_size)
+    frame1, frame2 = frames()
+    
+    out = interp.interpolate_frames(frame1, frame2, num_frames=5, schedule='independent')
+    
+    assert [len(call) for call in interp.model.calls] == sizes
+    assert sum(interp.model.calls, []) == pytest.approx([i / 6 for i in range(1, 6)], abs=1e-6)
+    np.testing.assert_allclose(out, linear(frame1, frame2, [i / 6 for i in range(1, 6)]), atol=1e-5)
+
+
+@pytest.mark.parametrize('dtype', [np.uint8, np.uint16])
+def test_integer_frames_use_their_full_range(dtype):
+    interp = interpolator()
+    frame1, frame2 = frames(dtype)
+    timesteps = [0.25, 0.5, 0.75]
+    
+    out = interp.interpolate_frames(frame1, frame2, timesteps=timesteps, schedule='independent')
+    
+    assert out.dtype == dtype
+    expected = linear(frame1, frame2, timesteps)
+    # float32 inference rounds to within a unit of the exact blend
+    assert np.abs(out - expected).max() <= 1 + np.iinfo(dtype).max * 1e-6
+
+
+def test_grayscale_and_alpha_channels():
+    interp = interpolator()
+    for channels in (1, 4):
+        frame1, frame2 = frames(np.uint8, channels)
+        
+        out = interp.interpolate_frames(frame1, frame2, timesteps=[0.5], schedule='independent')
+        
+        assert out.shape == (1, HEIGHT, WIDTH, channels)
+        assert np.abs(out - linear(frame1, frame2, [0.5])).max() <= 1
+
+
+@pytest.mark.parametrize('num_frames, batch_size, calls', [
+    (1, 4, [[0.5]]),
+    (3, 4, [[0.5], [0.5, 0.5]]),
+    (7, 4, [[0.5], [0.5, 0.5], [0.5] * 4]),
+    (7, 2, [[0.5], [0.5, 0.5], [0.5, 0.5], [0.5, 0.5]])
+])
+def test_bisect_halves_each_interval(num_frames, batch_size, calls):
+    interp = interpolator(batch_size)
+    frame1, frame2 = frames()
+    
+    out = interp.interpolate_frames(frame1, frame2, num_frames=num_frames)
+    
+    assert interp.model.calls == calls
+    timesteps = [i / (num_frames + 1) for i in range(1, num_frames + 1)]
+    np.testing.assert_allclose(out, linear(frame1, frame2, timesteps), atol=1e-5)
+
+
+def test_bisect_picks_timestep_nearest_the_middle():
+    interp = interpolator()
+    frame1, frame2 = frames()
+    
+    out = interp.interpolate_frames(frame1, frame2, timesteps=[0.9, 0.2])
+    
+    # 0.2 first, then 0.9 between the generated frame and frame2
+    assert interp.model.calls == [[0.2], [0.875]]
+    np.testing.assert_allclose(out, linear(frame1, frame2, [0.9, 0.2]), atol=1e-5)
+
+
+def test_bisect_copies_endpoints_and_repeated_timesteps():
+    interp = interpolator()
+    frame1, frame2 = frames(np.uint8)
+    
+    out = interp.interpolate_frames(frame1, frame2, timesteps=[0.0, 0.5, 1.0, 0.5])
+    
+    assert interp.model.calls == [[0.5]]
+    np.testing.assert_array_equal(out[0], frame1)
+    np.testing.assert_array_equal(out[2], frame2)
+    np.testing.assert_array_equal(out[1], out[3])
+
+
+def test_unknown_schedule_is_rejected():
+    frame1, frame2 = frames()
+    with pytest.raises(ValueError):
+        interpolator().interpolate_frames(frame1, frame2, num_frames=3, schedule='random')
+
+
+@pytest.mark.parametrize('dtype', [np.uint8, np.uint16, np.float32, np.float64])
+def test_blend_fills_the_preallocated_block(dtype):
+    interp = RIFEInterpolator(device='cpu')
+    frame1, frame2 = frames(dtype)
+    timesteps = [0.1, 0.5, 0.8]
+    out = np.zeros((3,) + frame1.shape, dtype=dtype)
+    
+    result = interp.interpolate_frames(frame1, frame2, timesteps=timesteps, out=out)
+    
+    assert result is out
+    tolerance = 1 if np.issubdtype(dtype, np.integer) else 1e-6
+    assert np.abs(out - linear(frame1, frame2, timesteps)).max() <= tolerance
+
+
+def test_blend_generator_yields_views_as_they_fill():
+    interp = RIFEInterpolator(device='cpu')
+    frame1, frame2 = frames(np.uint8)
+    out = np.zeros((4,) + frame1.shape, dtype=np.uint8)
+    
+    generator = interp.interpolate_frames(frame1, frame2, num_frames=4, out=out, as_generator=True)
+    first = next(generator)
+    
+    assert np.shares_memory(first, out[0])
+    assert not out[1:].any()
+    assert len(list(generator)) == 3
+    assert out[3].any()
+
+
+def test_blend_rejects_mismatched_blocks():
+    interp = RIFEInterpolator(device='cpu')
+    frame1, frame2 = frames(np.uint8)
+    with pytest.raises(ValueError):
+        interp.interpolate_frames(frame1, frame2, num_frames=2, out=np.empty((3,) + frame1.shape, np.uint8))
+    with pytest.raises(ValueError):
+        interp.interpolate_frames(frame1, frame2, num_frames=2, out=np.empty((2,) + frame1.shape, np.float32))
+    with pytest.raises(ValueError):
+        interp.interpolate_frames(frame1, frame2.astype(np.uint16), num_frames=2)
\ No newline at end of file
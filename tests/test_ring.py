@@ -0,0 +1,90 @@
+"""Tests for shared-memory and file-backed frame rings."""
+
+import pytest
+
+from core.ring import HEADER_BYTES, FrameRing
+
+
+@pytest.fixture(params=['shm', 'file'])
+def ring(request, tmp_path):
+    if request.param == 'shm':
+        ring = FrameRing.create_shared(3, 1000)
+    else:
+        ring = FrameRing.create_file(str(tmp_path / 'frames.ring'), 3, 1000)
+    yield ring
+    ring.close()
+
+
+def test_slots_are_aligned(ring):
+    assert ring.slot_bytes == 1024
+    assert ring.describe()['offsets'] == [HEADER_BYTES + i * 1024 for i in range(3)]
+    assert ring.nbytes == HEADER_BYTES + 3 * 1024
+
+
+def test_views_share_the_buffer(ring):
+    ring.view((4, 4), slot=1)[...] = 9
+    
+    assert ring.view((16,), offset=ring.slot_offset(1)).tolist() == [9] * 16
+
+
+@pytest.mark.parametrize('kwargs', [
+    {'slot': 3},
+    {'slot': -1},
+    {'offset': 0},
+    {'offset': HEADER_BYTES + 3 * 1024 - 8},
+    {}
+])
+def test_out_of_range_frames_are_rejected(ring, kwargs):
+    with pytest.raises(ValueError):
+        ring.view((4, 4), **kwargs)
+
+
+def test_frames_larger_than_a_slot_are_rejected(ring):
+    with pytest.raises(ValueError, match='does not fit'):
+        ring.view((1025,), slot=0)
+
+
+def test_misaligned_offsets_are_rejected(ring):
+    with pytest.raises(ValueError, match='not aligned'):
+        ring.view((4,), 'float32', offset=HEADER_BYTES + 2)
+
+
+def test_close_refuses_while_views_are_alive(ring):
+    frame = ring.view((4, 4), slot=0)
+    
+    with pytest.raises(BufferError):
+        ring.close()
+    # The ring stays usable until the view is dropped
+    frame[...] = 1
+    assert ring.view((4, 4), slot=0).sum() == 16
+    del frame
+
+
+def test_closed_rings_hand_out_no_views(tmp_path):
+    ring = FrameRing.create_file(str(tmp_path / 'frames.ring'), 1, 64)
+    ring.close()
+    
+    assert not (tmp_path / 'frames.ring').exists()
+    with pytest.raises(ValueError, match='closed'):
+        ring.view((4,), slot=0)
+
+
+def test_attach_reads_the_header(tmp_path):
+    path = str(tmp_path / 'frames.ring')
+    owner = FrameRing.create_file(path, 2, 128)
+    owner.view((8,), slot=1)[...] = 5
+    
+    client = FrameRing.attach_file(path)
+    
+    assert (client.slots, client.slot_bytes) == (2, 128)
+    assert client.view((8,), slot=1).tolist() == [5] * 8
+    client.close()
+    owner.close()
+
+
+def test_attach_rejects_foreign_files(tmp_path):
+    path = tmp_path / 'not-a-ring'
+    path.write_bytes(b'\0' * 4096)
+    
+    with pytest.raises(ValueError, match='bad header'):
+        FrameRing.attach_file(str(path))
\ No newline at end of file
@@ -0,0 +1,164 @@
+"""Tests for memory-mapped frame sequences and the server's path checks."""
+
+from collections import OrderedDict
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from core.sequence import FrameSequence
+
+
+def clip(count=5, height=6, width=8):
+    return np.arange(count * height * width * 3, dtype=np.uint32).astype(np.uint8).reshape(
+        count, height, width, 3)
+
+
+def test_npy_stack_is_mapped_read_only(tmp_path):
+    frames = clip()
+    np.save(tmp_path / 'clip.npy', frames)
+    
+    sequence = FrameSequence(tmp_path / 'clip.npy', readahead=2)
+    
+    assert len(sequence) == 5
+    assert sequence.frame_shape == (6, 8, 3)
+    np.testing.assert_array_equal(sequence[3], frames[3])
+    np.testing.assert_array_equal(sequence[-1], frames[-1])
+    assert not sequence[0].flags.writeable
+    with pytest.raises(IndexError):
+        sequence[5]
+    sequence.close()
+
+
+def test_raw_dump_with_header_offset(tmp_path):
+    frames = clip()
+    (tmp_path / 'clip.raw').write_bytes(b'HEAD' + frames.tobytes() + b'partial')
+    
+    sequence = FrameSequence(tmp_path / 'clip.raw', shape=(6, 8, 3), offset=4)
+    
+    assert len(sequence) == 5
+    np.testing.assert_array_equal(sequence[2], frames[2])
+    sequence.close()
+
+
+def test_raw_dump_needs_a_shape(tmp_path):
+    (tmp_path / 'clip.bin').write_bytes(bytes(100))
+    
+    with pytest.raises(ValueError, match='shape'):
+        FrameSequence(tmp_path / 'clip.bin')
+
+
+def test_other_files_are_not_mapped(tmp_path):
+    (tmp_path / 'notes.txt').write_text('not frames')
+    
+    with pytest.raises(ValueError, match='Unsupported'):
+        FrameSequence(tmp_path / 'notes.txt', shape=(2, 2))
+
+
+@pytest.fixture
+def image_dir(tmp_path):
+    frames = clip(count=12)
+    for index, frame in enumerate(frames):
+        Image.fromarray(frame).save(tmp_path / f'frame_{index}.png')
+    (tmp_path / 'readme.txt').write_text('ignored')
+    return tmp_path, frames
+
+
+def test_directory_is_read_in_natural_order(image_dir):
+    directory, frames = image_dir
+    
+    sequence = FrameSequence(directory, readahead=3)
+    
+    assert len(sequence) == 12
+    for index in (0, 1, 2, 10, 11, 5):
+        np.testing.assert_array_equal(sequence[index], frames[index])
+    sequence.close()
+
+
+def test_glob_pattern_selects_frames(image_dir):
+    directory, frames = image_dir
+    
+    sequence = FrameSequence(directory / 'frame_1*.png')
+    
+    assert len(sequence) == 3
+    np.testing.assert_array_equal(sequence[2], frames[11])
+
+
+def test_empty_glob_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match='No frames'):
+        FrameSequence(tmp_path / '*.png')
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    from backend import server
+    root = tmp_path / 'clips'
+    root.mkdir()
+    monkeypatch.setattr(server, 'sequence_roots', [root.resolve()])
+    monkeypatch.setattr(server, 'open_sequences', OrderedDict())
+    return server
+
+
+def test_server_opens_sequences_inside_its_roots(server, tmp_path):
+    np.save(tmp_path / 'clips' / 'clip.npy', clip())
+    
+    sequence = server._open_sequence(str(tmp_path / 'clips' / 'clip.npy'))
+    
+    assert len(sequence) == 5
+    assert server._open_sequence(str(tmp_path / 'clips' / 'clip.npy')) is sequence
+
+
+@pytest.mark.parametrize('path', ['outside.npy', 'clips/../outside.npy'])
+def test_server_rejects_paths_outside_its_roots(server, tmp_path, path):
+    np.save(tmp_path / 'outside.npy', clip())
+    
+    with pytest.raises(ValueError, match='must be inside'):
+        server._open_sequence(str(tmp_path / path))
+
+
+def test_server_without_roots_opens_nothing(server, tmp_path, monkeypatch):
+    np.save(tmp_path / 'clips' / 'clip.npy', clip())
+    monkeypatch.setattr(server, 'sequence_roots', [])
+    
+    with pytest.raises(ValueError, match='disabled'):
+        server._open_sequence(str(tmp_path / 'clips' / 'clip.npy'))
+
+
+def test_evicted_sequences_stay_readable(server, tmp_path, monkeypatch):
+    monkeypatch.setitem(server.performance_config, 'open_sequences', 1)
+    frames = clip()
+    np.save(tmp_path / 'clips' / 'a.npy', frames)
+    np.save(tmp_path / 'clips' / 'b.npy', frames)
+    
+    first = server._open_sequence(str(tmp_path / 'clips' / 'a.npy'))
+    server._open_sequence(str(tmp_path / 'clips' / 'b.npy'))
+    
+    assert len(server.open_sequences) == 1
+    np.testing.assert_array_equal(first[4], frames[4])
+
+
+def test_sequence_endpoint_is_local_only(server, tmp_path):
+    np.save(tmp_path / 'clips' / 'clip.npy', clip())
+    client = server.app.test_client()
+    data = {'path': str(tmp_path / 'clips' / 'clip.npy'), 'count': '1', 'format': 'raw'}
+    
+    assert client.post('/api/transform/sequence', data=data).status_code == 200
+    assert client.post('/api/transform/sequence', data=data,
+                       environ_base={'REMOTE_ADDR': '192.0.2.10'}).status_code == 403
+    assert client.post('/api/transform/sequence', data=data,
+                       headers={'Origin': 'http://evil.example'}).status_code == 403
+
+
+def test_close_refuses_while_frames_are_alive(tmp_path):
+    np.save(tmp_path / 'clip.npy', clip())
+    sequence = FrameSequence(tmp_path / 'clip.npy')
+    frame = sequence[1][2:]
+    
+    with pytest.raises(BufferError):
+        sequence.close()
+    assert frame.sum() == clip()[1][2:].sum()
+    
+    del frame
+    sequence.close()
+    with pytest.raises(ValueError, match='closed'):
+        sequence[0]
\ No newline at end of file
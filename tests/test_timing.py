@@ -0,0 +1,76 @@
+"""Tests for the transition timing curves."""
+
+import numpy as np
+import pytest
+
+from core.timing import CURVES, intensity_curve, resolve_curve, rife_timesteps, timing_lut
+
+
+@pytest.mark.parametrize('curve', sorted(CURVES))
+def test_lut_starts_and_ends_on_the_keyframes(curve):
+    values = timing_lut(curve, 30)
+    
+    assert values.shape == (30,)
+    assert values[0] == 0.0 and values[-1] == 1.0
+
+
+@pytest.mark.parametrize('curve', ['linear', 'ease_in', 'ease_out', 'ease_in_out', 'whip'])
+def test_bezier_curves_are_monotonic(curve):
+    assert np.all(np.diff(timing_lut(curve, 60)) >= 0)
+
+
+def test_linear_curve_is_identity():
+    np.testing.assert_allclose(timing_lut('linear', 11), np.linspace(0, 1, 11), atol=1e-9)
+
+
+def test_ease_in_starts_slowly():
+    values = timing_lut('ease_in', 11)
+    
+    assert values[1] < 0.1
+    assert timing_lut('ease_out', 11)[1] > 0.1
+
+
+def test_spring_overshoots():
+    values = timing_lut('spring', 60)
+    
+    assert values.max() > 1.0
+    assert values.min() >= 0.0
+
+
+def test_lut_is_shared_and_read_only():
+    values = timing_lut('whip', 20)
+    
+    assert timing_lut(('bezier', (0.7, 0, 0.2, 1)), 20) is values
+    with pytest.raises(ValueError):
+        values[0] = 0.5
+
+
+def test_cubic_bezier_string_matches_named_curve():
+    np.testing.assert_array_equal(timing_lut('cubic-bezier(0.42, 0, 0.58, 1)', 25),
+                                  timing_lut('ease_in_out', 25))
+
+
+@pytest.mark.parametrize('curve', [
+    'bounce',
+    'cubic-bezier(1.5, 0, 0.5, 1)',
+    'cubic-bezier(0.5, 0, 0.5)',
+    ('spring', (0.0, 8.0)),
+    ('elastic', (1.0,))
+])
+def test_invalid_curves_are_rejected(curve):
+    with pytest.raises(ValueError):
+        resolve_curve(curve)
+
+
+def test_rife_timesteps_stay_within_the_interval():
+    timesteps = rife_timesteps('spring', 40)
+    
+    assert timesteps.shape == (40,)
+    assert timesteps.min() > 0.0 and timesteps.max() <= 1.0
+    np.testing.assert_allclose(rife_timesteps('linear', 3), [0.25, 0.5, 0.75], atol=1e-9)
+
+
+def test_intensity_curves():
+    assert intensity_curve('high') == 'spring'
+    with pytest.raises(ValueError):
+        intensity_curve('extreme')
\ No newline at end of file
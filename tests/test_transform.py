@@ -0,0 +1,161 @@
+"""Tests for the fused FPV warp and its homography cache."""
+
+import cv2
+import numpy as np
+import pytest
+
+from core import FPVTransform
+
+WIDTH, HEIGHT = 160, 120
+POSE = ((5.0, -4.0, 2.0), 1.2)
+
+
+@pytest.fixture(scope='module')
+def frame():
+    rng = np.random.default_rng(0)
+    return cv2.GaussianBlur(rng.integers(0, 256, (HEIGHT, WIDTH, 3), dtype=np.uint8), (0, 0), 3)
+
+
+def test_homography_composes_rotation_and_fov():
+    transform = FPVTransform(WIDTH, HEIGHT)
+    rotation, fov = POSE
+    scale = np.array([
+        [fov, 0, WIDTH * (1 - fov) / 2],
+        [0, fov, HEIGHT * (1 - fov) / 2],
+        [0, 0, 1]
+    ])
+    
+    np.testing.assert_allclose(transform.homography(rotation, fov),
+                               scale @ transform.homography(rotation, 1.0), atol=1e-9)
+
+
+def test_fused_warp_matches_two_passes(frame):
+    transform = FPVTransform(WIDTH, HEIGHT)
+    rotation, fov = POSE
+    
+    fused = transform.warp(frame, rotation, fov)
+    two_pass = transform.adjust_fov(transform.apply_rotation(frame, rotation), fov)
+    
+    # The two-pass path resamples twice; compare away from the borders it clips
+    difference = np.abs(fused.astype(int) - two_pass)[20:-20, 20:-20]
+    assert difference.mean() < 0.5
+    assert difference.max() <= 3
+
+
+def test_warp_writes_into_out(frame):
+    transform = FPVTransform(WIDTH, HEIGHT)
+    out = np.empty_like(frame)
+    
+    assert transform.warp(frame, *POSE, out=out) is out
+    np.testing.assert_array_equal(out, transform.warp(frame, *POSE))
+    with pytest.raises(ValueError):
+        transform.warp(frame, *POSE, out=np.empty((HEIGHT, WIDTH), np.uint8))
+
+
+def test_homography_cache_counts_hits_and_misses():
+    transform = FPVTransform(WIDTH, HEIGHT, cache_size=2)
+    
+    first = transform.homography((1, 2, 3), 1.0)
+    assert transform.homography((1, 2, 3), 1.0) is first
+    # Within the quantization step of a cached pose
+    assert transform.homography((1.001, 2, 3), 1.0) is first
+    transform.homography((4, 5, 6), 1.0)
+    transform.homography((7, 8, 9), 1.0)
+    
+    info = transform.cache_info()
+    assert (info['hits'], info['misses'], info['size']) == (2, 3, 2)
+    # The least recently used pose was evicted
+    assert transform.homography((1, 2, 3), 1.0) is not first
+    
+    transform.clear_cache()
+    assert transform.cache_info()['hits'] == transform.cache_info()['misses'] == 0
+
+
+def test_cached_homographies_are_read_only():
+    homography = FPVTransform(WIDTH, HEIGHT).homography((1, 2, 3), 1.0)
+    
+    with pytest.raises(ValueError):
+        homography[0, 0] = 2
+
+
+def test_camera_matrix_inverse():
+    transform = FPVTransform(WIDTH, HEIGHT, focal_length=200)
+    
+    np.testing.assert_allclose(transform.camera_matrix @ transform.camera_matrix_inv, np.eye(3),
+                               atol=1e-12)
+
+
+@pytest.mark.parametrize('interpolation', ['nearest', 'linear', 'cubic', 'lanczos'])
+def test_remap_matches_perspective_warp(frame, interpolation):
+    perspective = FPVTransform(WIDTH, HEIGHT, interpolation=interpolation)
+    remap = FPVTransform(WIDTH, HEIGHT, interpolation=interpolation, warp_method='remap')
+    
+    # Fixed-point maps round coordinates to 1/32 pixel
+    difference = np.abs(remap.warp(frame, *POSE).astype(int) - perspective.warp(frame, *POSE))
+    assert difference.mean() < 0.1
+    assert difference.max() <= 3
+
+
+def test_remap_map_cache_counts_hits_and_misses(frame):
+    transform = FPVTransform(WIDTH, HEIGHT, warp_method='remap', map_cache_size=2)
+    
+    first = transform.remap_maps((1, 2, 3), 1.0)
+    assert transform.remap_maps((1, 2, 3), 1.0) is first
+    transform.warp(frame, (4, 5, 6), 1.0)
+    transform.warp(frame, (7, 8, 9), 1.0)
+    
+    info = transform.cache_info()
+    assert (info['map_hits'], info['map_misses'], info['map_size']) == (1, 3, 2)
+    assert transform.remap_maps((1, 2, 3), 1.0) is not first
+    
+    # Frames of another size are warped directly, without maps
+    transform.warp(cv2.resize(frame, (WIDTH // 2, HEIGHT // 2)), (1, 2, 3), 1.0)
+    assert transform.cache_info()['map_misses'] == 4
+
+
+def test_nearest_remap_has_no_interpolation_table():
+    transform = FPVTransform(WIDTH, HEIGHT, interpolation='nearest', warp_method='remap')
+    
+    map1, map2 = transform.remap_maps(*POSE)
+    assert map1.shape == (HEIGHT, WIDTH, 2)
+    assert map2 is None
+
+
+def test_motion_blur_sample_count_follows_motion():
+    transform = FPVTransform(WIDTH, HEIGHT, motion_blur_samples=16)
+    rotation, fov = POSE
+    
+    assert transform.motion_blur_samples_for(rotation, rotation, fov) == 1
+    small = transform.motion_blur_samples_for(rotation, (5.5, -4.0, 2.0), fov)
+    large = transform.motion_blur_samples_for(rotation, (8.0, -4.0, 2.0), fov)
+    assert 1 < small < large
+    assert transform.motion_blur_samples_for(rotation, (40.0, 10.0, 2.0), fov) == 16
+
+
+@pytest.mark.parametrize('dtype', [np.uint8, np.uint16, np.float32, np.float64])
+def test_motion_blur_keeps_dtype(frame, dtype):
+    transform = FPVTransform(WIDTH, HEIGHT)
+    source = frame.astype(dtype)
+    rotation, fov = POSE
+    
+    blurred = transform.warp_motion_blur(source, rotation, (9.0, -4.0, 2.0), fov)
+    
+    assert blurred.dtype == dtype and blurred.shape == source.shape
+    # The blur averages the sub-frames between both poses
+    start = transform.warp(source, rotation, fov).astype(float)
+    end = transform.warp(source, (9.0, -4.0, 2.0), fov).astype(float)
+    interior = np.s_[20:-20, 20:-20]
+    assert np.abs(blurred[interior] - (start[interior] + end[interior]) / 2).mean() < \
+        np.abs(start[interior] - end[interior]).mean()
+
+
+def test_motion_blur_without_motion_is_the_plain_warp(frame):
+    transform = FPVTransform(WIDTH, HEIGHT)
+    out = np.empty_like(frame)
+    rotation, fov = POSE
+    
+    assert transform.warp_motion_blur(frame, rotation, rotation, fov, out=out) is out
+    np.testing.assert_array_equal(out, transform.warp(frame, *POSE))
+    with pytest.raises(ValueError):
+        transform.warp_motion_blur(frame, rotation, (9.0, -4.0, 2.0), fov,
+                                   out=np.empty((HEIGHT, WIDTH), np.uint8))
\ No newline at end of file